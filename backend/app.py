@@ -3,95 +3,256 @@ Flask Backend for Legal Document Analyzer
 Integrates the ML validator with the web frontend
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
-import tempfile
-from legal_validator import LegalDocumentValidator
+import io
+from doc_type_classifier import get_type_classifier
+from fast_json import dumps
+from flaw_set import count_severities, severity_summary
+from document_reader import read_stream_content, read_upload
+from job_queue import JobQueue, QueueFullError
+from legal_rules import get_rule_pack, get_rule_store
+from micro_batcher import MicroBatcher
+import pdf_pipeline
+from result_cache import ResultCache
+from metrics import REGISTRY, StageTimer
+from validator_loader import LOAD_MODES, ValidatorLoader, ValidatorNotReady
 import traceback
 
 app = Flask(__name__)
 CORS(app)
 
-UPLOAD_FOLDER = tempfile.gettempdir()
 ALLOWED_EXTENSIONS = {'txt', 'doc', 'docx', 'pdf'}
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024
+app.config['BATCH_MAX_FILES'] = 32
+app.config['DETECT_MAX_FILES'] = int(os.environ.get('DETECT_MAX_FILES', 1000))
+app.config['MICRO_BATCH_SIZE'] = int(os.environ.get('MICRO_BATCH_SIZE', 8))
+app.config['MICRO_BATCH_WAIT_MS'] = float(os.environ.get('MICRO_BATCH_WAIT_MS', 10))
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', 256))
+app.config['RESULT_CACHE_TTL'] = float(os.environ.get('RESULT_CACHE_TTL', 3600))
+app.config['RESULT_CACHE_DB'] = os.environ.get('RESULT_CACHE_DB')
+app.config['RESULT_CACHE_DB_MAX_ROWS'] = int(os.environ.get('RESULT_CACHE_DB_MAX_ROWS', 10000))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_MAX_PENDING'] = int(os.environ.get('JOB_MAX_PENDING', 32))
+app.config['JOB_TTL'] = float(os.environ.get('JOB_TTL', 3600))
+app.config['JOB_DB'] = os.environ.get('JOB_DB')
+app.config['VALIDATOR_LOAD'] = os.environ.get('VALIDATOR_LOAD', 'background')
+app.config['VALIDATOR_WAIT_SECONDS'] = float(os.environ.get('VALIDATOR_WAIT_SECONDS', 30))
+# .txt and .pdf uploads larger than this are validated chunk by chunk on /analyze/stream
+app.config['STREAM_VALIDATION_BYTES'] = int(os.environ.get('STREAM_VALIDATION_BYTES', 1024 * 1024))
+# gunicorn.conf.py turns this off: pre-forked workers start their own PDF pool in after_fork
+app.config['PDF_POOL_AT_IMPORT'] = os.environ.get('PDF_POOL_AT_IMPORT', '1') == '1'
 
 print("\n" + "="*80)
 print("LEGAL DOCUMENT ANALYZER - FLASK BACKEND")
 print("="*80)
 
-validator = None
 
-try:
+def _load_validator():
+    # torch and transformers are imported here, not at module import, so the
+    # app starts serving health checks immediately
+    from legal_validator import LegalDocumentValidator
+
     print("\n🔧 Initializing Legal Document Validator...")
-    validator = LegalDocumentValidator(use_gpu=False)
+    loaded = LegalDocumentValidator(use_gpu=False)
+    # Ready before the first upload (and before fork under gunicorn)
+    get_type_classifier(loaded.store, loaded.model_version)
     print("✓ Validator initialized successfully")
-except Exception as e:
-    print(f"⚠️  Warning: Could not initialize validator: {e}")
-    print("   Using fallback mode...")
+    return loaded
 
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+validator_loader = ValidatorLoader(_load_validator)
 
+# PDF workers are forked now, before the model or any server thread exists
+if app.config['PDF_POOL_AT_IMPORT']:
+    pdf_pipeline.start_pool()
 
-def detect_document_type(text):
-    """Auto-detect document type from content"""
-    text_lower = text.lower()
-
-    if "non-disclosure" in text_lower or "confidential" in text_lower:
-        return "NDA"
-    elif "employment agreement" in text_lower or "employee" in text_lower:
-        return "EMPLOYMENT_AGREEMENT"
-    elif "founder" in text_lower and "equity" in text_lower:
-        return "FOUNDER_AGREEMENT"
-    elif "safe" in text_lower and "investment" in text_lower:
-        return "SAFE_AGREEMENT"
+if app.config['VALIDATOR_LOAD'] not in LOAD_MODES:
+    raise ValueError(f"VALIDATOR_LOAD must be one of {', '.join(LOAD_MODES)}")
+
+# The debug reloader's parent process only watches files; its child loads the model
+_reloader_parent = __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') is None
+
+if app.config['VALIDATOR_LOAD'] == 'eager':
+    validator_loader.get()
+elif app.config['VALIDATOR_LOAD'] == 'background' and not _reloader_parent:
+    validator_loader.start()
+
+
+def _validate_batch(items):
+    texts = [text for text, _ in items]
+    document_types = [document_type for _, document_type in items]
+
+    REGISTRY.observe('model_batch_size', len(items))
+
+    validator = validator_loader.current()
+    if validator:
+        results = validator.validate_documents(texts, document_types)
+        REGISTRY.observe('model_batch_windows', sum(result['windows_analyzed'] for result in results))
+        return results
+    return [fallback_validation(text, document_type) for text, document_type in items]
+
+
+# Concurrent /analyze and /analyze/batch requests share model batches
+batcher = MicroBatcher(
+    _validate_batch,
+    max_batch_size=app.config['MICRO_BATCH_SIZE'],
+    max_wait_ms=app.config['MICRO_BATCH_WAIT_MS']
+)
+
+result_cache = ResultCache(
+    max_entries=app.config['RESULT_CACHE_SIZE'],
+    ttl_seconds=app.config['RESULT_CACHE_TTL'],
+    sqlite_path=app.config['RESULT_CACHE_DB'],
+    max_disk_entries=app.config['RESULT_CACHE_DB_MAX_ROWS']
+)
+
+
+def validate_cached(items, timers=None, wait=None):
+    """
+    Validate (text, document_type) pairs, serving repeats from the result cache.
+    If `timers` (one StageTimer per item) is given, cache, queueing and validator
+    stage timings are recorded into them. Waits up to `wait` seconds (forever if
+    None) for the model to load, then raises ValidatorNotReady.
+    """
+    timers = timers or [StageTimer() for _ in items]
+
+    if validator_loader.is_settled:
+        validator = validator_loader.get()
     else:
-        return "GENERAL"
+        load_wait = StageTimer()
+        validator = validator_loader.get(wait)
+        for timer in timers:
+            timer.add('model_load_wait', load_wait.elapsed())
 
+    model_tag = validator.cache_tag if validator else 'fallback'
+    rules_version = get_rule_pack().fingerprint
 
-def read_file_content(file_path):
-    """Read content from uploaded file"""
-    file_ext = os.path.splitext(file_path)[1].lower()
+    results = []
+    keys = []
+    for (text, document_type), timer in zip(items, timers):
+        with timer.stage('cache_lookup'):
+            key = ResultCache.make_key(text, document_type, model_tag, rules_version)
+            keys.append(key)
+            results.append(result_cache.get(key))
 
-    try:
-        if file_ext == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-
-        elif file_ext == '.docx':
-            try:
-                from docx import Document
-                doc = Document(file_path)
-                return '\n'.join([para.text for para in doc.paragraphs])
-            except ImportError:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    return f.read()
-
-        elif file_ext == '.pdf':
-            try:
-                import PyPDF2
-                with open(file_path, 'rb') as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    text = ''
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-                    return text
-            except ImportError:
-                return None
+    missing = [index for index, result in enumerate(results) if result is None]
 
-        else:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+    if missing:
+        wait_timer = StageTimer()
+        fresh = batcher.process_many([items[index] for index in missing])
+        waited = wait_timer.elapsed()
 
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return None
+        for index, result in zip(missing, fresh):
+            validator_timings = result.pop('timings', {})
+            timers[index].merge(validator_timings)
+            # Time spent gathering the micro-batch and waiting behind other batches
+            timers[index].add('queue_wait', max(0.0, waited - sum(validator_timings.values()) / 1000.0))
+
+            result_cache.put(keys[index], result)
+            results[index] = result
+
+    return results
+
+
+def after_fork(num_threads=None):
+    """
+    Called in each pre-forked worker (see gunicorn.conf.py). Weights loaded
+    in the parent are inherited as-is; threads, thread pools and SQLite
+    handles are not, so they are recreated here. The PDF pool goes first,
+    while this process still has a single thread.
+    """
+    pdf_pipeline.reset_after_fork()
+    batcher.reset_after_fork()
+    result_cache.reset_after_fork()
+    job_queue.reset_after_fork()
+
+    validator = validator_loader.current()
+    if validator:
+        validator.after_fork(num_threads)
+
+
+def run_analysis_job(payload, report):
+    """Job worker: extract, classify and validate one uploaded document"""
+    filename, data, requested_type = payload
+    timer = StageTimer()
+
+    report(0.1, 'extracting')
+    with timer.stage('extraction'):
+        text = read_stream_content(io.BytesIO(data), filename)
+    if text is None or len(text.strip()) == 0:
+        raise ValueError('Could not read file content')
+
+    report(0.3, 'detecting_type')
+    with timer.stage('detect_document_type'):
+        document_type = requested_type or detect_document_type(text)
+
+    report(0.4, 'validating')
+    validation_result = validate_cached([(text, document_type)], [timer])[0]
+
+    REGISTRY.observe_stages(timer, endpoint='jobs')
+    REGISTRY.observe('request_seconds', timer.elapsed(), endpoint='jobs')
+    REGISTRY.inc('documents_total', endpoint='jobs')
+
+    return {
+        'success': True,
+        'filename': filename,
+        'document_type': document_type,
+        'validation': validation_result,
+        'summary': generate_summary(validation_result),
+        'processing_time': round(timer.elapsed(), 4),
+        'timings': timer.as_ms()
+    }
+
+
+job_queue = JobQueue(
+    run_analysis_job,
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_MAX_PENDING'],
+    ttl_seconds=app.config['JOB_TTL'],
+    sqlite_path=app.config['JOB_DB']
+)
+
+
+def not_ready_response(error):
+    """503 while the model is still loading, so clients and proxies retry"""
+    response = jsonify({
+        'error': 'Model is still loading',
+        'details': str(error),
+        'validator': validator_loader.status()
+    })
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+
+def json_response(data):
+    """JSON response for report bodies: serialized straight to bytes, without jsonify"""
+    return Response(dumps(data), mimetype='application/json')
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def type_classifier():
+    """The document-type classifier of the loaded validator's artifact (the latest one until it loads)"""
+    validator = validator_loader.current()
+    if validator is None:
+        return get_type_classifier()
+    return get_type_classifier(validator.store, validator.model_version)
+
+
+def detect_document_type(text):
+    """Auto-detect document type from content (GENERAL when the classifier is unsure)"""
+    return type_classifier().classify(text)['document_type']
+
+
+def detect_document_types(texts):
+    """Classify many documents in one vectorized pass; type, confidence and per-type probabilities"""
+    return type_classifier().classify_many(texts)
 
 
 @app.route('/')
@@ -100,18 +261,63 @@ def home():
         'service': 'Legal Document Analyzer API',
         'version': '1.0.0',
         'status': 'running',
-        'validator_loaded': validator is not None
+        'validator_loaded': validator_loader.current() is not None
     })
 
 
 @app.route('/health')
 def health():
+    """Liveness: the process is up and serving, whether or not the model has loaded"""
+    validator = validator_loader.current()
     return jsonify({
         'status': 'healthy',
-        'validator': validator is not None
+        'validator': validator is not None,
+        'validator_state': validator_loader.status(),
+        'cache': result_cache.stats(),
+        'clause_cache': validator.clause_cache.stats() if validator else None,
+        'jobs': job_queue.metrics(),
+        'rules': rule_pack_status()
+    })
+
+
+def rule_pack_status():
+    store = get_rule_store()
+    return dict(store.current().describe(), reloads=store.reloads, last_error=store.last_error)
+
+
+@app.route('/ready')
+def ready():
+    """
+    Readiness: 200 once analyses can be served (model loaded, or fallback
+    mode after a failed load), 503 while loading. Starts a lazy load.
+    """
+    validator_loader.start()
+
+    if not validator_loader.is_settled:
+        response = jsonify({'ready': False, 'validator': validator_loader.status()})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    return jsonify({
+        'ready': True,
+        'mode': 'model' if validator_loader.current() is not None else 'fallback',
+        'validator': validator_loader.status()
     })
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus-style metrics: stage latency histograms, throughput and batch sizes"""
+    for name, value in result_cache.stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            REGISTRY.set_gauge('result_cache', value, field=name)
+    for name, value in job_queue.metrics().items():
+        REGISTRY.set_gauge('jobs', value, field=name)
+    REGISTRY.set_gauge('micro_batches_total', batcher.batches_processed)
+
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze_document():
     """
@@ -119,10 +325,16 @@ def analyze_document():
     Expects: file upload with optional document_type parameter
     """
 
-    if 'file' not in request.files:
+    timer = StageTimer()
+
+    # Werkzeug parses the multipart body on first access
+    with timer.stage('upload'):
+        files = request.files
+
+    if 'file' not in files:
         return jsonify({'error': 'No file provided'}), 400
 
-    file = request.files['file']
+    file = files['file']
 
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
@@ -132,28 +344,366 @@ def analyze_document():
 
     try:
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
 
         print(f"\n📁 Processing file: {filename}")
 
-        text = read_file_content(file_path)
+        with timer.stage('extraction'):
+            text = read_upload(file)
 
         if text is None or len(text.strip()) == 0:
-            os.remove(file_path)
             return jsonify({'error': 'Could not read file content'}), 400
 
-        document_type = request.form.get('document_type', detect_document_type(text))
+        response = analyze_text(text, filename, request.form.get('document_type'), timer,
+                                wait=app.config['VALIDATOR_WAIT_SECONDS'])
+
+        with timer.stage('serialization'):
+            body = json_response(response)
+
+        record_request(timer, 'analyze', 1)
+        return body
+
+    except ValidatorNotReady as e:
+        return not_ready_response(e)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print(traceback.format_exc())
+
+        return jsonify({
+            'error': 'Analysis failed',
+            'details': str(e)
+        }), 500
+
+
+def analyze_text(text, filename, document_type, timer, wait=None):
+    """
+    Response body of /analyze for extracted text: detects the type unless
+    given, then validates through the result cache and micro-batcher.
+    Blocks for the model pass; raises ValidatorNotReady like validate_cached.
+    """
+    with timer.stage('detect_document_type'):
+        document_type = document_type or detect_document_type(text)
+
+    print(f"📄 Document type: {document_type}")
+    print(f"📏 Content length: {len(text)} characters")
+
+    validation_result = validate_cached([(text, document_type)], [timer], wait=wait)[0]
+
+    print(f"✓ Analysis complete: {validation_result['total_flaws']} flaws found")
+
+    return {
+        'success': True,
+        'filename': filename,
+        'document_type': document_type,
+        'validation': validation_result,
+        'summary': generate_summary(validation_result),
+        'processing_time': round(timer.elapsed(), 4),
+        'timings': timer.as_ms()
+    }
+
+
+def record_request(timer, endpoint, documents):
+    REGISTRY.observe_stages(timer, endpoint=endpoint)
+    REGISTRY.observe('request_seconds', timer.elapsed(), endpoint=endpoint)
+    REGISTRY.inc('documents_total', documents, endpoint=endpoint)
+
 
-        print(f"📄 Document type: {document_type}")
-        print(f"📏 Content length: {len(text)} characters")
+# Report fields sent in the `verdict` event of /analyze/stream
+VERDICT_FIELDS = ('is_valid', 'confidence', 'windows_analyzed', 'top_windows')
+# Upload types /analyze/stream can validate chunk by chunk
+CHUNKED_EXTENSIONS = ('.txt', '.pdf')
+# Characters of a chunk-validated upload read up front to detect its document type
+DETECT_HEAD_CHARS = 64 * 1024
 
-        if validator:
-            validation_result = validator.validate_document(text, document_type)
+
+def sse_event(event, data):
+    """One server-sent event frame"""
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+
+def _analysis_events(text, document_type, filename, timer):
+    """
+    (event, data) pairs for one document: rule flaws first, then the model
+    verdict and clause flaws, then a summary shaped like the /analyze body
+    """
+    key = None
+    validator = validator_loader.current()
+
+    if validator is None:
+        # Fallback mode is all rules, so it is only one stage
+        validation_result = fallback_validation(text, document_type)
+        for flaw in validation_result['flaws']:
+            yield 'flaw', {'stage': 'rules', 'flaw': flaw}
+    else:
+        with timer.stage('cache_lookup'):
+            key = ResultCache.make_key(text, document_type, validator.cache_tag,
+                                       get_rule_pack().fingerprint)
+            validation_result = result_cache.get(key)
+
+        if validation_result is not None:
+            # Replay a cached analysis in the same event order
+            for flaw in validation_result['flaws']:
+                yield 'flaw', {'stage': 'cached', 'flaw': flaw}
+            yield 'verdict', {field: validation_result[field] for field in VERDICT_FIELDS}
         else:
-            validation_result = fallback_validation(text, document_type)
+            for event, data in validator.validate_document_stages(text, document_type):
+                if event == 'report':
+                    validation_result = data
+                else:
+                    yield event, data
+
+            timer.merge(validation_result.pop('timings', {}))
+            result_cache.put(key, validation_result)
+
+    yield 'summary', _summary_event(validation_result, document_type, filename, timer)
+
+
+def _streamed_events(validator, source, document_type, filename, timer):
+    """
+    (event, data) pairs for a large upload validated chunk by chunk,
+    never holding the whole text: flaws as each chunk reveals them, progress
+    after each chunk, then the verdict and summary. Not cached, since the
+    cache key is a hash of the whole text.
+    """
+    from stream_validator import validate_stream
+
+    validation_result = None
+    for event in validate_stream(validator, source, document_type):
+        if event['event'] == 'flaw':
+            yield 'flaw', {'stage': 'stream', 'flaw': event['flaw']}
+        elif event['event'] == 'progress':
+            yield 'progress', {'characters': event['characters'], 'chunks': event['chunks']}
+        else:
+            validation_result = event['report']
+
+    timer.merge(validation_result.pop('timings', {}))
+    yield 'verdict', {field: validation_result[field] for field in VERDICT_FIELDS}
+    yield 'summary', _summary_event(validation_result, document_type, filename, timer)
+
+
+def _summary_event(validation_result, document_type, filename, timer):
+    """The closing event of /analyze/stream, shaped like the /analyze body"""
+    return {
+        'success': True,
+        'filename': filename,
+        'document_type': document_type,
+        'validation': validation_result,
+        'summary': generate_summary(validation_result),
+        'processing_time': round(timer.elapsed(), 4),
+        'timings': timer.as_ms()
+    }
+
+
+def _chunked_source(file, suffix):
+    """
+    Take a large upload off the request for chunked validation (Flask closes
+    request files when the view returns, before the event stream is read).
+    Returns the text source for validate_stream and the head of the text,
+    or (None, None) if the upload cannot be read.
+    """
+    stream, file.stream = file.stream, io.BytesIO()
+
+    if suffix == '.txt':
+        head = stream.read(DETECT_HEAD_CHARS).decode('utf-8', errors='ignore')
+        stream.seek(0)
+        return stream, head
+
+    try:
+        from pdf_pipeline import iter_pdf_pages
+        # Pages come in order while later ones are still being extracted
+        pages = iter_pdf_pages(stream.read())
+        head_pages = []
+        for page in pages:
+            head_pages.append(page)
+            if sum(len(text) for text in head_pages) >= DETECT_HEAD_CHARS:
+                break
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return None, None
+    finally:
+        stream.close()
+
+    return _chain_pages(head_pages, pages), ''.join(head_pages)
+
+
+def _chain_pages(head_pages, pages):
+    # A generator, so closing it also stops extracting the remaining pages
+    yield from head_pages
+    yield from pages
+
+
+def _upload_size(file):
+    """Bytes in an upload's stream, or None if it cannot seek"""
+    try:
+        stream = file.stream
+        stream.seek(0, io.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        return size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Analyze an uploaded document and stream results as server-sent events
+    Expects: file upload with optional document_type parameter
+    Emits: `start`, `flaw` (rules first, then clauses), `verdict`, `summary`, or `error`
+
+    .txt and .pdf uploads over STREAM_VALIDATION_BYTES are validated chunk by chunk
+    (stream_validator.py) and also emit `progress` after each chunk.
+    """
+
+    timer = StageTimer()
 
-        os.remove(file_path)
+    with timer.stage('upload'):
+        files = request.files
+
+    if 'file' not in files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = files['file']
+
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Allowed: txt, doc, docx, pdf'}), 400
+
+    filename = secure_filename(file.filename)
+    print(f"\n📁 Streaming analysis: {filename}")
+
+    size = _upload_size(file)
+    suffix = os.path.splitext(filename)[1].lower()
+    chunked = suffix in CHUNKED_EXTENSIONS and size is not None and size > app.config['STREAM_VALIDATION_BYTES']
+
+    with timer.stage('extraction'):
+        if chunked:
+            # Only the head is extracted here, to detect the document type
+            text = None
+            source, head = _chunked_source(file, suffix)
+        else:
+            source = None
+            text = head = read_upload(file)
+
+    if head is None or len(head.strip()) == 0:
+        if source is not None:
+            source.close()
+        return jsonify({'error': 'Could not read file content'}), 400
+
+    with timer.stage('detect_document_type'):
+        document_type = request.form.get('document_type') or detect_document_type(head)
+
+    # Wait for the model before committing to a 200 event stream
+    try:
+        if not validator_loader.is_settled:
+            with timer.stage('model_load_wait'):
+                validator_loader.get(app.config['VALIDATOR_WAIT_SECONDS'])
+    except ValidatorNotReady as e:
+        if chunked:
+            source.close()
+        return not_ready_response(e)
+
+    validator = validator_loader.current()
+    if chunked and validator is None:
+        # The rule-only fallback works on the whole text
+        chunked = False
+        with timer.stage('extraction'):
+            text = ''.join(source) if suffix == '.pdf' else read_stream_content(source, filename)
+        source.close()
+
+    def generate():
+        if chunked:
+            yield sse_event('start', {'filename': filename, 'document_type': document_type, 'bytes': size})
+            events = _streamed_events(validator, source, document_type, filename, timer)
+        else:
+            yield sse_event('start', {'filename': filename, 'document_type': document_type, 'characters': len(text)})
+            events = _analysis_events(text, document_type, filename, timer)
+        try:
+            for event, data in events:
+                if event == 'summary':
+                    with timer.stage('serialization'):
+                        frame = sse_event(event, data)
+                    yield frame
+                else:
+                    yield sse_event(event, data)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            print(traceback.format_exc())
+            yield sse_event('error', {'error': 'Analysis failed', 'details': str(e)})
+            return
+        finally:
+            if chunked:
+                source.close()
+
+        REGISTRY.observe_stages(timer, endpoint='stream')
+        REGISTRY.observe('request_seconds', timer.elapsed(), endpoint='stream')
+        REGISTRY.inc('documents_total', endpoint='stream')
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream until it ends
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/analyze/revision', methods=['POST'])
+def analyze_revision():
+    """
+    Re-analyze an edited draft, reusing per-clause results of earlier drafts
+    Expects: file upload plus optional `previous_id` (the `revision.id` of an
+    earlier response) or `previous` file upload, and optional document_type
+    """
+
+    timer = StageTimer()
+
+    with timer.stage('upload'):
+        files = request.files
+
+    if 'file' not in files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = files['file']
+
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Allowed: txt, doc, docx, pdf'}), 400
+
+    previous = files.get('previous')
+    if previous is not None and previous.filename and not allowed_file(previous.filename):
+        return jsonify({'error': 'Invalid previous file type. Allowed: txt, doc, docx, pdf'}), 400
+
+    try:
+        filename = secure_filename(file.filename)
+
+        print(f"\n📁 Processing revision: {filename}")
+
+        with timer.stage('extraction'):
+            text = read_upload(file)
+            previous_text = read_upload(previous) if previous is not None and previous.filename else None
+
+        if text is None or len(text.strip()) == 0:
+            return jsonify({'error': 'Could not read file content'}), 400
+
+        with timer.stage('detect_document_type'):
+            document_type = request.form.get('document_type') or detect_document_type(text)
+
+        with timer.stage('model_load_wait'):
+            validator = validator_loader.get(app.config['VALIDATOR_WAIT_SECONDS'])
+
+        if validator is None:
+            # Fallback mode has no per-clause state to reuse
+            validation_result = validate_cached([(text, document_type)], [timer])[0]
+        else:
+            validation_result = validator.validate_revision(
+                text, document_type,
+                previous_id=request.form.get('previous_id') or None,
+                previous_text=previous_text
+            )
+            timer.merge(validation_result.pop('timings', {}))
 
         response = {
             'success': True,
@@ -161,41 +711,199 @@ def analyze_document():
             'document_type': document_type,
             'validation': validation_result,
             'summary': generate_summary(validation_result),
-            'processing_time': 0.0
+            'processing_time': round(timer.elapsed(), 4),
+            'timings': timer.as_ms()
         }
 
-        print(f"✓ Analysis complete: {validation_result['total_flaws']} flaws found")
+        with timer.stage('serialization'):
+            body = json_response(response)
 
-        return jsonify(response)
+        REGISTRY.observe_stages(timer, endpoint='revision')
+        REGISTRY.observe('request_seconds', timer.elapsed(), endpoint='revision')
+        REGISTRY.inc('documents_total', endpoint='revision')
+
+        return body
+
+    except ValidatorNotReady as e:
+        return not_ready_response(e)
 
     except Exception as e:
         print(f"❌ Error: {e}")
         print(traceback.format_exc())
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         return jsonify({
             'error': 'Analysis failed',
             'details': str(e)
         }), 500
 
 
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze several legal documents in one request
+    Expects: multiple `files` uploads with optional `document_type` values (one per file, in order)
+    """
+
+    timer = StageTimer()
+
+    with timer.stage('upload'):
+        files = request.files.getlist('files')
+
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+
+    if len(files) > app.config['BATCH_MAX_FILES']:
+        return jsonify({'error': f"Too many files. Maximum: {app.config['BATCH_MAX_FILES']}"}), 400
+
+    requested_types = request.form.getlist('document_type')
+    if requested_types and len(requested_types) != len(files):
+        return jsonify({'error': 'Provide one document_type per file or none'}), 400
+
+    uploads = []
+    for file in files:
+        filename = secure_filename(file.filename or '')
+
+        if not file.filename or not allowed_file(file.filename):
+            uploads.append((filename, None, 'Invalid file type'))
+            continue
+
+        with timer.stage('extraction'):
+            uploads.append((filename, read_upload(file), None))
+
+    try:
+        response = analyze_texts(uploads, requested_types, timer, wait=app.config['VALIDATOR_WAIT_SECONDS'])
+    except ValidatorNotReady as e:
+        return not_ready_response(e)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print(traceback.format_exc())
+        return jsonify({'error': 'Analysis failed', 'details': str(e)}), 500
+
+    with timer.stage('serialization'):
+        body = json_response(response)
+
+    record_request(timer, 'analyze_batch', response['analyzed_documents'])
+    return body
+
+
+def analyze_texts(uploads, requested_types, timer, wait=None):
+    """
+    Response body of /analyze/batch for (filename, text, error) per uploaded
+    file, in upload order. Types are detected in one pass unless given (one
+    per file); all readable documents are validated together. Raises
+    ValidatorNotReady like validate_cached.
+    """
+    results = [None] * len(uploads)
+    items = []
+    positions = []
+
+    for index, (filename, text, error) in enumerate(uploads):
+        if error is None and (text is None or len(text.strip()) == 0):
+            error = 'Could not read file content'
+        if error:
+            results[index] = {'success': False, 'filename': filename, 'error': error}
+            continue
+
+        items.append(text)
+        positions.append((index, filename))
+
+    with timer.stage('detect_document_type'):
+        if requested_types:
+            document_types = [requested_types[index] for index, _ in positions]
+        else:
+            document_types = [detected['document_type'] for detected in detect_document_types(items)]
+    items = list(zip(items, document_types))
+    positions = [(index, filename, document_type)
+                 for (index, filename), document_type in zip(positions, document_types)]
+
+    print(f"\n📁 Processing batch: {len(items)} of {len(uploads)} files readable")
+
+    document_timers = [StageTimer() for _ in items]
+    validation_results = validate_cached(items, document_timers, wait=wait)
+
+    for (index, filename, document_type), validation_result, document_timer in zip(
+            positions, validation_results, document_timers):
+        results[index] = {
+            'success': True,
+            'filename': filename,
+            'document_type': document_type,
+            'validation': validation_result,
+            'summary': generate_summary(validation_result),
+            'timings': document_timer.as_ms()
+        }
+
+    for document_timer in document_timers:
+        REGISTRY.observe_stages(document_timer, endpoint='analyze_batch')
+
+    return {
+        'success': True,
+        'total_documents': len(uploads),
+        'analyzed_documents': len(items),
+        'results': results,
+        'processing_time': round(timer.elapsed(), 4),
+        'timings': timer.as_ms()
+    }
+
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a document for analysis and return immediately
+    Expects: file upload with optional document_type parameter
+    """
+
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = request.files['file']
+
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Allowed: txt, doc, docx, pdf'}), 400
+
+    filename = secure_filename(file.filename)
+    payload = (file.filename, file.read(), request.form.get('document_type'))
+
+    try:
+        job_id = job_queue.submit(payload, metadata={'filename': filename})
+    except QueueFullError as e:
+        response = jsonify({'error': 'Server busy', 'details': str(e), 'jobs': job_queue.metrics()})
+        response.headers['Retry-After'] = str(job_queue.estimated_wait())
+        return response, 503
+
+    print(f"\n🗂️  Queued job {job_id} for {filename}")
+
+    response = jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/jobs/{job_id}'
+    })
+    response.headers['Location'] = f'/jobs/{job_id}'
+    return response, 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Return status, progress and (when finished) the result of a job"""
+    job = job_queue.get(job_id)
+
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+
+    return json_response(job)
+
+
 def fallback_validation(text, document_type):
     """Fallback validation if ML model not loaded"""
 
     flaws = []
-    text_lower = text.lower()
+    rules = get_rule_pack()
+    hits = rules.scan(text)
 
-    required_checks = [
-        ("party", "MISSING_PARTIES", "Document must identify parties", "CRITICAL"),
-        ("date", "MISSING_DATE", "Document must have an effective date", "CRITICAL"),
-        ("governing law", "MISSING_GOVERNING_LAW", "Document must specify governing law", "CRITICAL"),
-        ("signature", "MISSING_SIGNATURES", "Document must have signatures", "HIGH")
-    ]
-
-    for keyword, flaw_type, description, severity in required_checks:
-        if keyword not in text_lower:
+    for keyword, flaw_type, description, severity in rules.fallback_checks:
+        if not hits.has(keyword):
             flaws.append({
                 'flaw_type': flaw_type,
                 'severity': severity,
@@ -215,18 +923,10 @@ def fallback_validation(text, document_type):
             'clause_text': ''
         })
 
-    critical = len([f for f in flaws if f['severity'] == 'CRITICAL'])
-    high = len([f for f in flaws if f['severity'] == 'HIGH'])
-
     return {
-        'is_compliant': critical == 0 and high == 0,
         'is_valid': len(flaws) == 0,
         'confidence': 0.75,
-        'total_flaws': len(flaws),
-        'critical_flaws': critical,
-        'high_flaws': high,
-        'medium_flaws': len([f for f in flaws if f['severity'] == 'MEDIUM']),
-        'low_flaws': len([f for f in flaws if f['severity'] == 'LOW']),
+        **severity_summary(count_severities(flaws)),
         'flaws': flaws
     }
 
@@ -249,6 +949,75 @@ def generate_summary(validation_result):
         return f"⚡ Document has {total} minor issue(s) that should be reviewed."
 
 
+@app.route('/document-types/detect', methods=['POST'])
+def detect_types():
+    """
+    Classify documents by type without validating them (bulk triage)
+    Expects: multiple `files` uploads, or JSON {"texts": [...]}
+    """
+
+    timer = StageTimer()
+
+    results = []
+    texts = []
+    positions = []
+
+    if request.is_json:
+        payload = request.get_json(silent=True) or {}
+        submitted = payload.get('texts')
+        if not isinstance(submitted, list) or not all(isinstance(text, str) for text in submitted):
+            return jsonify({'error': 'Expected JSON {"texts": [...]} with a list of strings'}), 400
+        if len(submitted) > app.config['DETECT_MAX_FILES']:
+            return jsonify({'error': f"Too many documents. Maximum: {app.config['DETECT_MAX_FILES']}"}), 400
+        results = [{'index': index} for index in range(len(submitted))]
+        texts = submitted
+        positions = list(range(len(submitted)))
+    else:
+        with timer.stage('upload'):
+            files = request.files.getlist('files')
+
+        if not files:
+            return jsonify({'error': 'No files provided'}), 400
+
+        if len(files) > app.config['DETECT_MAX_FILES']:
+            return jsonify({'error': f"Too many files. Maximum: {app.config['DETECT_MAX_FILES']}"}), 400
+
+        for index, file in enumerate(files):
+            filename = secure_filename(file.filename or '')
+            results.append({'filename': filename})
+
+            if not file.filename or not allowed_file(file.filename):
+                results[index].update({'success': False, 'error': 'Invalid file type'})
+                continue
+
+            with timer.stage('extraction'):
+                text = read_upload(file)
+
+            if text is None or len(text.strip()) == 0:
+                results[index].update({'success': False, 'error': 'Could not read file content'})
+                continue
+
+            texts.append(text)
+            positions.append(index)
+
+    with timer.stage('detect_document_type'):
+        detected = detect_document_types(texts) if texts else []
+
+    for index, detection in zip(positions, detected):
+        results[index].update({'success': True, **detection})
+
+    REGISTRY.observe_stages(timer, endpoint='detect_types')
+    REGISTRY.observe('request_seconds', timer.elapsed(), endpoint='detect_types')
+
+    return jsonify({
+        'success': True,
+        'total_documents': len(results),
+        'results': results,
+        'processing_time': round(timer.elapsed(), 4),
+        'timings': timer.as_ms()
+    })
+
+
 @app.route('/document-types', methods=['GET'])
 def get_document_types():
     """Return supported document types"""
@@ -269,9 +1038,15 @@ if __name__ == '__main__':
     print("="*80)
     print("\nEndpoints:")
     print("  GET  /           - API info")
-    print("  GET  /health     - Health check")
+    print("  GET  /health     - Liveness check")
+    print("  GET  /ready      - Readiness (model loaded)")
     print("  POST /analyze    - Analyze document")
+    print("  POST /analyze/batch - Analyze multiple documents")
+    print("  GET  /metrics    - Prometheus metrics")
+    print("  POST /jobs       - Queue document analysis")
+    print("  GET  /jobs/<id>  - Job status and result")
     print("  GET  /document-types - Supported types")
+    print("  POST /document-types/detect - Classify documents by type")
     print("\n" + "="*80 + "\n")
 
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,352 @@
+"""
+ASGI Backend for Legal Document Analyzer
+Async uploads and parsing on the event loop, model work on a bounded thread pool
+
+Usage:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+/analyze and /analyze/batch are served natively: the multipart body is read
+without holding a thread, extraction runs on Starlette's thread pool and
+detection plus validation run on the inference executor below. When that
+executor is full, requests are answered with 503 and Retry-After at once.
+Every other route is the unchanged Flask app, mounted through a2wsgi.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from werkzeug.utils import secure_filename
+
+import app as flask_backend
+from app import allowed_file, analyze_text, analyze_texts, record_request, validator_loader
+from document_reader import read_stream_content
+from fast_json import dumps
+from job_queue import QueueFullError
+from metrics import REGISTRY, StageTimer
+from validator_loader import ValidatorNotReady
+
+config = flask_backend.app.config
+
+# One executor thread per core, but at least enough to fill a micro-batch:
+# the encoder itself runs on the micro-batcher's thread, and each executor
+# thread waits there for its document, so fewer threads than MICRO_BATCH_SIZE
+# would cap every batch below its size
+ASGI_INFERENCE_WORKERS = int(
+    os.environ.get('ASGI_INFERENCE_WORKERS') or max(os.cpu_count() or 1, config['MICRO_BATCH_SIZE'])
+)
+# Calls queued or running on the executor before new requests are turned away
+ASGI_MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING') or ASGI_INFERENCE_WORKERS * 4)
+# Threads a2wsgi uses to run the mounted Flask routes
+ASGI_WSGI_WORKERS = int(os.environ.get('ASGI_WSGI_WORKERS', 10))
+
+
+class InferenceExecutor:
+    """
+    Thread pool for blocking model work. At most `max_pending` calls may be
+    queued or running; beyond that `run` raises QueueFullError immediately
+    so the server sheds load instead of letting latency grow without bound.
+    A call counts until its thread finishes, even if the client has gone.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Exponential moving average of call duration, for Retry-After
+        self._average_seconds = None
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"{self._pending} analyses pending (limit {self.max_pending})")
+            self._pending += 1
+
+        future = self._executor.submit(self._call, func, args, kwargs)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, func, args, kwargs):
+        started = time.monotonic()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.monotonic() - started
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                if self._average_seconds is None:
+                    self._average_seconds = duration
+                else:
+                    self._average_seconds += 0.2 * (duration - self._average_seconds)
+
+    def estimated_wait(self) -> int:
+        """Rough seconds until a new call would start (used for Retry-After)"""
+        with self._lock:
+            average = self._average_seconds if self._average_seconds is not None else 5.0
+            backlog = self._pending / self.max_workers
+        return max(1, int(round(average * backlog)))
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+
+inference = InferenceExecutor(ASGI_INFERENCE_WORKERS, ASGI_MAX_PENDING)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for report bodies, serialized like the Flask app's"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def error_response(error, status_code, details=None):
+    body = {'error': error}
+    if details is not None:
+        body['details'] = details
+    return JSONResponse(body, status_code=status_code)
+
+
+def busy_response(error):
+    response = JSONResponse(
+        {'error': 'Server busy', 'details': str(error), 'inference': inference.metrics()},
+        status_code=503
+    )
+    response.headers['Retry-After'] = str(inference.estimated_wait())
+    REGISTRY.inc('inference_rejected_total')
+    return response
+
+
+def not_ready_response(error):
+    """Same 503 body as the Flask app while the model is still loading"""
+    response = JSONResponse({
+        'error': 'Model is still loading',
+        'details': str(error),
+        'validator': validator_loader.status()
+    }, status_code=503)
+    response.headers['Retry-After'] = '5'
+    return response
+
+
+class BodyTooLarge(Exception):
+    """The request body grew past MAX_CONTENT_LENGTH while it was being read"""
+
+
+def too_large(request) -> bool:
+    """Reject early on a declared Content-Length; read_form also counts the bytes actually received"""
+    length = request.headers.get('content-length')
+    return length is not None and length.isdigit() and int(length) > config['MAX_CONTENT_LENGTH']
+
+
+def limit_body(request, limit: int) -> Request:
+    """
+    The same request, but reading its body raises BodyTooLarge once more
+    than `limit` bytes have arrived: covers chunked uploads and a
+    Content-Length that understates the body
+    """
+    receive = request.receive
+    received = 0
+
+    async def limited_receive():
+        nonlocal received
+        message = await receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > limit:
+                raise BodyTooLarge(f"request body exceeds {limit} bytes")
+        return message
+
+    return Request(request.scope, limited_receive)
+
+
+async def read_form(request):
+    """
+    Parse the multipart body without blocking the event loop; None if it is
+    malformed. Raises BodyTooLarge past MAX_CONTENT_LENGTH.
+    """
+    limited = limit_body(request, config['MAX_CONTENT_LENGTH'])
+    try:
+        return await limited.form(max_files=config['BATCH_MAX_FILES'] + 1)
+    except BodyTooLarge:
+        raise
+    except Exception as e:
+        print(f"❌ Could not parse upload: {e}")
+        return None
+
+
+async def extract(upload: UploadFile):
+    """Extract text from an upload on the thread pool (PDF and DOCX parsing are CPU-bound)"""
+    return await run_in_threadpool(read_stream_content, upload.file, upload.filename or '')
+
+
+async def analyze_document(request):
+    """
+    Analyze uploaded legal document
+    Expects: file upload with optional document_type parameter
+    """
+
+    timer = StageTimer()
+
+    if too_large(request):
+        return error_response('File too large', 413)
+
+    with timer.stage('upload'):
+        try:
+            form = await read_form(request)
+        except BodyTooLarge:
+            return error_response('File too large', 413)
+
+    if form is None:
+        return error_response('Invalid multipart upload', 400)
+
+    try:
+        file = form.get('file')
+
+        if not isinstance(file, UploadFile):
+            return error_response('No file provided', 400)
+
+        if file.filename == '':
+            return error_response('No file selected', 400)
+
+        if not allowed_file(file.filename):
+            return error_response('Invalid file type. Allowed: txt, doc, docx, pdf', 400)
+
+        filename = secure_filename(file.filename)
+
+        print(f"\n📁 Processing file: {filename}")
+
+        with timer.stage('extraction'):
+            text = await extract(file)
+
+        if text is None or len(text.strip()) == 0:
+            return error_response('Could not read file content', 400)
+
+        response = await inference.run(analyze_text, text, filename, form.get('document_type'), timer,
+                                       wait=config['VALIDATOR_WAIT_SECONDS'])
+
+        with timer.stage('serialization'):
+            body = FastJSONResponse(response)
+
+        record_request(timer, 'analyze', 1)
+        return body
+
+    except QueueFullError as e:
+        return busy_response(e)
+
+    except ValidatorNotReady as e:
+        return not_ready_response(e)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print(traceback.format_exc())
+        return error_response('Analysis failed', 500, str(e))
+
+    finally:
+        await form.close()
+
+
+async def analyze_batch(request):
+    """
+    Analyze several legal documents in one request
+    Expects: multiple `files` uploads with optional `document_type` values (one per file, in order)
+    """
+
+    timer = StageTimer()
+
+    if too_large(request):
+        return error_response('File too large', 413)
+
+    with timer.stage('upload'):
+        try:
+            form = await read_form(request)
+        except BodyTooLarge:
+            return error_response('File too large', 413)
+
+    if form is None:
+        return error_response('Invalid multipart upload', 400)
+
+    try:
+        files = [file for file in form.getlist('files') if isinstance(file, UploadFile)]
+
+        if not files:
+            return error_response('No files provided', 400)
+
+        if len(files) > config['BATCH_MAX_FILES']:
+            return error_response(f"Too many files. Maximum: {config['BATCH_MAX_FILES']}", 400)
+
+        requested_types = form.getlist('document_type')
+        if requested_types and len(requested_types) != len(files):
+            return error_response('Provide one document_type per file or none', 400)
+
+        filenames = [secure_filename(file.filename or '') for file in files]
+        readable = [bool(file.filename) and allowed_file(file.filename) for file in files]
+
+        with timer.stage('extraction'):
+            texts = await asyncio.gather(*(extract(file) for file, ok in zip(files, readable) if ok))
+
+        texts = iter(texts)
+        uploads = [
+            (filename, next(texts), None) if ok else (filename, None, 'Invalid file type')
+            for filename, ok in zip(filenames, readable)
+        ]
+
+        response = await inference.run(analyze_texts, uploads, requested_types, timer,
+                                       wait=config['VALIDATOR_WAIT_SECONDS'])
+
+        with timer.stage('serialization'):
+            body = FastJSONResponse(response)
+
+        record_request(timer, 'analyze_batch', response['analyzed_documents'])
+        return body
+
+    except QueueFullError as e:
+        return busy_response(e)
+
+    except ValidatorNotReady as e:
+        return not_ready_response(e)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        print(traceback.format_exc())
+        return error_response('Analysis failed', 500, str(e))
+
+    finally:
+        await form.close()
+
+
+app = Starlette(
+    routes=[
+        Route('/analyze', analyze_document, methods=['POST']),
+        Route('/analyze/batch', analyze_batch, methods=['POST']),
+        Mount('/', app=WSGIMiddleware(flask_backend.app, workers=ASGI_WSGI_WORKERS))
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+)
+
+print(f"✓ ASGI app ready: {inference.max_workers} inference worker(s), "
+      f"up to {inference.max_pending} analyses pending")
@@ -0,0 +1,181 @@
+"""
+ASGI Load Benchmark
+Drives /analyze at several concurrency levels against gunicorn (gthread) and uvicorn (asgi.py)
+
+For each level it reports throughput, latency percentiles, how many
+requests were shed with 503, and how long /health took while the server
+was busy (a blocked request thread shows up there first).
+
+Usage:
+    python benchmarks/asgi_load.py --stub --concurrency 1 4 16 64
+    python benchmarks/asgi_load.py --servers uvicorn --workers 2 --requests 200
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from prefork_memory import BACKEND_DIR, SAMPLE_CONTRACT, free_port, post_document, wait_ready  # noqa: E402
+
+SERVERS = ("gunicorn", "uvicorn")
+
+
+def server_command(server, port, workers):
+    if server == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"], {
+            "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}"
+        }
+    return [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log"], {}
+
+
+def timed_post(port, payload):
+    start = time.perf_counter()
+    try:
+        status = post_document(port, payload)
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = None
+    return status, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def probe_health(port, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=60):
+                pass
+        except OSError:
+            pass
+        latencies.append(time.perf_counter() - start)
+        stop.wait(0.1)
+
+
+def run_level(port, sample, concurrency, requests, offset):
+    # Distinct documents so the result cache does not short-circuit the model
+    payloads = [sample + f"\n\nSchedule {offset + index}".encode("utf-8") for index in range(requests)]
+
+    stop = threading.Event()
+    health = []
+    prober = threading.Thread(target=probe_health, args=(port, stop, health), daemon=True)
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda payload: timed_post(port, payload), payloads))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    prober.join()
+
+    ok = [seconds for status, seconds in outcomes if status == 200]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(ok),
+        "rejected_503": sum(1 for status, _ in outcomes if status == 503),
+        "errors": sum(1 for status, _ in outcomes if status not in (200, 503)),
+        "seconds": round(elapsed, 3),
+        "ok_per_second": round(len(ok) / elapsed, 2),
+        "p50_ms": round(percentile(ok, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(ok, 0.95) * 1000, 1),
+        "health_p95_ms": round(percentile(health, 0.95) * 1000, 1)
+    }
+
+
+def measure(server, workers, levels, requests, env, startup_timeout):
+    port = free_port()
+    command, extra_env = server_command(server, port, workers)
+
+    process = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=dict(env, **extra_env),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_ready(port, process, startup_timeout)
+
+        with open(SAMPLE_CONTRACT, "rb") as f:
+            sample = f.read()
+
+        # Warm-up outside the measurement
+        run_level(port, sample, 1, 2, offset=-10)
+
+        results = []
+        for index, concurrency in enumerate(levels):
+            result = run_level(port, sample, concurrency, max(requests, concurrency), offset=index * 100000)
+            results.append(dict(result, server=server, workers=workers))
+            print(f"  {server:<9} c={concurrency:<4} {result['ok_per_second']:>7.2f} ok/s  "
+                  f"p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  "
+                  f"503s {result['rejected_503']}")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gunicorn and uvicorn under concurrent /analyze load")
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes per server")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per level (at least the concurrency)")
+    parser.add_argument("--stub", action="store_true", help="Serve a random BERT instead of the configured model")
+    parser.add_argument("--stub-hidden", type=int, default=128)
+    parser.add_argument("--stub-layers", type=int, default=2)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ, VALIDATOR_LOAD="eager")
+
+    if args.stub:
+        from stub_model import build_stub_model
+
+        with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+            stub_dir = build_stub_model(
+                os.path.join(tempfile.gettempdir(), f"legal-validator-stub-{args.stub_hidden}x{args.stub_layers}"),
+                hidden_size=args.stub_hidden, layers=args.stub_layers, vocab_source=f.read()
+            )
+        env["LEGAL_VALIDATOR_BASE_MODEL"] = stub_dir
+        env["LEGAL_VALIDATOR_MODEL_STORE"] = tempfile.mkdtemp(prefix="legal-validator-store-")
+
+    results = []
+    for server in args.servers:
+        print(f"\n{server} ({args.workers} worker(s))")
+        results.extend(measure(server, args.workers, args.concurrency, args.requests, env, args.startup_timeout))
+
+    print(f"\n{'server':<9} {'conc':>5} {'ok':>5} {'503':>5} {'err':>4} {'ok/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'/health p95':>12}")
+    for result in results:
+        print(f"{result['server']:<9} {result['concurrency']:>5} {result['ok']:>5} {result['rejected_503']:>5} "
+              f"{result['errors']:>4} {result['ok_per_second']:>8.2f} {result['p50_ms']:>9.1f} "
+              f"{result['p95_ms']:>9.1f} {result['health_p95_ms']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Inference Backend Benchmark
+Compares latency, resident memory and accuracy parity of eager, int8, TorchScript and ONNX backends
+
+Each backend runs in its own subprocess so resident memory is measured in isolation.
+
+Usage:
+    python benchmarks/backend_comparison.py --backends eager quantized torchscript onnx --threads 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SAMPLE_CONTRACT = os.path.join(BACKEND_DIR, "..", "sample_contract.txt")
+
+
+def memory_mb():
+    """Current and peak resident set size in MB (Linux), else peak via resource"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def run_single(backend, threads, batch_size, repeats):
+    from legal_validator import LegalDocumentValidator
+    from inference_backends import parity_check
+
+    with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+        sample = f.read()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        validator = LegalDocumentValidator(use_gpu=False, backend=backend, num_threads=threads)
+        load_seconds = time.perf_counter() - start
+
+    rss_loaded, _ = memory_mb()
+
+    batch = validator.tokenizer(
+        [sample * 4] * batch_size, truncation=True, max_length=512, padding=True, return_tensors="pt"
+    )
+
+    validator.backend.doc_logits(batch)  # Warm-up
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        validator.backend.doc_logits(batch)
+        latencies.append(time.perf_counter() - start)
+
+    rss_after, rss_peak = memory_mb()
+    latencies.sort()
+
+    # The fp32 reference is loaded only now, so it is not in the memory figures
+    # (the quantized backend converts the validator's own model in place)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = LegalDocumentValidator(use_gpu=False, backend="eager", num_threads=threads)
+    paragraphs = [p for p in sample.split("\n\n") if p.strip()]
+    parity_texts = [sample] + paragraphs[:15]
+    parity = parity_check(reference.backend, validator.backend, validator.tokenizer, parity_texts)
+
+    return {
+        "backend": backend,
+        "threads": threads,
+        "batch_size": batch_size,
+        "sequence_length": int(batch["input_ids"].shape[1]),
+        "load_seconds": round(load_seconds, 3),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "latency_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+        "windows_per_second": round(batch_size / statistics.median(latencies), 2),
+        "rss_loaded_mb": round(rss_loaded, 1),
+        "rss_after_mb": round(rss_after, 1),
+        "rss_peak_mb": round(rss_peak, 1),
+        "max_prob_diff": parity["max_prob_diff"],
+        "label_agreement": parity["label_agreement"],
+        "heads": parity["heads"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference backends")
+    parser.add_argument("--backends", nargs="+", default=["eager", "quantized", "torchscript", "onnx"])
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--max-prob-diff", type=float, default=0.05,
+                        help="Fail if a backend's probabilities drift further than this from eager")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.threads, args.batch_size, args.repeats)))
+        return
+
+    results = []
+    for backend in args.backends:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single", backend,
+             "--threads", str(args.threads), "--batch-size", str(args.batch_size),
+             "--repeats", str(args.repeats)],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            print(f"❌ {backend} failed:\n{completed.stderr[-2000:]}")
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{'backend':<12} {'p50 ms':>9} {'p95 ms':>9} {'win/s':>8} {'RSS MB':>8} {'peak MB':>8} {'max Δp':>9} {'agree':>6}")
+    for result in results:
+        print(f"{result['backend']:<12} {result['latency_p50_ms']:>9.2f} {result['latency_p95_ms']:>9.2f} "
+              f"{result['windows_per_second']:>8.1f} {result['rss_after_mb']:>8.1f} {result['rss_peak_mb']:>8.1f} "
+              f"{result['max_prob_diff']:>9.2e} {result['label_agreement']:>6.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    drifted = [result["backend"] for result in results if result["max_prob_diff"] > args.max_prob_diff]
+    if drifted:
+        print(f"\n❌ Accuracy parity failed for: {', '.join(drifted)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Batch Throughput Benchmark
+Measures validate_documents throughput at several batch sizes on CPU
+
+Usage:
+    python benchmarks/batch_throughput.py --batch-sizes 1 8 32 --documents 64
+    python benchmarks/batch_throughput.py --stub
+    python benchmarks/batch_throughput.py --stub --stub-full-size   # random weights, legal-bert-base shape
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_CONTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "sample_contract.txt")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure validator throughput by batch size")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--documents", type=int, default=64, help="Documents per measurement")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a tiny random BERT instead of the configured model (no downloads)")
+    parser.add_argument("--stub-full-size", action="store_true",
+                        help="With --stub, give the random BERT legal-bert-base's size (768 hidden, 12 layers)")
+    parser.add_argument("--stub-dir", help="Where to build or reuse the stub model (default: temp dir)")
+    args = parser.parse_args()
+
+    with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+        sample = f.read()
+
+    if args.stub:
+        from stub_model import build_stub_model
+        size = {"hidden_size": 768, "layers": 12} if args.stub_full_size else {}
+        stub_dir = build_stub_model(args.stub_dir, vocab_source=sample, **size)
+        # Read at import by legal_validator and model_store, so set before importing them
+        os.environ["LEGAL_VALIDATOR_BASE_MODEL"] = stub_dir
+        os.environ["LEGAL_VALIDATOR_MODEL_STORE"] = tempfile.mkdtemp(prefix="legal-validator-store-")
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    from legal_validator import LegalDocumentValidator
+
+    # Vary lengths so dynamic padding has something to do
+    paragraphs = sample.split("\n\n")
+    texts = ["\n\n".join(paragraphs[:max(3, (i * 7) % len(paragraphs))]) for i in range(args.documents)]
+
+    validator = LegalDocumentValidator(use_gpu=False)
+
+    print(f"\nTorch threads: {torch.get_num_threads()}  Documents: {len(texts)}")
+    print(f"{'batch':>6} {'seconds':>9} {'docs/s':>9}")
+
+    for batch_size in args.batch_sizes:
+        # Warm-up
+        with contextlib.redirect_stdout(io.StringIO()):
+            validator.validate_documents(texts[:batch_size])
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for offset in range(0, len(texts), batch_size):
+                validator.validate_documents(texts[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+
+        print(f"{batch_size:>6} {elapsed:>9.3f} {len(texts) / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
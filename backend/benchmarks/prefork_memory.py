@@ -0,0 +1,170 @@
+"""
+Pre-fork Memory Benchmark
+Starts gunicorn with N workers and reports how much memory the workers share
+
+Proportional set size (PSS) splits each shared page between the processes
+mapping it, so the PSS total is the real cost of the whole server. Linux only.
+
+Usage:
+    python benchmarks/prefork_memory.py --workers 1 4
+    python benchmarks/prefork_memory.py --workers 4 --stub --stub-hidden 768 --stub-layers 12
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CONTRACT = os.path.join(BACKEND_DIR, "..", "sample_contract.txt")
+
+
+def smaps(pid):
+    """Rss, Pss, Shared and Private memory of one process in MB"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": round(fields.get("Rss", 0.0), 1),
+        "pss_mb": round(fields.get("Pss", 0.0), 1),
+        "shared_mb": round(fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0), 1),
+        "private_mb": round(fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0), 1)
+    }
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children", "r") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def post_document(port, payload):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"contract.txt\"\r\n"
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode("utf-8") + payload + f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/analyze", data=body, method="POST",
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    with urllib.request.urlopen(request, timeout=300) as response:
+        return response.status
+
+
+def wait_ready(port, process, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def measure(workers, requests, env, startup_timeout):
+    port = free_port()
+    env = dict(env, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_ready(port, process, startup_timeout)
+
+        with open(SAMPLE_CONTRACT, "rb") as f:
+            sample = f.read()
+
+        # Distinct documents so the result cache does not short-circuit the model
+        payloads = [sample + f"\n\nSchedule {index}".encode("utf-8") for index in range(requests)]
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            statuses = list(pool.map(lambda payload: post_document(port, payload), payloads))
+
+        master = smaps(process.pid)
+        worker_stats = [smaps(pid) for pid in children(process.pid)]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    return {
+        "workers": workers,
+        "requests_ok": sum(1 for status in statuses if status == 200),
+        "master": master,
+        "worker_rss_mb": [stats["rss_mb"] for stats in worker_stats],
+        "worker_private_mb": [stats["private_mb"] for stats in worker_stats],
+        "total_pss_mb": round(master["pss_mb"] + sum(stats["pss_mb"] for stats in worker_stats), 1),
+        "naive_total_rss_mb": round(master["rss_mb"] + sum(stats["rss_mb"] for stats in worker_stats), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory sharing across pre-forked workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--requests", type=int, default=16, help="Analyses to run before measuring")
+    parser.add_argument("--stub", action="store_true", help="Serve a random BERT instead of the configured model")
+    parser.add_argument("--stub-hidden", type=int, default=768)
+    parser.add_argument("--stub-layers", type=int, default=12)
+    parser.add_argument("--no-mmap", action="store_true",
+                        help="Load weights into process memory (MMAP_WEIGHTS=0) and rely on copy-on-write only")
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.no_mmap:
+        env["MMAP_WEIGHTS"] = "0"
+
+    if args.stub:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from stub_model import build_stub_model
+
+        with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+            stub_dir = build_stub_model(
+                os.path.join(tempfile.gettempdir(), f"legal-validator-stub-{args.stub_hidden}x{args.stub_layers}"),
+                hidden_size=args.stub_hidden, layers=args.stub_layers, vocab_source=f.read()
+            )
+        env["LEGAL_VALIDATOR_BASE_MODEL"] = stub_dir
+        env["LEGAL_VALIDATOR_MODEL_STORE"] = tempfile.mkdtemp(prefix="legal-validator-store-")
+
+    results = [measure(workers, args.requests, env, args.startup_timeout) for workers in args.workers]
+
+    print(f"\n{'workers':>7} {'ok':>4} {'master RSS':>11} {'worker RSS':>11} {'worker private':>15} "
+          f"{'total PSS':>10} {'sum of RSS':>11}")
+    for result in results:
+        worker_rss = max(result["worker_rss_mb"]) if result["worker_rss_mb"] else 0.0
+        worker_private = max(result["worker_private_mb"]) if result["worker_private_mb"] else 0.0
+        print(f"{result['workers']:>7} {result['requests_ok']:>4} {result['master']['rss_mb']:>10.0f}M "
+              f"{worker_rss:>10.0f}M {worker_private:>14.0f}M {result['total_pss_mb']:>9.0f}M "
+              f"{result['naive_total_rss_mb']:>10.0f}M")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
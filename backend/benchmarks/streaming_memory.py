@@ -0,0 +1,121 @@
+"""
+Streaming Memory Benchmark
+Peak memory of full versus streaming validation as the input file grows
+
+Each case runs in a fresh process; the reported peak is the growth of the
+resident set over the loaded model, so only per-document memory counts.
+
+Usage:
+    python benchmarks/streaming_memory.py --stub --sizes 1MB 4MB 16MB
+    python benchmarks/streaming_memory.py --sizes 8MB --modes stream --chunk-chars 262144
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from suite import BACKEND_DIR, memory_mb, reset_peak_rss  # noqa: E402
+from synthetic import SAMPLE_CONTRACT, format_size, generate_contract, parse_size  # noqa: E402
+
+DOCUMENT_TYPE = "FOUNDER_AGREEMENT"
+
+
+def run_case(mode, path, chunk_chars):
+    """Child process: load the validator, then validate `path` once and report memory"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        from legal_validator import LegalDocumentValidator
+        validator = LegalDocumentValidator(use_gpu=False)
+
+    rss_loaded, _ = memory_mb()
+    resettable = reset_peak_rss()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "full":
+            from document_reader import read_file_content
+            report = validator.validate_document(read_file_content(path), DOCUMENT_TYPE)
+            first_flaw_seconds = None
+        else:
+            from stream_validator import validate_stream
+            first_flaw_seconds = None
+            for event in validate_stream(validator, path, DOCUMENT_TYPE, chunk_chars=chunk_chars):
+                if event["event"] == "flaw" and first_flaw_seconds is None:
+                    first_flaw_seconds = time.perf_counter() - start
+                elif event["event"] == "report":
+                    report = event["report"]
+    seconds = time.perf_counter() - start
+
+    _, rss_peak = memory_mb()
+    return {
+        "seconds": round(seconds, 3),
+        "first_flaw_seconds": round(first_flaw_seconds, 3) if first_flaw_seconds is not None else None,
+        "rss_loaded_mb": round(rss_loaded, 1),
+        "rss_peak_mb": round(rss_peak, 1),
+        "rss_growth_mb": round(max(0.0, rss_peak - rss_loaded), 1),
+        "peak_is_per_case": resettable,
+        "flaws": report["total_flaws"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare peak memory of full and streaming validation")
+    parser.add_argument("--sizes", nargs="+", default=["1MB", "4MB", "16MB"])
+    parser.add_argument("--modes", nargs="+", default=["full", "stream"], choices=["full", "stream"])
+    parser.add_argument("--chunk-chars", type=int, default=1024 * 1024)
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a tiny random BERT instead of the configured model (no downloads)")
+    parser.add_argument("--stub-dir", help="Where to build or reuse the stub model (default: temp dir)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        print(json.dumps(run_case(args.child[0], args.child[1], args.chunk_chars)))
+        return
+
+    env = dict(os.environ)
+    if args.stub:
+        from stub_model import build_stub_model
+        with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+            env["LEGAL_VALIDATOR_BASE_MODEL"] = build_stub_model(args.stub_dir, vocab_source=f.read())
+        env["LEGAL_VALIDATOR_MODEL_STORE"] = tempfile.mkdtemp(prefix="legal-validator-store-")
+
+    results = []
+    print(f"{'size':>6} {'mode':<7} {'seconds':>8} {'first flaw':>11} {'RSS growth':>11} {'flaws':>6}")
+
+    with tempfile.TemporaryDirectory(prefix="legal-validator-stream-") as directory:
+        for size in [parse_size(size) for size in args.sizes]:
+            path = os.path.join(directory, f"contract-{size}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generate_contract(DOCUMENT_TYPE, size, seed=0))
+
+            for mode in args.modes:
+                completed = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, path,
+                     "--chunk-chars", str(args.chunk_chars)],
+                    cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+                )
+                measured = json.loads(completed.stdout.strip().splitlines()[-1])
+                results.append({"size_label": format_size(size), "size_bytes": size, "mode": mode, **measured})
+
+                first_flaw = measured["first_flaw_seconds"]
+                first_flaw = f"{first_flaw:>10.2f}s" if first_flaw is not None else f"{'-':>11}"
+                print(f"{format_size(size):>6} {mode:<7} {measured['seconds']:>7.2f}s {first_flaw} "
+                      f"{measured['rss_growth_mb']:>10.0f}M {measured['flaws']:>6}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
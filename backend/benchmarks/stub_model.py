@@ -0,0 +1,51 @@
+"""
+Stub Model
+A tiny randomly initialised BERT and WordPiece tokenizer, for benchmarking without downloading weights
+"""
+
+import os
+import re
+import tempfile
+from typing import Optional
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def build_stub_model(directory: Optional[str] = None, hidden_size: int = 128, layers: int = 2,
+                     vocab_source: Optional[str] = None) -> str:
+    """
+    Write a small BertModel and matching tokenizer to `directory` and return
+    its path. The vocabulary is every word of `vocab_source` plus single
+    characters, so any input tokenizes without [UNK] blow-up. Sequence length
+    and tokenization match the real model; only the encoder is smaller.
+    """
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    import torch
+
+    directory = directory or tempfile.mkdtemp(prefix="legal-validator-stub-")
+    if os.path.isfile(os.path.join(directory, "config.json")):
+        return directory
+    os.makedirs(directory, exist_ok=True)
+
+    words = set(re.findall(r"[a-z]+", (vocab_source or "").lower()))
+    characters = [chr(code) for code in range(33, 127)]
+    vocab = SPECIAL_TOKENS + characters + [f"##{c}" for c in characters] + sorted(words - set(characters))
+
+    vocab_file = os.path.join(directory, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab) + "\n")
+
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file, do_lower_case=True, model_max_length=512)
+    tokenizer.save_pretrained(directory)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=hidden_size,
+        num_hidden_layers=layers,
+        num_attention_heads=max(1, hidden_size // 64),
+        intermediate_size=hidden_size * 4,
+        max_position_embeddings=512,
+    )
+    BertModel(config).save_pretrained(directory)
+    return directory
@@ -0,0 +1,314 @@
+"""
+Benchmark Suite
+Per-stage validator timings, the full /analyze path and memory high-water marks on synthetic contracts
+
+Results are written as JSON so runs from different commits can be compared.
+
+Usage:
+    python benchmarks/suite.py --stub --output results.json
+    python benchmarks/suite.py --sizes 1KB 64KB 1MB --types NDA GENERAL --repeats 5
+    python benchmarks/suite.py --stub --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic import DOCUMENT_TYPES, SAMPLE_CONTRACT, generate_corpus, parse_size  # noqa: E402
+
+DEFAULT_SIZES = ["1KB", "16KB", "256KB", "1MB", "5MB"]
+
+
+def memory_mb():
+    """Current and peak resident set size in MB (Linux), else peak via resource"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return peak, peak
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter so each case gets its own high-water mark"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def summarize(samples_ms):
+    samples = sorted(samples_ms)
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(samples[-1], 3)
+    }
+
+
+def median_stages(stage_runs):
+    names = []
+    for stages in stage_runs:
+        names.extend(name for name in stages if name not in names)
+    return {
+        name: round(statistics.median(stages.get(name, 0.0) for stages in stage_runs), 3)
+        for name in names
+    }
+
+
+def measure_memory(run):
+    """Run once under tracemalloc and report RSS and Python heap high-water marks"""
+    rss_before, _ = memory_mb()
+    resettable = reset_peak_rss()
+
+    tracemalloc.start()
+    try:
+        run()
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    _, rss_peak = memory_mb()
+    return {
+        "rss_before_mb": round(rss_before, 1),
+        "rss_peak_mb": round(rss_peak, 1),
+        "rss_growth_mb": round(max(0.0, rss_peak - rss_before), 1),
+        "python_peak_mb": round(python_peak / (1024 * 1024), 2),
+        "peak_is_per_case": resettable
+    }
+
+
+def bench_validator(validator, document, repeats):
+    text, document_type = document["text"], document["document_type"]
+    walls, stage_runs = [], []
+    result = None
+
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = validator.validate_document(text, document_type)
+            walls.append((time.perf_counter() - start) * 1000)
+        stage_runs.append(result["timings"])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        memory = measure_memory(lambda: validator.validate_document(text, document_type))
+
+    return {
+        **summarize(walls),
+        "stages_ms": median_stages(stage_runs),
+        "windows_analyzed": result["windows_analyzed"],
+        "flaws": result["total_flaws"],
+        **memory
+    }
+
+
+def bench_analyze(app_module, client, document, repeats):
+    payload = document["text"].encode("utf-8")
+
+    def post():
+        response = client.post(
+            "/analyze",
+            data={
+                "file": (io.BytesIO(payload), "benchmark.txt"),
+                "document_type": document["document_type"]
+            },
+            content_type="multipart/form-data"
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"/analyze returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return response.get_json()
+
+    walls, stage_runs = [], []
+    for _ in range(repeats):
+        app_module.result_cache.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            body = post()
+            walls.append((time.perf_counter() - start) * 1000)
+        stage_runs.append(body["timings"])
+
+    # Same document again: served from the result cache
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        post()
+        cached_ms = (time.perf_counter() - start) * 1000
+
+    def uncached():
+        app_module.result_cache.clear()
+        post()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        memory = measure_memory(uncached)
+
+    return {
+        **summarize(walls),
+        "cached_ms": round(cached_ms, 3),
+        "stages_ms": median_stages(stage_runs),
+        "response_bytes": len(json.dumps(body)),
+        **memory
+    }
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    """Print median ratios against a previous run; return the cases that regressed"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {
+            (entry["target"], entry["size_label"], entry["document_type"]): entry
+            for entry in json.load(f)["results"]
+        }
+
+    regressions = []
+    print(f"\n{'target':<10} {'size':>6} {'type':<22} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for entry in results:
+        key = (entry["target"], entry["size_label"], entry["document_type"])
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = entry["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        flag = " ❌" if ratio > 1 + tolerance else ""
+        print(f"{key[0]:<10} {key[1]:>6} {key[2]:<22} {previous['median_ms']:>10.1f} "
+              f"{entry['median_ms']:>10.1f} {ratio:>7.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the validator and the /analyze endpoint")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="Document sizes, e.g. 1KB 256KB 5MB")
+    parser.add_argument("--types", nargs="+", default=DOCUMENT_TYPES, choices=DOCUMENT_TYPES)
+    parser.add_argument("--targets", nargs="+", default=["validator", "analyze"], choices=["validator", "analyze"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a tiny random BERT instead of the configured model (no downloads)")
+    parser.add_argument("--stub-dir", help="Where to build or reuse the stub model (default: temp dir)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed median slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes]
+
+    if args.stub:
+        from stub_model import build_stub_model
+        with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+            stub_dir = build_stub_model(args.stub_dir, vocab_source=f.read())
+        # Read at import by legal_validator and model_store, so set before importing them
+        os.environ["LEGAL_VALIDATOR_BASE_MODEL"] = stub_dir
+        os.environ["LEGAL_VALIDATOR_MODEL_STORE"] = tempfile.mkdtemp(prefix="legal-validator-store-")
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("📝 Generating synthetic contracts...")
+    corpus = generate_corpus(sizes, args.types, seed=args.seed)
+
+    print("🔧 Loading validator...")
+    app_module = client = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_start = time.perf_counter()
+        if "analyze" in args.targets:
+            import app as app_module
+            validator = app_module.validator_loader.get()
+            # Uploads of the largest size plus multipart overhead must fit
+            app_module.app.config["MAX_CONTENT_LENGTH"] = max(
+                app_module.app.config["MAX_CONTENT_LENGTH"] or 0, max(sizes) + 64 * 1024
+            )
+            client = app_module.app.test_client()
+        else:
+            from legal_validator import LegalDocumentValidator
+            validator = LegalDocumentValidator(use_gpu=False)
+        load_seconds = time.perf_counter() - load_start
+
+    if validator is None:
+        print("❌ Validator failed to load; rerun with --stub to benchmark without model weights")
+        sys.exit(1)
+
+    rss_loaded, _ = memory_mb()
+    results = []
+
+    print(f"\n{'target':<10} {'size':>6} {'type':<22} {'median ms':>10} {'min ms':>9} {'RSS peak':>9} {'py peak':>8}")
+    for document in corpus:
+        for target in args.targets:
+            if target == "validator":
+                measured = bench_validator(validator, document, args.repeats)
+            else:
+                measured = bench_analyze(app_module, client, document, args.repeats)
+
+            entry = {
+                "target": target,
+                "size_label": document["size_label"],
+                "size_bytes": len(document["text"].encode("utf-8")),
+                "document_type": document["document_type"],
+                "repeats": args.repeats,
+                **measured
+            }
+            results.append(entry)
+            print(f"{target:<10} {entry['size_label']:>6} {entry['document_type']:<22} "
+                  f"{entry['median_ms']:>10.1f} {entry['min_ms']:>9.1f} "
+                  f"{entry['rss_peak_mb']:>8.0f}M {entry['python_peak_mb']:>7.1f}M")
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "stub_model": args.stub,
+            "model_version": validator.model_version,
+            "cache_tag": validator.cache_tag,
+            "seed": args.seed,
+            "load_seconds": round(load_seconds, 3),
+            "rss_loaded_mb": round(rss_loaded, 1)
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
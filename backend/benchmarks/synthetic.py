@@ -0,0 +1,134 @@
+"""
+Synthetic Contracts
+Deterministic benchmark documents built from sample_contract.txt and the training templates
+"""
+
+import os
+import random
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CONTRACT = os.path.join(BACKEND_DIR, "..", "sample_contract.txt")
+
+DOCUMENT_TYPES = ["GENERAL", "NDA", "EMPLOYMENT_AGREEMENT", "FOUNDER_AGREEMENT", "SAFE_AGREEMENT"]
+
+# Title and opening recital per type, so type-specific rules have something to find
+PREAMBLES = {
+    "GENERAL": (
+        "SERVICES AGREEMENT",
+        "This Services Agreement is entered into on February 1, 2025 between Acme Services "
+        "Private Limited and Beta Retail LLP."
+    ),
+    "NDA": (
+        "NON-DISCLOSURE AGREEMENT",
+        "This Non-Disclosure Agreement is entered into on January 15, 2025 by and between "
+        "TechCorp Inc. and John Smith to protect Confidential Information."
+    ),
+    "EMPLOYMENT_AGREEMENT": (
+        "EMPLOYMENT AGREEMENT",
+        "This Employment Agreement is made on March 1, 2025 between Global Corp (\"Employer\") "
+        "and Sarah Johnson (\"Employee\")."
+    ),
+    "FOUNDER_AGREEMENT": (
+        "FOUNDER AGREEMENT",
+        "This Founder Agreement is entered into on January 15, 2024 between the Founders "
+        "regarding equity, vesting and intellectual property of the Company."
+    ),
+    "SAFE_AGREEMENT": (
+        "SIMPLE AGREEMENT FOR FUTURE EQUITY (SAFE)",
+        "This SAFE is issued on April 10, 2025 by NewCo Private Limited to the Investor in "
+        "exchange for an investment of INR 50,00,000, subject to a valuation cap and discount."
+    ),
+}
+
+SIZES = {"KB": 1024, "MB": 1024 * 1024}
+
+
+def parse_size(value: str) -> int:
+    """'1KB', '256KB', '5MB' or a plain byte count"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(KB|MB)?\s*", value.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * SIZES.get(match.group(2), 1))
+
+
+def format_size(size: int) -> str:
+    if size >= SIZES["MB"] and size % SIZES["MB"] == 0:
+        return f"{size // SIZES['MB']}MB"
+    if size >= SIZES["KB"] and size % SIZES["KB"] == 0:
+        return f"{size // SIZES['KB']}KB"
+    return f"{size}B"
+
+
+@lru_cache(maxsize=None)
+def _clause_bodies() -> Tuple[str, ...]:
+    """Clause paragraphs from the sample contract and the training templates, headings stripped"""
+    from legal_validator import LegalDocumentValidator
+
+    with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+        sources = [f.read()]
+
+    # The templates do not depend on instance state
+    sources.extend(LegalDocumentValidator._create_training_data(None)["train"]["text"])
+
+    bodies = []
+    for source in sources:
+        for paragraph in re.split(r"\n\s*\n|\n(?=\d+\.\s+[A-Z])", source):
+            lines = [line for line in paragraph.strip().splitlines() if line.strip()]
+            if lines and re.match(r"^\d+\.\s+[A-Z][A-Z &,-]+$", lines[0].strip()):
+                lines = lines[1:]
+            body = "\n".join(lines).strip()
+            if len(body) >= 40:
+                bodies.append(body)
+    return tuple(bodies)
+
+
+@lru_cache(maxsize=None)
+def _headings() -> Tuple[str, ...]:
+    with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+        headings = re.findall(r"^\d+\.\s+([A-Z][A-Z &,-]+)$", f.read(), flags=re.MULTILINE)
+    return tuple(headings) + ("CONFIDENTIAL INFORMATION", "OBLIGATIONS", "TERM", "COMPENSATION", "GOVERNING LAW")
+
+
+def generate_contract(document_type: str, size: int, seed: int = 0) -> str:
+    """
+    A contract of about `size` bytes (UTF-8): a typed preamble followed by
+    numbered sections whose bodies are drawn from the sample contract and
+    training templates. The same arguments always give the same text.
+    """
+    if document_type not in PREAMBLES:
+        raise ValueError(f"Unknown document type: {document_type}")
+
+    rng = random.Random(f"{seed}:{document_type}:{size}")
+    bodies = _clause_bodies()
+    headings = _headings()
+
+    title, recital = PREAMBLES[document_type]
+    parts = [f"{title}\n\n{recital}"]
+    length = len(parts[0].encode("utf-8"))
+
+    section = 1
+    while length < size:
+        clause = f"{section}. {rng.choice(headings)}\n\n{rng.choice(bodies)}"
+        parts.append(clause)
+        length += len(clause.encode("utf-8")) + 2
+        section += 1
+
+    text = "\n\n".join(parts)
+    return text.encode("utf-8")[:size].decode("utf-8", errors="ignore")
+
+
+def generate_corpus(sizes: List[int], document_types: Optional[List[str]] = None, seed: int = 0) -> List[Dict]:
+    """One document per (size, type) pair"""
+    return [
+        {
+            "document_type": document_type,
+            "size": size,
+            "size_label": format_size(size),
+            "text": generate_contract(document_type, size, seed)
+        }
+        for size in sizes
+        for document_type in (document_types or DOCUMENT_TYPES)
+    ]
@@ -0,0 +1,356 @@
+"""
+Bulk Document Analysis
+Validates every contract in a directory or ZIP archive, writing one JSON line per file
+
+Usage:
+    python bulk_analyze.py contracts/ --output results.jsonl
+    python bulk_analyze.py contracts.zip --output results.jsonl --workers 8 --batch-size 32
+
+Text is extracted in worker processes while the model validates the previous
+batch. The output file is also the checkpoint: each batch's lines are flushed
+as soon as it finishes, and a rerun with the same --output skips files already
+in it (unless they changed since), so an interrupted audit picks up where it stopped.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from doc_type_classifier import get_type_classifier
+from document_reader import read_file_content, read_stream_content
+
+SUPPORTED_EXTENSIONS = (".txt", ".doc", ".docx", ".pdf")
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Documents per validate_documents call; their windows share padded model batches
+DEFAULT_BATCH_SIZE = 16
+# A batch is also cut at this many characters, so a few huge files don't make one giant batch
+DEFAULT_BATCH_CHARS = 500_000
+DEFAULT_MAX_FILE_MB = 50
+# Extracted documents waiting for the model, per worker (bounds memory)
+QUEUED_PER_WORKER = 4
+PROGRESS_INTERVAL = 5.0
+
+
+# Inputs
+
+def list_documents(source: str, max_bytes: int) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Supported files under a directory or in a ZIP archive, in name order, as
+    (name, fingerprint, error). Names are relative paths / archive member names;
+    the fingerprint changes when a file does. Files over `max_bytes` get an error.
+    """
+    documents = []
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                error = "File too large" if info.file_size > max_bytes else None
+                documents.append((info.filename, f"{info.file_size}:{info.CRC:08x}", error))
+
+    elif os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in files:
+                if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                error = "File too large" if stat.st_size > max_bytes else None
+                name = os.path.relpath(path, source).replace(os.sep, "/")
+                documents.append((name, f"{stat.st_size}:{stat.st_mtime_ns}", error))
+
+    else:
+        raise ValueError(f"Not a directory or ZIP archive: {source}")
+
+    documents.sort()
+    return documents
+
+
+def load_checkpoint(output: str, retry_failed: bool = False) -> Dict[str, str]:
+    """
+    Files already recorded in `output`, as name -> fingerprint. A line cut
+    short by an interruption is removed, so new results append cleanly.
+    """
+    if not os.path.isfile(output):
+        return {}
+
+    with open(output, "rb+") as f:
+        data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            f.truncate(complete)
+
+    completed = {}
+    for line in data[:complete].splitlines():
+        record = json.loads(line)
+        if retry_failed and not record.get("success"):
+            completed.pop(record["file"], None)
+        else:
+            completed[record["file"]] = record.get("fingerprint")
+    return completed
+
+
+# Extraction workers
+
+_archives: Dict[str, zipfile.ZipFile] = {}
+
+
+def _init_worker():
+    # Ctrl-C is handled by the parent, which stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # The pool already has one process per core; don't fan out again per PDF
+    os.environ["PDF_WORKERS"] = "1"
+
+
+def _extract(source: str, name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Worker: (text, error) of one file in a directory or archive"""
+    try:
+        if os.path.isdir(source):
+            text = read_file_content(os.path.join(source, name))
+        else:
+            archive = _archives.get(source)
+            if archive is None:
+                archive = _archives[source] = zipfile.ZipFile(source)
+            text = read_stream_content(io.BytesIO(archive.read(name)), name)
+    except Exception as e:
+        return None, str(e)
+
+    if text is None or not text.strip():
+        return None, "Could not read file content"
+    return text, None
+
+
+# Validation
+
+def _load_validator(model_version: Optional[str]):
+    # torch is imported here, after the extraction workers have started, so they stay small
+    from legal_validator import LegalDocumentValidator
+
+    print("\n🔧 Initializing Legal Document Validator...")
+    validator = LegalDocumentValidator(use_gpu=False, model_version=model_version)
+    get_type_classifier(validator.store, validator.model_version)
+    print("✓ Validator initialized successfully")
+    return validator
+
+
+def analyze_batch(validator, batch: List[Tuple[str, str, str]], document_type: Optional[str],
+                  verbose: bool = False) -> List[Dict]:
+    """Records for a batch of (name, fingerprint, text), validated in one call"""
+    texts = [text for _, _, text in batch]
+
+    if document_type:
+        detected = [{"document_type": document_type, "confidence": None}] * len(texts)
+    else:
+        detected = get_type_classifier(validator.store, validator.model_version).classify_many(texts)
+    document_types = [result["document_type"] for result in detected]
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        try:
+            validations = validator.validate_documents(texts, document_types)
+        except Exception:
+            # Don't lose the whole batch to one bad document
+            validations = []
+            for text, batch_type in zip(texts, document_types):
+                try:
+                    validations.append(validator.validate_document(text, batch_type))
+                except Exception as e:
+                    validations.append(e)
+
+    records = []
+    for (name, fingerprint, text), detection, validation in zip(batch, detected, validations):
+        if isinstance(validation, Exception):
+            records.append(_error_record(name, fingerprint, f"Analysis failed: {validation}"))
+            continue
+        records.append({
+            "file": name,
+            "fingerprint": fingerprint,
+            "success": True,
+            "document_type": detection["document_type"],
+            "type_confidence": detection["confidence"],
+            "characters": len(text),
+            "model": validator.cache_tag,
+            "validation": validation
+        })
+    return records
+
+
+def _error_record(name: str, fingerprint: str, error: str) -> Dict:
+    return {"file": name, "fingerprint": fingerprint, "success": False, "error": error}
+
+
+# Progress
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Progress:
+    """Files done, throughput and ETA for this run, printed at most every `interval` seconds"""
+
+    def __init__(self, total: int, interval: float = PROGRESS_INTERVAL):
+        self.total = total
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.done = 0
+        self.failed = 0
+        self.characters = 0
+
+    def add(self, records: List[Dict]):
+        self.done += len(records)
+        self.failed += sum(1 for record in records if not record["success"])
+        self.characters += sum(record.get("characters", 0) for record in records)
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            print(self.line())
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def line(self) -> str:
+        elapsed = self.elapsed
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        eta = _format_duration(remaining / rate) if rate > 0 else "?"
+        percent = 100.0 * self.done / self.total if self.total else 100.0
+        return (f"📊 {self.done}/{self.total} ({percent:.1f}%) | {rate:.1f} docs/s | "
+                f"{self.characters / elapsed / 1e6 if elapsed > 0 else 0:.2f} M chars/s | "
+                f"{self.failed} failed | ETA {eta}")
+
+
+# Driver
+
+def run(source: str, output: str, workers: int = DEFAULT_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_chars: int = DEFAULT_BATCH_CHARS, document_type: Optional[str] = None,
+        model_version: Optional[str] = None, max_file_mb: float = DEFAULT_MAX_FILE_MB,
+        resume: bool = True, retry_failed: bool = False, verbose: bool = False) -> Progress:
+    """Analyze every supported file in `source`, appending records to `output`"""
+    documents = list_documents(source, int(max_file_mb * 1024 * 1024))
+
+    completed = load_checkpoint(output, retry_failed) if resume else {}
+    if not resume and os.path.exists(output):
+        os.remove(output)
+    todo = [(name, fingerprint, error) for name, fingerprint, error in documents
+            if completed.get(name) != fingerprint]
+
+    print(f"\n📁 {len(documents)} documents in {source}; "
+          f"{len(documents) - len(todo)} already in {output}, {len(todo)} to analyze")
+
+    progress = Progress(len(todo))
+    if not todo:
+        return progress
+
+    queue = iter(todo)
+    max_in_flight = workers * QUEUED_PER_WORKER + batch_size
+    in_flight = {}
+    batch, batch_length = [], 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, \
+            open(output, "a", encoding="utf-8") as out:
+
+        def write(records: List[Dict]):
+            out.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            out.flush()
+            progress.add(records)
+
+        def refill() -> List[Dict]:
+            skipped = []
+            while len(in_flight) < max_in_flight:
+                item = next(queue, None)
+                if item is None:
+                    break
+                name, fingerprint, error = item
+                if error:
+                    skipped.append(_error_record(name, fingerprint, error))
+                else:
+                    in_flight[pool.submit(_extract, source, name)] = (name, fingerprint)
+            return skipped
+
+        try:
+            # Extraction starts before the model loads, and overlaps every batch after
+            write(refill())
+            validator = _load_validator(model_version)
+            progress.started = progress.last_report = time.perf_counter()
+
+            while in_flight or batch:
+                failed = []
+                if in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, fingerprint = in_flight.pop(future)
+                        text, error = future.result()
+                        if error:
+                            failed.append(_error_record(name, fingerprint, error))
+                        else:
+                            batch.append((name, fingerprint, text))
+                            batch_length += len(text)
+                    failed.extend(refill())
+                if failed:
+                    write(failed)
+
+                if batch and (len(batch) >= batch_size or batch_length >= batch_chars or not in_flight):
+                    write(analyze_batch(validator, batch, document_type, verbose))
+                    batch, batch_length = [], 0
+
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print(f"\n⚠️  Interrupted after {progress.done} documents; "
+                  f"run the same command again to resume")
+            raise
+
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every contract in a directory or ZIP archive")
+    parser.add_argument("source", help="Directory or .zip of .txt/.docx/.pdf files")
+    parser.add_argument("--output", "-o", required=True, help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Text extraction processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Documents per model batch")
+    parser.add_argument("--batch-chars", type=int, default=DEFAULT_BATCH_CHARS,
+                        help="Also cut a batch at this many characters")
+    parser.add_argument("--document-type", help="Validate all files as this type instead of detecting it")
+    parser.add_argument("--model-version", help="Model artifact version (default: LATEST)")
+    parser.add_argument("--max-file-mb", type=float, default=DEFAULT_MAX_FILE_MB,
+                        help="Skip (and record as failed) files larger than this")
+    parser.add_argument("--restart", action="store_true", help="Discard existing results instead of resuming")
+    parser.add_argument("--retry-failed", action="store_true", help="When resuming, analyze failed files again")
+    parser.add_argument("--verbose", action="store_true", help="Show the validator's per-batch output")
+    args = parser.parse_args()
+
+    try:
+        progress = run(args.source, args.output, args.workers, args.batch_size, args.batch_chars,
+                       args.document_type, args.model_version, args.max_file_mb,
+                       resume=not args.restart, retry_failed=args.retry_failed, verbose=args.verbose)
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    if progress.done:
+        print(progress.line())
+    print(f"\n✓ Analyzed {progress.done} documents ({progress.failed} failed) in "
+          f"{_format_duration(progress.elapsed)}; results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
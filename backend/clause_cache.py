@@ -0,0 +1,97 @@
+"""
+Clause Cache
+Content-addressed per-clause analyses and recent revisions, for incremental re-validation
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class ClauseCache:
+    """
+    In-process LRU of per-clause analyses (model logits and rule hits),
+    keyed by a hash of the clause text and the model/rules versions.
+
+    A clause's analysis does not depend on where it sits in the document,
+    so a revised draft reuses every clause it shares with any earlier draft,
+    not just the previous one. The clause keys of recent revisions are kept
+    too, so a revision can be diffed against its predecessor by id.
+    """
+
+    def __init__(self, max_entries: int = 20000, max_revisions: int = 256):
+        self.max_entries = max_entries
+        self.max_revisions = max_revisions
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._revisions: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def reset_after_fork(self):
+        """A lock held by another thread at fork() would never be released in the child"""
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clause_key(text: str, tag: str) -> str:
+        """Content address of one clause analysis under a model/rules tag"""
+        digest = hashlib.sha256(tag.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def revision_id(text: str) -> str:
+        """Stable id of a document revision (its content hash)"""
+        return hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()[:16]
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict]]:
+        results = []
+        with self._lock:
+            for key in keys:
+                analysis = self._entries.get(key)
+                if analysis is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                results.append(analysis)
+        return results
+
+    def put(self, key: str, analysis: Dict):
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remember_revision(self, revision_id: str, keys: List[str]):
+        with self._lock:
+            self._revisions[revision_id] = keys
+            self._revisions.move_to_end(revision_id)
+            while len(self._revisions) > self.max_revisions:
+                self._revisions.popitem(last=False)
+
+    def revision(self, revision_id: str) -> Optional[List[str]]:
+        """Clause keys of a remembered revision, or None if unknown or evicted"""
+        with self._lock:
+            return self._revisions.get(revision_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._revisions.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "clauses": len(self._entries),
+                "revisions": len(self._revisions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
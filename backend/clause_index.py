@@ -0,0 +1,311 @@
+"""
+Reference Clause Index
+Memory-mapped embeddings of approved clauses, matched against document clauses in one matrix multiply
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "index.json"
+
+# Above this many references, and with faiss installed, search an HNSW graph instead of every row
+ANN_MIN_ROWS = int(os.environ.get("CLAUSE_INDEX_ANN_MIN_ROWS", 10000))
+ANN_NEIGHBOURS = 64
+
+# Share of labelled calibration pairs the match threshold must classify
+# correctly (balanced over positives and negatives) for the index to be used.
+# Encoders that were not trained for similarity (e.g. the base Legal-BERT,
+# whose mean-pooled embeddings all score ~0.999) fall well short.
+MIN_CALIBRATION_ACCURACY = float(os.environ.get("REFERENCE_MIN_CALIBRATION_ACCURACY", 0.9))
+# Share of labelled positives that must count as approved wording
+APPROVED_POSITIVE_SHARE = 0.9
+
+
+class ClauseIndex:
+    """
+    L2-normalized embeddings of approved reference clauses, one row each,
+    grouped by requirement (e.g. "governing_law").
+
+        <directory>/index.json               entries, thresholds, calibration, encoder tag
+        <directory>/embeddings-<hash>.npy    float32 matrix, memory-mapped
+
+    Rows are keyed by a hash of their requirement and text, so `update`
+    embeds only references that are new or changed, and keeps the rest.
+    A new matrix file is written under a new name and the manifest is
+    replaced atomically, so readers (including other worker processes)
+    always see a matching pair. The matrix is memory-mapped read-only:
+    every process shares the page-cache copy.
+
+    `match` scores a batch of clause embeddings against every row in one
+    matrix multiply (or, for very large indexes with faiss installed, an
+    approximate HNSW search) and keeps the best row per requirement.
+
+    Thresholds are calibrated on labelled clauses that are not references
+    (see `update`). `calibrated` is False when the encoder cannot separate
+    them; the scores are then noise and the index should not be used.
+    """
+
+    def __init__(self, directory: str, encoder_tag: str, use_ann: Optional[bool] = None):
+        self.directory = directory
+        self.encoder_tag = encoder_tag
+        self.use_ann = use_ann
+
+        self.keys: List[str] = []
+        self.entries: List[Dict] = []
+        self.requirements: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.match_threshold = 0.5
+        self.approved_threshold = 0.75
+        self.calibration: Dict = {}
+        self._groups: List[Tuple[int, int]] = []
+        self._row_groups: Optional[np.ndarray] = None
+        self._ann = None
+
+        self.load()
+
+    @staticmethod
+    def entry_key(requirement: str, text: str) -> str:
+        return hashlib.sha256(f"{requirement}\0{text}".encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def calibrated(self) -> bool:
+        """True if the thresholds separate the labelled calibration pairs (or were set explicitly)"""
+        if os.environ.get("REFERENCE_MATCH_SIMILARITY"):
+            return True
+        return self.calibration.get("accuracy", 0.0) >= MIN_CALIBRATION_ACCURACY
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever the references, the encoder or the thresholds do"""
+        digest = hashlib.sha256(self.encoder_tag.encode("utf-8"))
+        digest.update("".join(self.keys).encode("ascii"))
+        digest.update(f"{self.match_threshold:.6f}:{self.approved_threshold:.6f}".encode("ascii"))
+        return digest.hexdigest()[:12]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # Build and load
+
+    def load(self) -> bool:
+        """Open the saved index if it was built by the same encoder; False otherwise"""
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return False
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("encoder") != self.encoder_tag:
+            return False
+
+        matrix = np.load(os.path.join(self.directory, manifest["matrix"]), mmap_mode="r")
+        self._set(manifest["entries"], matrix, manifest["match_threshold"], manifest["approved_threshold"],
+                  manifest.get("calibration", {}))
+        return True
+
+    def update(self, references: Dict[str, Sequence[str]], embed: Callable[[List[str]], np.ndarray],
+               calibration: Optional[Dict[str, Sequence[str]]] = None, unrelated: Sequence[str] = ()) -> int:
+        """
+        Make the index hold exactly `references` (requirement -> texts),
+        embedding only entries it does not have yet. Returns how many were embedded.
+
+        Thresholds are fitted on labelled clauses that are not references:
+        each `calibration[requirement]` text is a positive pair with its own
+        requirement and a negative with every other, and each `unrelated`
+        text is a negative with every requirement.
+        """
+        entries = [{"requirement": requirement, "text": text}
+                   for requirement in sorted(references) for text in references[requirement]]
+        keys = [self.entry_key(entry["requirement"], entry["text"]) for entry in entries]
+        labelled = [(requirement, text) for requirement in sorted(calibration or {})
+                    for text in calibration[requirement]] + [(None, text) for text in unrelated]
+        calibration_key = hashlib.sha256(json.dumps(labelled).encode("utf-8")).hexdigest()[:16]
+        if keys == self.keys and self.calibration.get("key") == calibration_key:
+            return 0
+
+        existing = {key: row for row, key in enumerate(self.keys)}
+        new_rows = [row for row, key in enumerate(keys) if key not in existing]
+        embedded = embed([entries[row]["text"] for row in new_rows]) if new_rows else None
+
+        dimension = embedded.shape[1] if embedded is not None else self.matrix.shape[1]
+        matrix = np.empty((len(entries), dimension), dtype=np.float32)
+        for row, key in enumerate(keys):
+            if key in existing:
+                matrix[row] = self.matrix[existing[key]]
+        if new_rows:
+            matrix[new_rows] = embedded / np.maximum(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12)
+
+        if labelled:
+            clauses = embed([text for _, text in labelled])
+            clauses = clauses / np.maximum(np.linalg.norm(clauses, axis=1, keepdims=True), 1e-12)
+        else:
+            clauses = np.empty((0, matrix.shape[1]), dtype=np.float32)
+        match_threshold, approved_threshold, calibration = _calibrate(
+            matrix, [entry["requirement"] for entry in entries], clauses, [requirement for requirement, _ in labelled]
+        )
+        calibration["key"] = calibration_key
+        self._save(entries, matrix, match_threshold, approved_threshold, calibration)
+        return len(new_rows)
+
+    def _save(self, entries: List[Dict], matrix: np.ndarray, match_threshold: float, approved_threshold: float,
+              calibration: Dict):
+        directory = self.directory
+        try:
+            os.makedirs(directory, exist_ok=True)
+            probe = tempfile.NamedTemporaryFile(dir=directory, delete=True)
+            probe.close()
+        except OSError:
+            directory = self.directory = tempfile.mkdtemp(prefix="legal-validator-clause-index-")
+            print(f"⚠️  Clause index directory is not writable; using {directory}")
+
+        keys = [self.entry_key(entry["requirement"], entry["text"]) for entry in entries]
+        matrix_name = f"embeddings-{hashlib.sha256(''.join(keys).encode('ascii')).hexdigest()[:12]}.npy"
+        matrix_path = os.path.join(directory, matrix_name)
+
+        staging = f"{matrix_path}.{os.getpid()}.tmp"
+        with open(staging, "wb") as f:
+            np.save(f, matrix)
+        os.replace(staging, matrix_path)
+
+        manifest = {
+            "encoder": self.encoder_tag,
+            "matrix": matrix_name,
+            "dimension": int(matrix.shape[1]),
+            "match_threshold": match_threshold,
+            "approved_threshold": approved_threshold,
+            "calibration": calibration,
+            "entries": [dict(entry, key=key) for entry, key in zip(entries, keys)]
+        }
+        staging = os.path.join(directory, f".{MANIFEST_FILE}.{os.getpid()}")
+        with open(staging, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(staging, os.path.join(directory, MANIFEST_FILE))
+
+        # Older matrices are unreferenced now; processes that mapped one keep their mapping
+        for name in os.listdir(directory):
+            if name.startswith("embeddings-") and name.endswith(".npy") and name != matrix_name:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+        self._set(manifest["entries"], np.load(matrix_path, mmap_mode="r"), match_threshold, approved_threshold,
+                  calibration)
+
+    def _set(self, entries: List[Dict], matrix: np.ndarray, match_threshold: float, approved_threshold: float,
+             calibration: Dict):
+        self.entries = entries
+        self.calibration = calibration
+        self.keys = [entry["key"] for entry in entries]
+        self.matrix = matrix
+        self.match_threshold = float(os.environ.get("REFERENCE_MATCH_SIMILARITY", match_threshold))
+        self.approved_threshold = float(os.environ.get("REFERENCE_APPROVED_SIMILARITY", approved_threshold))
+
+        # Entries are sorted by requirement, so each requirement is a contiguous block of rows
+        self.requirements, self._groups = [], []
+        for row, entry in enumerate(entries):
+            if not self.requirements or self.requirements[-1] != entry["requirement"]:
+                self.requirements.append(entry["requirement"])
+                self._groups.append((row, row + 1))
+            else:
+                self._groups[-1] = (self._groups[-1][0], row + 1)
+        self._row_groups = np.repeat(np.arange(len(self._groups)), [end - start for start, end in self._groups])
+
+        self._ann = None
+        use_ann = self.use_ann if self.use_ann is not None else len(entries) >= ANN_MIN_ROWS
+        if use_ann and len(entries):
+            self._ann = _build_ann(matrix)
+
+    # Queries
+
+    def match(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best similarity and reference row per requirement for each clause:
+        two (clauses, requirements) arrays. Requirements with no reference
+        among an approximate search's neighbours score -inf (row -1).
+        """
+        count, groups = len(embeddings), len(self._groups)
+        best = np.full((count, groups), -np.inf, dtype=np.float32)
+        rows = np.full((count, groups), -1, dtype=np.int64)
+        if not count or not groups:
+            return best, rows
+
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        if self._ann is not None:
+            scores, neighbours = self._ann.search(embeddings, min(ANN_NEIGHBOURS, len(self.keys)))
+            # Neighbours come best first, so the first hit of each requirement wins
+            for clause in range(count):
+                for score, row in zip(scores[clause], neighbours[clause]):
+                    if row < 0:
+                        continue
+                    group = self._row_groups[row]
+                    if rows[clause, group] < 0:
+                        best[clause, group], rows[clause, group] = score, row
+            return best, rows
+
+        similarities = embeddings @ self.matrix.T
+        for group, (start, end) in enumerate(self._groups):
+            block = similarities[:, start:end]
+            winners = block.argmax(axis=1)
+            rows[:, group] = start + winners
+            best[:, group] = block[np.arange(count), winners]
+        return best, rows
+
+
+def _calibrate(matrix: np.ndarray, requirements: List[str], clauses: np.ndarray,
+               labels: List[Optional[str]]) -> Tuple[float, float, Dict]:
+    """
+    Thresholds for this encoder's similarity scale from labelled clauses:
+    each clause is scored against every requirement (best reference), the
+    pair being positive if the clause's label is that requirement. "Matches"
+    is the score that best separates positives from negatives (balanced
+    accuracy), "approved" the score APPROVED_POSITIVE_SHARE of positives
+    reach. Also returns the calibration record (accuracy and pair counts).
+    """
+    names = sorted(set(requirements))
+    row_groups = np.asarray([names.index(requirement) for requirement in requirements])
+    similarities = clauses @ matrix.T
+    scores = np.stack([
+        similarities[:, row_groups == group].max(axis=1) for group in range(len(names))
+    ], axis=1) if len(clauses) else np.empty((0, len(names)), dtype=np.float32)
+    positive = np.asarray([[label == name for name in names] for label in labels], dtype=bool).reshape(scores.shape)
+
+    positives, negatives = scores[positive], scores[~positive]
+    if not positives.size or not negatives.size:
+        return 0.5, 0.75, {"accuracy": 0.0, "positives": int(positives.size), "negatives": int(negatives.size)}
+
+    # Every distinct score is a candidate; a pair matches at or above the threshold
+    candidates = np.unique(scores)
+    true_positive = (positives[None, :] >= candidates[:, None]).mean(axis=1)
+    true_negative = (negatives[None, :] < candidates[:, None]).mean(axis=1)
+    balanced = (true_positive + true_negative) / 2
+    best = int(balanced.argmax())
+
+    match_threshold = float(candidates[best])
+    approved_threshold = max(match_threshold, float(np.percentile(positives, 100 * (1 - APPROVED_POSITIVE_SHARE))))
+    calibration = {
+        "accuracy": round(float(balanced[best]), 4),
+        "positives": int(positives.size),
+        "negatives": int(negatives.size),
+        "positive_median": round(float(np.median(positives)), 6),
+        "negative_median": round(float(np.median(negatives)), 6)
+    }
+    return round(match_threshold, 6), round(approved_threshold, 6), calibration
+
+
+def _build_ann(matrix: np.ndarray):
+    """HNSW inner-product index over the rows, or None without faiss"""
+    try:
+        import faiss
+    except ImportError:
+        return None
+
+    index = faiss.IndexHNSWFlat(matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+    index.add(np.ascontiguousarray(matrix, dtype=np.float32))
+    return index
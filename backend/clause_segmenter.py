@@ -0,0 +1,140 @@
+"""
+Clause Segmenter
+Splits a contract into numbered or headed clauses with exact character spans
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from text_index import SECTION_HEADING
+
+
+# Numbered sub-clauses such as "1.2 Initial equity distribution:" at the start of a line
+SUBCLAUSE = re.compile(r"^[ \t]*(\d+\.\d+(?:\.\d+)*)\.?[ \t]+(?=\S)", re.MULTILINE)
+
+# Unnumbered all-caps headings such as "FOUNDERS:" or "SIGNATURES"
+HEADED_BLOCK = re.compile(r"^[ \t]*([A-Z][A-Z0-9 ,&'()/\-]{3,}?):?[ \t]*$", re.MULTILINE)
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+# Clauses longer than this are split at paragraph breaks, so unstructured
+# documents still yield model-sized pieces (~512 tokens)
+MAX_CLAUSE_CHARS = 2000
+
+
+@dataclass
+class Clause:
+    """One clause of a document; `text` is document[char_start:char_end]"""
+    index: int
+    char_start: int
+    char_end: int
+    text: str
+    number: Optional[str] = None
+    heading: Optional[str] = None
+    section: Optional[str] = None
+
+    @property
+    def title(self) -> str:
+        """Human-readable label, e.g. '1.2', '5. GOVERNING LAW' or 'SIGNATURES'"""
+        if self.number and self.heading:
+            return f"{self.number}. {self.heading}"
+        return self.number or self.heading or self.section or "Preamble"
+
+
+def segment_clauses(text: str, max_chars: int = MAX_CLAUSE_CHARS) -> List[Clause]:
+    """
+    Split `text` at numbered section headings ("1. EQUITY DISTRIBUTION"),
+    numbered sub-clauses ("1.2 ...") and unnumbered all-caps headings.
+    A heading with no body of its own is merged into the clause that
+    follows it. Spans are contiguous and cover the non-blank text.
+    """
+    boundaries = {}  # start offset -> (number, heading, is_section)
+
+    for match in SECTION_HEADING.finditer(text):
+        boundaries[match.start()] = (match.group(1), match.group(2).strip(), True)
+    for match in SUBCLAUSE.finditer(text):
+        boundaries.setdefault(match.start(), (match.group(1), None, False))
+    for match in HEADED_BLOCK.finditer(text):
+        boundaries.setdefault(match.start(), (None, match.group(1).strip(), True))
+
+    starts = sorted(boundaries)
+    if not starts or starts[0] > 0:
+        starts.insert(0, 0)
+        boundaries.setdefault(0, (None, None, False))
+
+    clauses: List[Clause] = []
+    section = None
+    pending_start = None
+    pending_label = None
+
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(text)
+        number, heading, is_section = boundaries[start]
+
+        if is_section:
+            section = f"{number}. {heading}" if number and heading else heading
+
+        body = text[start:end]
+        first_line, _, rest = body.partition("\n")
+
+        # A heading line with nothing under it labels the next clause
+        if is_section and not rest.strip():
+            if pending_start is None:
+                pending_start, pending_label = start, (number, heading)
+            continue
+
+        if pending_start is not None:
+            start = pending_start
+            if number is None and heading is None:
+                number, heading = pending_label
+            pending_start = pending_label = None
+
+        if not text[start:end].strip():
+            continue
+
+        for piece_start, piece_end in _split_long(text, start, end, max_chars):
+            clauses.append(Clause(
+                index=len(clauses),
+                char_start=piece_start,
+                char_end=piece_end,
+                text=text[piece_start:piece_end],
+                number=number,
+                heading=heading,
+                section=section
+            ))
+
+    if pending_start is not None and text[pending_start:].strip():
+        number, heading = pending_label
+        clauses.append(Clause(len(clauses), pending_start, len(text), text[pending_start:],
+                              number=number, heading=heading, section=section))
+
+    return clauses
+
+
+def last_boundary(text: str, start: int, end: int) -> Optional[int]:
+    """
+    Offset of the last clause start within text[start:end], preferring
+    section headings over sub-clauses, or None. Cutting a text there keeps
+    every clause on one side of the cut.
+    """
+    for patterns in ((SECTION_HEADING, HEADED_BLOCK), (SUBCLAUSE,)):
+        starts = [match.start() for pattern in patterns for match in pattern.finditer(text, start, end)]
+        if starts:
+            return max(starts)
+    return None
+
+
+def _split_long(text: str, start: int, end: int, max_chars: int):
+    """Yield (start, end) pieces of at most ~max_chars, cut at paragraph breaks where possible"""
+    while end - start > max_chars:
+        cut = None
+        for match in _PARAGRAPH_BREAK.finditer(text, start + max_chars // 4, start + max_chars):
+            cut = match.end()
+        if cut is None:
+            # No paragraph break in range: cut at the last line break, else hard cut
+            newline = text.rfind("\n", start + 1, start + max_chars)
+            cut = newline + 1 if newline > start else start + max_chars
+        yield start, cut
+        start = cut
+    yield start, end
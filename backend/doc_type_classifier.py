@@ -0,0 +1,279 @@
+"""
+Document Type Classifier
+Hashed word n-grams and a temperature-scaled linear softmax model, scored for all types in one NumPy pass
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model_store import ModelArtifactStore
+
+DOCUMENT_TYPES = ["GENERAL", "NDA", "EMPLOYMENT_AGREEMENT", "FOUNDER_AGREEMENT", "SAFE_AGREEMENT"]
+
+N_FEATURES = 2 ** 18
+# The type is evident from the title, recitals and first clauses; bounds the cost of huge files
+MAX_CHARS = 20000
+# Below this top probability the detector falls back to GENERAL, whose
+# requirements are the subset shared by every type
+MIN_CONFIDENCE = float(os.environ.get("DOC_TYPE_MIN_CONFIDENCE", 0.5))
+
+COMPONENT = "doc_type"
+WEIGHTS_FILE = "weights.npz"
+CONFIG_FILE = "config.json"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+BIGRAM_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class _TokenHashes(dict):
+    """token -> crc32, filled on first lookup so repeated tokens are a C-level dict hit"""
+
+    max_entries = 1_000_000
+
+    def __missing__(self, token: str) -> int:
+        if len(self) >= self.max_entries:
+            self.clear()
+        value = self[token] = zlib.crc32(token.encode("utf-8"))
+        return value
+
+
+class DocumentTypeClassifier:
+    """
+    Multinomial logistic regression over hashed unigrams and bigrams.
+
+    A batch of documents becomes one sparse (row, feature, value) matrix
+    with sublinear term frequencies and L2-normalized rows; the scores of
+    every type come from one gather of the weight matrix and a segmented
+    sum. The temperature is fitted on a held-out fold of the synthetic
+    training corpus, not on real documents.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, temperature: float = 1.0,
+                 document_types: Sequence[str] = DOCUMENT_TYPES, n_features: int = N_FEATURES,
+                 max_chars: int = MAX_CHARS, metadata: Optional[Dict] = None):
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.temperature = float(temperature)
+        self.document_types = list(document_types)
+        self.n_features = n_features
+        self.max_chars = max_chars
+        self.metadata = metadata or {}
+        self._hashes = _TokenHashes()
+
+    # Features
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse features of `texts` as (rows, columns, values), sorted by row"""
+        keys = []
+        lookup = self._hashes.__getitem__
+        n_features = np.uint64(self.n_features)
+
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text[:self.max_chars].lower())
+            if not tokens:
+                continue
+            hashes = np.fromiter(map(lookup, tokens), dtype=np.uint64, count=len(tokens))
+            with np.errstate(over="ignore"):
+                bigrams = hashes[:-1] * BIGRAM_MULTIPLIER + hashes[1:]
+            buckets = np.concatenate((hashes % n_features, (bigrams >> np.uint64(16)) % n_features))
+            keys.append(buckets.astype(np.int64) + row * self.n_features)
+
+        if not keys:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32)
+
+        unique_keys, counts = np.unique(np.concatenate(keys), return_counts=True)
+        rows, columns = np.divmod(unique_keys, self.n_features)
+        values = (1.0 + np.log(counts)).astype(np.float32)
+
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        values /= norms[rows].astype(np.float32)
+        return rows, columns, values
+
+    # Inference
+
+    def _logits(self, texts: Sequence[str]) -> np.ndarray:
+        rows, columns, values = self.transform(texts)
+        scores = np.zeros((len(texts), len(self.document_types)), dtype=np.float32)
+        if len(rows):
+            present, starts = np.unique(rows, return_index=True)
+            scores[present] = np.add.reduceat(self.weights[columns] * values[:, None], starts, axis=0)
+        return scores + self.bias
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Temperature-scaled probabilities, shape (len(texts), len(document_types))"""
+        return _softmax(self._logits(texts) / self.temperature)
+
+    def classify_many(self, texts: Sequence[str], min_confidence: float = MIN_CONFIDENCE) -> List[Dict]:
+        """Most likely type of each text, its probability, and all type probabilities"""
+        probabilities = self.predict_proba(texts)
+        results = []
+        for row in probabilities:
+            best = int(row.argmax())
+            confidence = float(row[best])
+            document_type = self.document_types[best] if confidence >= min_confidence else "GENERAL"
+            results.append({
+                "document_type": document_type,
+                "confidence": round(confidence, 4),
+                "probabilities": {name: round(float(p), 4) for name, p in zip(self.document_types, row)}
+            })
+        return results
+
+    def classify(self, text: str, min_confidence: float = MIN_CONFIDENCE) -> Dict:
+        return self.classify_many([text], min_confidence)[0]
+
+    # Training
+
+    @classmethod
+    def fit(cls, texts: Sequence[str], labels: Sequence[str],
+            calibration_texts: Sequence[str] = (), calibration_labels: Sequence[str] = (),
+            document_types: Sequence[str] = DOCUMENT_TYPES, l2: float = 1e-3, steps: int = 100,
+            learning_rate: float = 0.1) -> "DocumentTypeClassifier":
+        """
+        Fit on (`texts`, `labels`). If calibration data is given, the
+        temperature is chosen on it, and the final weights are refit on both
+        sets. Calibration documents should not share wording with the
+        training ones, or the model looks more certain than it is.
+        Only features that occur in the data are optimized, as a small dense
+        matrix; all others keep weight zero.
+        """
+        document_types = list(document_types)
+        targets = np.array([document_types.index(label) for label in labels])
+        classifier = cls(np.zeros((N_FEATURES, len(document_types))), np.zeros(len(document_types)),
+                         document_types=document_types)
+
+        classifier._fit_weights(texts, targets, l2, steps, learning_rate)
+        metadata = {"samples": len(texts) + len(calibration_texts)}
+
+        if len(calibration_texts):
+            calibration_targets = np.array([document_types.index(label) for label in calibration_labels])
+            logits = classifier._logits(calibration_texts)
+            classifier.temperature = _fit_temperature(logits, calibration_targets)
+            metadata["calibration_accuracy"] = round(float((logits.argmax(axis=1) == calibration_targets).mean()), 4)
+            metadata["calibration_nll"] = round(_nll(logits / classifier.temperature, calibration_targets), 4)
+
+            classifier._fit_weights(list(texts) + list(calibration_texts),
+                                    np.concatenate((targets, calibration_targets)), l2, steps, learning_rate)
+
+        metadata["temperature"] = round(classifier.temperature, 4)
+        classifier.metadata = metadata
+        return classifier
+
+    def _fit_weights(self, texts: Sequence[str], targets: np.ndarray, l2: float, steps: int,
+                     learning_rate: float):
+        """Full-batch Adam on the softmax cross-entropy"""
+        rows, columns, values = self.transform(texts)
+        used, local_columns = np.unique(columns, return_inverse=True)
+
+        features = np.zeros((len(texts), len(used)), dtype=np.float32)
+        features[rows, local_columns] = values
+        one_hot = np.eye(len(self.document_types), dtype=np.float32)[targets]
+
+        weights = np.zeros((len(used), len(self.document_types)), dtype=np.float32)
+        bias = np.zeros(len(self.document_types), dtype=np.float32)
+        moments = [np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(bias), np.zeros_like(bias)]
+
+        for step in range(1, steps + 1):
+            error = (_softmax(features @ weights + bias) - one_hot) / len(texts)
+            gradients = (features.T @ error + l2 * weights, error.sum(axis=0))
+            for index, (parameter, gradient) in enumerate(zip((weights, bias), gradients)):
+                first, second = moments[2 * index], moments[2 * index + 1]
+                first *= 0.9
+                first += 0.1 * gradient
+                second *= 0.999
+                second += 0.001 * gradient * gradient
+                parameter -= learning_rate * (first / (1 - 0.9 ** step)) / (
+                    np.sqrt(second / (1 - 0.999 ** step)) + 1e-8)
+
+        self.weights = np.zeros((self.n_features, len(self.document_types)), dtype=np.float32)
+        self.weights[used] = weights
+        self.bias = bias
+
+    # Persistence (same interface as the encoder, so it can be a model store component)
+
+    def save_pretrained(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        used = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        np.savez_compressed(os.path.join(path, WEIGHTS_FILE), rows=used, weights=self.weights[used],
+                            bias=self.bias)
+        with open(os.path.join(path, CONFIG_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "document_types": self.document_types,
+                "n_features": self.n_features,
+                "max_chars": self.max_chars,
+                "temperature": self.temperature,
+                "metadata": self.metadata
+            }, f, indent=2)
+
+    @classmethod
+    def from_pretrained(cls, path: str) -> "DocumentTypeClassifier":
+        with open(os.path.join(path, CONFIG_FILE), "r", encoding="utf-8") as f:
+            config = json.load(f)
+        with np.load(os.path.join(path, WEIGHTS_FILE)) as saved:
+            weights = np.zeros((config["n_features"], len(config["document_types"])), dtype=np.float32)
+            weights[saved["rows"]] = saved["weights"]
+            bias = saved["bias"]
+        return cls(weights, bias, config["temperature"], config["document_types"],
+                   config["n_features"], config["max_chars"], config.get("metadata"))
+
+
+def train_default_classifier(samples_per_type: int = 100, seed: int = 0) -> DocumentTypeClassifier:
+    """Fit on the built-in synthetic corpus (doc_type_corpus.py), calibrating on a disjoint fold of it"""
+    from doc_type_corpus import generate_documents
+
+    texts, labels = generate_documents(samples_per_type, seed, fold=0)
+    calibration_texts, calibration_labels = generate_documents(samples_per_type, seed + 1, fold=1)
+    return DocumentTypeClassifier.fit(texts, labels, calibration_texts, calibration_labels)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+def _nll(logits: np.ndarray, targets: np.ndarray) -> float:
+    probabilities = _softmax(logits)[np.arange(len(targets)), targets]
+    return float(-np.log(np.maximum(probabilities, 1e-12)).mean())
+
+
+def _fit_temperature(logits: np.ndarray, targets: np.ndarray) -> float:
+    """Temperature that minimizes held-out negative log-likelihood"""
+    candidates = np.exp(np.linspace(np.log(0.05), np.log(20.0), 200))
+    return float(min(candidates, key=lambda t: _nll(logits / t, targets)))
+
+
+# (store root, version) -> classifier
+_type_classifiers: Dict[Tuple[str, Optional[str]], DocumentTypeClassifier] = {}
+_type_classifier_lock = threading.Lock()
+
+
+def get_type_classifier(store: Optional[ModelArtifactStore] = None,
+                        version: Optional[str] = None) -> DocumentTypeClassifier:
+    """
+    Return the process-wide classifier for an artifact (default: the latest
+    in the default store), so it matches the validator serving beside it.
+    Falls back to one fitted on the built-in corpus (well under a second)
+    if the artifact has none.
+    """
+    store = store or ModelArtifactStore()
+    key = (os.path.abspath(store.root), version)
+
+    with _type_classifier_lock:
+        if key not in _type_classifiers:
+            artifact_path = store.resolve(version)
+            component_path = os.path.join(artifact_path, COMPONENT) if artifact_path else None
+
+            if component_path and os.path.isdir(component_path):
+                _type_classifiers[key] = DocumentTypeClassifier.from_pretrained(component_path)
+                print(f"   • Document-type classifier from artifact {os.path.basename(artifact_path)}")
+            else:
+                _type_classifiers[key] = train_default_classifier()
+                print("   • Document-type classifier fitted on the built-in corpus")
+
+        return _type_classifiers[key]
@@ -0,0 +1,252 @@
+"""
+Document Type Corpus
+Synthetic labelled documents for fitting the document-type classifier
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+PARTIES = [
+    ("TechCorp Inc.", "John Smith"),
+    ("Global Corp", "Sarah Johnson"),
+    ("Acme Services Private Limited", "Beta Retail LLP"),
+    ("NewCo Private Limited", "Horizon Ventures Fund I"),
+    ("Quantum Labs Pvt. Ltd.", "Priya Sharma"),
+    ("Northwind Traders", "Rahul Mehta"),
+    ("BlueSky Analytics LLC", "Ananya Iyer"),
+    ("Orion Software Solutions", "Michael Chen"),
+]
+
+DATES = ["January 15, 2025", "March 1, 2025", "1st April 2024", "June 30, 2025",
+         "15 August 2024", "October 2, 2023", "December 12, 2025"]
+
+# (titles, recitals, clauses) per type. Recitals and clauses may use {a}, {b} and {date}.
+TEMPLATES = {
+    "NDA": (
+        ["NON-DISCLOSURE AGREEMENT", "MUTUAL NON-DISCLOSURE AGREEMENT", "CONFIDENTIALITY AGREEMENT",
+         "NDA"],
+        ["This Non-Disclosure Agreement is entered into as of {date} by and between {a} (the \"Disclosing Party\") "
+         "and {b} (the \"Receiving Party\").",
+         "This Mutual Confidentiality Agreement is made on {date} between {a} and {b}, each of whom may disclose "
+         "Confidential Information to the other in connection with a proposed business relationship.",
+         "{a} and {b} wish to explore a potential transaction and, in doing so, will exchange certain "
+         "proprietary information. This Agreement dated {date} sets out the terms of that exchange."],
+        [("CONFIDENTIAL INFORMATION", "Confidential Information means any non-public information disclosed by the "
+          "Disclosing Party, including trade secrets, business plans, source code, customer lists and financial data."),
+         ("OBLIGATIONS OF RECEIVING PARTY", "The Receiving Party shall hold the Confidential Information in strict "
+          "confidence, use it solely for the Purpose and not disclose it to any third party."),
+         ("EXCLUSIONS", "Confidential Information does not include information that is publicly available, already "
+          "known to the Receiving Party, or independently developed without use of the Disclosing Party's information."),
+         ("PURPOSE", "The Receiving Party may use the Confidential Information only to evaluate the Proposed "
+          "Transaction between the parties."),
+         ("RETURN OF MATERIALS", "Upon request the Receiving Party shall promptly return or destroy all documents "
+          "and copies containing Confidential Information."),
+         ("TERM", "The obligations of non-disclosure shall survive for three (3) years from the date of disclosure."),
+         ("NO LICENSE", "Nothing in this Agreement grants the Receiving Party any licence or right in the "
+          "Disclosing Party's intellectual property."),
+         ("COMPELLED DISCLOSURE", "If the Receiving Party is required by law to disclose Confidential Information, "
+          "it shall give the Disclosing Party prompt notice and disclose only what is legally required."),
+         ("REMEDIES", "Unauthorised disclosure may cause irreparable harm, and the Disclosing Party is entitled to "
+          "seek injunctive relief in addition to other remedies."),
+         ("NON-SOLICITATION", "During the term the Receiving Party shall not solicit the Disclosing Party's "
+          "customers using the Confidential Information.")],
+    ),
+    "EMPLOYMENT_AGREEMENT": (
+        ["EMPLOYMENT AGREEMENT", "EMPLOYMENT CONTRACT", "OFFER OF EMPLOYMENT", "APPOINTMENT LETTER"],
+        ["This Employment Agreement is made on {date} between {a} (the \"Employer\") and {b} (the \"Employee\").",
+         "{a} is pleased to offer {b} employment on the terms below, effective {date}.",
+         "This contract of employment dated {date} sets out the terms on which {b} is employed by {a}."],
+        [("POSITION AND DUTIES", "The Employee is employed as Senior Engineer, reporting to the Chief Technology "
+          "Officer, and shall perform the duties reasonably assigned by the Employer."),
+         ("COMPENSATION", "The Employer shall pay the Employee a base salary of $120,000 per annum, payable "
+          "monthly, subject to applicable tax withholding."),
+         ("BENEFITS", "The Employee is entitled to health insurance, provident fund contributions and twenty "
+          "(20) days of paid annual leave."),
+         ("WORKING HOURS", "The Employee's normal working hours are 9:00 am to 6:00 pm, Monday to Friday."),
+         ("PROBATION", "The first six (6) months of employment shall be a probationary period."),
+         ("TERMINATION OF EMPLOYMENT", "Either party may terminate this employment by giving thirty (30) days "
+          "written notice or salary in lieu of notice."),
+         ("LEAVE", "The Employee is entitled to sick leave and public holidays in accordance with company policy."),
+         ("EMPLOYEE INVENTIONS", "All work product created by the Employee in the course of employment belongs "
+          "to the Employer."),
+         ("PLACE OF WORK", "The Employee shall work from the Employer's Bengaluru office or remotely as agreed."),
+         ("BONUS", "The Employee is eligible for an annual performance bonus of up to 15% of base salary."),
+         ("CODE OF CONDUCT", "The Employee shall comply with the Employer's code of conduct and HR policies.")],
+    ),
+    "FOUNDER_AGREEMENT": (
+        ["FOUNDER AGREEMENT", "CO-FOUNDER AGREEMENT", "FOUNDERS' AGREEMENT", "FOUNDERS AGREEMENT"],
+        ["This Founder Agreement is entered into on {date} between {b} and the other Founders of {a} "
+         "(the \"Company\").",
+         "The undersigned co-founders of {a} agree on {date} to the following terms governing their roles, "
+         "equity and contributions.",
+         "This Co-Founder Agreement dated {date} records how {b} and the co-founders of {a} will share "
+         "ownership of the Company."],
+        [("EQUITY DISTRIBUTION", "The Founders shall hold the Company's shares as follows: {b} 40%, the second "
+          "founder 35% and the third founder 25%."),
+         ("VESTING SCHEDULE", "Founder shares vest over four (4) years with a one (1) year cliff; unvested shares "
+          "may be repurchased by the Company at par value."),
+         ("ROLES AND RESPONSIBILITIES", "{b} shall serve as Chief Executive Officer, and the co-founder shall "
+          "serve as Chief Technology Officer."),
+         ("INTELLECTUAL PROPERTY ASSIGNMENT", "Each Founder assigns to the Company all intellectual property "
+          "created in connection with the Company's business, including prior work related to the product."),
+         ("DEPARTURE OF A FOUNDER", "If a Founder leaves before the cliff, all of that Founder's unvested shares "
+          "are forfeited; good leaver and bad leaver provisions apply thereafter."),
+         ("DECISION MAKING", "Major decisions, including fundraising and issuing new equity, require the consent "
+          "of Founders holding a majority of the founder shares."),
+         ("CAPITAL CONTRIBUTIONS", "Each Founder contributes the initial capital set out in Schedule A in exchange "
+          "for their founder shares."),
+         ("TIME COMMITMENT", "Each Founder shall devote full working time to the Company's business."),
+         ("DEADLOCK", "If the Founders cannot agree, the matter shall be referred to an independent mentor."),
+         ("CAP TABLE", "The capitalisation table in Schedule B reflects the Founders' shareholding and the "
+          "employee stock option pool.")],
+    ),
+    "SAFE_AGREEMENT": (
+        ["SIMPLE AGREEMENT FOR FUTURE EQUITY (SAFE)", "SAFE", "SIMPLE AGREEMENT FOR FUTURE EQUITY",
+         "POST-MONEY SAFE"],
+        ["This SAFE is issued on {date} by {a} (the \"Company\") to {b} (the \"Investor\") in exchange for the "
+         "payment of the Purchase Amount.",
+         "In exchange for an investment of INR 50,00,000 by {b} on {date}, {a} issues to the Investor the right "
+         "to certain shares of its capital stock, subject to the terms below.",
+         "THIS INSTRUMENT dated {date} certifies that {b} has paid the Purchase Amount to {a} for the right to "
+         "future equity."],
+        [("VALUATION CAP", "The Post-Money Valuation Cap is $10,000,000."),
+         ("DISCOUNT RATE", "The Discount Rate is 80%."),
+         ("EQUITY FINANCING", "If there is an Equity Financing before termination of this Safe, the Safe will "
+          "automatically convert into Safe Preferred Stock at the Conversion Price."),
+         ("LIQUIDITY EVENT", "If there is a Liquidity Event, the Investor will receive the greater of the "
+          "Purchase Amount or the amount payable on the Conversion Shares."),
+         ("DISSOLUTION EVENT", "If there is a Dissolution Event, the Investor will be paid the Purchase Amount "
+          "before any distribution to holders of Common Stock."),
+         ("CONVERSION PRICE", "Conversion Price means the lower of the Safe Price and the Discount Price."),
+         ("PURCHASE AMOUNT", "The Investor has paid the Purchase Amount of $250,000 to the Company."),
+         ("PRO RATA RIGHTS", "The Investor is entitled to participate pro rata in the Standard Preferred Stock "
+          "financing following conversion."),
+         ("NO SHAREHOLDER RIGHTS", "The Investor is not entitled, as a holder of this Safe, to vote or receive "
+          "dividends until the Safe converts."),
+         ("COMPANY CAPITALIZATION", "Company Capitalization includes all shares of Capital Stock, options and "
+          "Converting Securities on an as-converted basis.")],
+    ),
+    "GENERAL": (
+        ["SERVICES AGREEMENT", "CONSULTING AGREEMENT", "MASTER SERVICES AGREEMENT", "LEASE AGREEMENT",
+         "SOFTWARE LICENSE AGREEMENT", "SUPPLY AGREEMENT", "SALE OF GOODS AGREEMENT", "LOAN AGREEMENT",
+         "DISTRIBUTION AGREEMENT", "AGREEMENT", "CONTRACT", "MEMORANDUM OF UNDERSTANDING"],
+        ["This Services Agreement is entered into on {date} between {a} (the \"Service Provider\") and {b} "
+         "(the \"Client\").",
+         "This Agreement is made on {date} by and between {a} and {b} for the supply of goods described in "
+         "Schedule 1.",
+         "{a} (the \"Licensor\") grants {b} (the \"Licensee\") a licence to use the Software on the terms of "
+         "this Agreement dated {date}.",
+         "This Lease is made on {date} between {a} (the \"Landlord\") and {b} (the \"Tenant\").",
+         "This Loan Agreement dated {date} is between {a} (the \"Lender\") and {b} (the \"Borrower\")."],
+        [("SCOPE OF SERVICES", "The Service Provider shall perform the services described in the Statement of "
+          "Work with reasonable skill and care."),
+         ("FEES AND PAYMENT", "The Client shall pay the fees set out in Schedule 2 within thirty (30) days of "
+          "receipt of a valid invoice."),
+         ("PERSONNEL", "The Contractor shall ensure that its employees and subcontractors assigned to the "
+          "services are suitably qualified; the Contractor remains responsible for its employees."),
+         ("DELIVERY", "Goods shall be delivered to the Buyer's warehouse, and risk passes on delivery."),
+         ("WARRANTIES", "The Supplier warrants that the goods are free from defects in materials and "
+          "workmanship for twelve (12) months."),
+         ("LICENCE GRANT", "The Licensor grants the Licensee a non-exclusive, non-transferable licence to use "
+          "the Software for internal business purposes."),
+         ("RENT", "The Tenant shall pay monthly rent of INR 1,50,000 on or before the fifth day of each month."),
+         ("SECURITY DEPOSIT", "The Tenant shall pay a refundable security deposit equal to three months' rent."),
+         ("REPAYMENT", "The Borrower shall repay the principal with interest at 9% per annum in twelve equal "
+          "monthly instalments."),
+         ("INDEPENDENT CONTRACTOR", "The Consultant is an independent contractor and not an employee of the "
+          "Company."),
+         ("ACCEPTANCE", "Deliverables are accepted unless the Client notifies defects within ten business days."),
+         ("INVESTMENT OBLIGATIONS", "The Distributor shall make the marketing investment agreed in the annual "
+          "business plan."),
+         ("SERVICE LEVELS", "The Service Provider shall meet the service levels in Schedule 3 and pay service "
+          "credits for any failure.")],
+    ),
+}
+
+# Boilerplate found in contracts of every type; it must not decide the label
+SHARED_CLAUSES = [
+    ("CONFIDENTIALITY", "Each party shall keep confidential all information received from the other party "
+     "and shall not disclose it except as required by law."),
+    ("GOVERNING LAW", "This Agreement shall be governed by the laws of India, and the courts at Mumbai shall "
+     "have exclusive jurisdiction."),
+    ("GOVERNING LAW", "This Agreement is governed by the laws of the State of Delaware."),
+    ("DISPUTE RESOLUTION", "Any dispute arising out of this Agreement shall be referred to arbitration under "
+     "the Arbitration and Conciliation Act, 1996."),
+    ("NOTICES", "All notices under this Agreement shall be in writing and delivered to the addresses set out "
+     "above."),
+    ("ENTIRE AGREEMENT", "This Agreement constitutes the entire agreement between the parties and supersedes "
+     "all prior understandings."),
+    ("TERMINATION", "Either party may terminate this Agreement on thirty (30) days written notice if the other "
+     "party commits a material breach."),
+    ("SEVERABILITY", "If any provision of this Agreement is held invalid, the remaining provisions remain in "
+     "full force and effect."),
+    ("ASSIGNMENT", "Neither party may assign this Agreement without the prior written consent of the other "
+     "party."),
+    ("INDEMNIFICATION", "Each party shall indemnify the other against losses arising from its breach of this "
+     "Agreement."),
+    ("LIMITATION OF LIABILITY", "Neither party's aggregate liability shall exceed the fees paid in the twelve "
+     "months preceding the claim."),
+    ("NON-COMPETE", "During the term neither party shall engage in a business that competes with the other "
+     "party's business."),
+    ("INTELLECTUAL PROPERTY", "Each party retains ownership of its pre-existing intellectual property."),
+    ("FORCE MAJEURE", "Neither party is liable for delay caused by events beyond its reasonable control."),
+]
+
+SIGNATURE_BLOCK = "IN WITNESS WHEREOF, the parties have executed this Agreement on {date}.\n\n{a}\n\n{b}"
+
+
+def _fold(pool: List, fold: Optional[int], folds: int) -> List:
+    return pool if fold is None else pool[fold::folds]
+
+
+def generate_documents(samples_per_type: int = 200, seed: int = 0, fold: Optional[int] = None,
+                       folds: int = 2) -> Tuple[List[str], List[str]]:
+    """
+    Deterministic (texts, labels). Most documents are a title (usually), a
+    recital, several clauses of their type and several shared clauses,
+    shuffled; some borrow a clause from another type (an employment contract
+    with a vesting clause, say). The rest are untitled excerpts of one or
+    two clauses, which keep the classifier from relying on titles alone and
+    give the held-out set enough ambiguity to calibrate on.
+
+    With `fold`, only every `folds`-th title, recital and clause is used,
+    so documents of different folds share no wording besides party names.
+    """
+    rng = random.Random(seed)
+    texts, labels = [], []
+
+    shared_clauses = _fold(SHARED_CLAUSES, fold, folds)
+
+    for document_type, (titles, recitals, clauses) in TEMPLATES.items():
+        titles, recitals, clauses = (_fold(pool, fold, folds) for pool in (titles, recitals, clauses))
+        other_clauses = [clause for other, (_, _, pool) in TEMPLATES.items() if other != document_type
+                         for clause in _fold(pool, fold, folds)]
+
+        for _ in range(samples_per_type):
+            a, b = rng.choice(PARTIES)
+            if rng.random() < 0.5:
+                a, b = b, a
+            fields = {"a": a, "b": b, "date": rng.choice(DATES)}
+
+            parts = []
+            if rng.random() < 0.25:
+                body = rng.sample(clauses, rng.randint(1, 2)) + rng.sample(shared_clauses, rng.randint(0, 2))
+            else:
+                body = rng.sample(clauses, rng.randint(2, min(5, len(clauses))))
+                body += rng.sample(shared_clauses, rng.randint(2, 6))
+                if rng.random() < 0.25:
+                    body.append(rng.choice(other_clauses))
+                if rng.random() < 0.7:
+                    parts.append(rng.choice(titles))
+                parts.append(rng.choice(recitals).format(**fields))
+            rng.shuffle(body)
+
+            parts.extend(f"{index}. {heading}\n{text.format(**fields)}"
+                         for index, (heading, text) in enumerate(body, start=1))
+            if rng.random() < 0.5:
+                parts.append(SIGNATURE_BLOCK.format(**fields))
+
+            texts.append("\n\n".join(parts))
+            labels.append(document_type)
+
+    return texts, labels
@@ -0,0 +1,83 @@
+"""
+Document Reader
+Extracts text from .txt, .docx and .pdf files on disk or straight from upload streams
+"""
+
+import io
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional
+
+
+# Uploads that arrive on a non-seekable stream are buffered in memory up to this size
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def read_file_content(file_path: str) -> Optional[str]:
+    """Read content from a file on disk"""
+    with open(file_path, 'rb') as f:
+        return read_stream_content(f, file_path)
+
+
+def read_stream_content(stream: BinaryIO, filename: str) -> Optional[str]:
+    """
+    Read content from a binary stream (e.g. an upload's `FileStorage.stream` or a
+    `BytesIO`), choosing the parser from the file extension. Nothing is written
+    to disk unless the stream cannot seek and exceeds SPOOL_MAX_MEMORY.
+    """
+    file_ext = os.path.splitext(filename)[1].lower()
+
+    try:
+        stream = _seekable(stream)
+
+        if file_ext == '.txt':
+            return _decode(stream.read())
+
+        elif file_ext == '.docx':
+            try:
+                from docx import Document
+                doc = Document(stream)
+                return '\n'.join([para.text for para in doc.paragraphs])
+            except ImportError:
+                return _decode(stream.read(), errors='ignore')
+
+        elif file_ext == '.pdf':
+            try:
+                from pdf_pipeline import extract_pdf_text
+                return extract_pdf_text(stream.read())
+            except ImportError:
+                return None
+
+        else:
+            return _decode(stream.read(), errors='ignore')
+
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return None
+
+
+def read_upload(file_storage) -> Optional[str]:
+    """Read content from a werkzeug `FileStorage` without saving it"""
+    return read_stream_content(file_storage.stream, file_storage.filename or '')
+
+
+def _decode(data: bytes, errors: str = 'strict') -> str:
+    """Decode UTF-8 with universal newlines, as text-mode open() would"""
+    return data.decode('utf-8', errors=errors).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _seekable(stream: BinaryIO) -> BinaryIO:
+    """Return a seekable stream positioned at the start of the data"""
+    try:
+        if stream.seekable():
+            stream.seek(0)
+            return stream
+    except (AttributeError, io.UnsupportedOperation):
+        pass
+
+    # Unique, anonymous spool file: in memory until large, never shared by name
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    shutil.copyfileobj(stream, spooled)
+    spooled.seek(0)
+    return spooled
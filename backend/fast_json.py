@@ -0,0 +1,25 @@
+"""
+Fast JSON
+Serializes response bodies straight to UTF-8 bytes, with orjson when it is installed
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # numpy scalars can reach reports from the model outputs
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data) -> bytes:
+    """Compact UTF-8 JSON for `data`; falls back to the json module for anything orjson rejects"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,134 @@
+"""
+Flaw Set
+Slotted flaws and a deduplicating collection that counts severities as flaws are added
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from legal_rules import SEVERITIES
+
+# Report order: CRITICAL first
+SEVERITY_CODES = {severity: code for code, severity in enumerate(SEVERITIES)}
+
+
+class LegalFlaw:
+    """Represents a legal flaw in a document"""
+
+    __slots__ = ("flaw_type", "severity", "location", "description", "suggestion", "clause_text",
+                 "line", "column", "section", "char_start", "char_end")
+
+    def __init__(self, flaw_type: str, severity: str, location: str, description: str, suggestion: str,
+                 clause_text: str = "", line: Optional[int] = None, column: Optional[int] = None,
+                 section: Optional[str] = None, char_start: Optional[int] = None, char_end: Optional[int] = None):
+        # A report repeats a few flaw types and four severities many times over
+        self.flaw_type = sys.intern(flaw_type)
+        self.severity = sys.intern(severity)
+        self.location = location
+        self.description = description
+        self.suggestion = suggestion
+        self.clause_text = clause_text
+        self.line = line
+        self.column = column
+        self.section = section
+        self.char_start = char_start
+        self.char_end = char_end
+
+    def replace(self, **changes) -> "LegalFlaw":
+        """A copy with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return LegalFlaw(**fields)
+
+    def to_dict(self) -> Dict:
+        return {
+            "flaw_type": self.flaw_type,
+            "severity": self.severity,
+            "location": self.location,
+            "description": self.description,
+            "suggestion": self.suggestion,
+            "clause_text": self.clause_text,
+            "line": self.line,
+            "column": self.column,
+            "section": self.section,
+            "char_start": self.char_start,
+            "char_end": self.char_end
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LegalFlaw):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"LegalFlaw({self.flaw_type}, {self.severity}, {self.location!r})"
+
+
+class FlawSet:
+    """
+    The flaws of one report, without duplicates (same type at the same
+    location). Each flaw's severity is stored as a one-byte code next to it
+    and counted on insertion, so the summary, compliance check and severity
+    sort never rescan the flaws.
+    """
+
+    __slots__ = ("_flaws", "_codes", "_seen", "counts")
+
+    def __init__(self, flaws: Iterable[LegalFlaw] = ()):
+        self._flaws: List[LegalFlaw] = []
+        self._codes = array("B")
+        self._seen = set()
+        self.counts = [0] * len(SEVERITIES)
+        self.extend(flaws)
+
+    def add(self, flaw: LegalFlaw) -> bool:
+        """Add `flaw` unless an equivalent one is already present; True if added"""
+        key = (flaw.flaw_type, flaw.location)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+
+        code = SEVERITY_CODES[flaw.severity]
+        self._flaws.append(flaw)
+        self._codes.append(code)
+        self.counts[code] += 1
+        return True
+
+    def extend(self, flaws: Iterable[LegalFlaw]):
+        for flaw in flaws:
+            self.add(flaw)
+
+    def __len__(self) -> int:
+        return len(self._flaws)
+
+    def ordered(self) -> List[LegalFlaw]:
+        """Flaws by severity, most severe first; insertion order within a severity"""
+        # Stable sort of positions by their stored code; no severity lookups
+        order = sorted(range(len(self._flaws)), key=self._codes.__getitem__)
+        return [self._flaws[index] for index in order]
+
+    def summary(self) -> Dict:
+        """Compliance, severity counts and serialized flaws for a report"""
+        return dict(severity_summary(self.counts), flaws=[flaw.to_dict() for flaw in self.ordered()])
+
+
+def severity_summary(counts: Sequence[int]) -> Dict:
+    """Report fields derived from per-severity counts (in SEVERITIES order)"""
+    critical, high, medium, low = counts
+    return {
+        "is_compliant": critical == 0 and high == 0,
+        "total_flaws": critical + high + medium + low,
+        "critical_flaws": critical,
+        "high_flaws": high,
+        "medium_flaws": medium,
+        "low_flaws": low
+    }
+
+
+def count_severities(flaws: Iterable[Dict]) -> Tuple[int, ...]:
+    """Per-severity counts (in SEVERITIES order) of serialized flaws, in one pass"""
+    counts = [0] * len(SEVERITIES)
+    for flaw in flaws:
+        counts[SEVERITY_CODES[flaw["severity"]]] += 1
+    return tuple(counts)
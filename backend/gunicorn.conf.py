@@ -0,0 +1,41 @@
+"""
+Gunicorn Configuration
+Pre-fork serving: the model is loaded once in the master and shared by every worker
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+# Threads per worker feed concurrent requests into the worker's micro-batcher
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+
+# Import app (and load the weights) in the master before forking
+preload_app = True
+
+# Split the cores between workers instead of every worker claiming all of them
+THREADS_PER_WORKER = (
+    int(os.environ.get("INFERENCE_THREADS") or 0)
+    or max(1, (os.cpu_count() or 1) // workers)
+)
+
+os.environ["VALIDATOR_LOAD"] = "eager"
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+# The master only loads weights; keeping it single-threaded means no
+# OpenMP pool exists at fork time. Workers set their own count in post_fork.
+os.environ["INFERENCE_THREADS"] = "1"
+# Each worker forks its own PDF extraction pool in post_fork, not the master
+os.environ["PDF_POOL_AT_IMPORT"] = "0"
+
+
+def post_fork(server, worker):
+    import app
+
+    app.after_fork(THREADS_PER_WORKER)
+    server.log.info("Worker %s ready with %s inference thread(s)", worker.pid, THREADS_PER_WORKER)
@@ -0,0 +1,263 @@
+"""
+Inference Backends
+Pluggable CPU serving backends for the document and clause heads: eager, int8, TorchScript, ONNX Runtime
+"""
+
+import inspect
+import os
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+from torch import nn
+
+from shared_encoder import EMBEDDING
+
+
+BACKENDS = ("eager", "quantized", "torchscript", "onnx")
+INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+HEAD_NAMES = ("doc", "clause")
+# Everything one encoder pass can produce; exported graphs return all of it
+OUTPUTS = HEAD_NAMES + (EMBEDDING,)
+OUTPUT_NAMES = tuple(f"{head}_logits" for head in HEAD_NAMES) + (EMBEDDING,)
+
+
+def configure_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None):
+    """Set torch intra-op / inter-op thread counts (inter-op only before first use)"""
+    if intra_op:
+        torch.set_num_threads(intra_op)
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            # Already initialised by earlier parallel work; keep the existing pool
+            pass
+
+
+class _Heads(nn.Module):
+    """Both heads and the clause embedding over one encoder pass with positional inputs, for tracing and export"""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        outputs = self.model.classify(input_ids, attention_mask, token_type_ids, names=OUTPUTS)
+        return tuple(outputs[name] for name in OUTPUTS)
+
+
+def _inputs(batch: Dict[str, torch.Tensor]) -> List[torch.Tensor]:
+    input_ids = batch["input_ids"]
+    return [
+        input_ids,
+        batch.get("attention_mask", torch.ones_like(input_ids)),
+        batch.get("token_type_ids", torch.zeros_like(input_ids)),
+    ]
+
+
+class InferenceBackend:
+    """Computes document- or clause-head logits for a padded batch"""
+
+    name = "base"
+
+    def head_logits(self, batch: Dict[str, torch.Tensor],
+                    heads: Sequence[str] = HEAD_NAMES) -> Dict[str, torch.Tensor]:
+        """Logits of several heads (and/or the clause `embedding`) from one encoder pass"""
+        raise NotImplementedError
+
+    def logits(self, batch: Dict[str, torch.Tensor], head: str = "doc") -> torch.Tensor:
+        return self.head_logits(batch, (head,))[head]
+
+    def doc_logits(self, batch: Dict[str, torch.Tensor]) -> torch.Tensor:
+        return self.logits(batch, "doc")
+
+    def clause_logits(self, batch: Dict[str, torch.Tensor]) -> torch.Tensor:
+        return self.logits(batch, "clause")
+
+    def after_fork(self, num_threads: Optional[int] = None):
+        """Re-initialise per-process runtime state in a forked worker"""
+        configure_threads(num_threads)
+
+
+class EagerBackend(InferenceBackend):
+    """Plain PyTorch fp32 (reference)"""
+
+    name = "eager"
+
+    def __init__(self, model: nn.Module):
+        self.model = model.eval()
+
+    def head_logits(self, batch, heads=HEAD_NAMES):
+        with torch.no_grad():
+            return self.model.classify(*_inputs(batch), names=tuple(heads))
+
+
+class QuantizedBackend(EagerBackend):
+    """
+    Dynamic int8 quantization of every Linear layer (weights int8, activations
+    fp32). The model is quantized in place, so no fp32 copy of the Linear
+    weights stays resident; the caller's model is the quantized one afterwards.
+    """
+
+    name = "quantized"
+
+    def __init__(self, model: nn.Module):
+        torch.ao.quantization.quantize_dynamic(model.cpu().eval(), {nn.Linear}, dtype=torch.qint8, inplace=True)
+        super().__init__(model)
+
+
+class TorchScriptBackend(InferenceBackend):
+    """Traced and frozen TorchScript graph of the encoder, both heads and the clause embedding"""
+
+    name = "torchscript"
+
+    def __init__(self, model: nn.Module, example: Dict[str, torch.Tensor], export_dir: str):
+        path = os.path.join(export_dir, "heads_embedding.torchscript.pt")
+
+        if os.path.isfile(path):
+            self.module = torch.jit.load(path, map_location="cpu")
+        else:
+            with torch.no_grad():
+                traced = torch.jit.trace(_Heads(model.cpu().eval()), tuple(_inputs(example)), strict=False)
+            self.module = torch.jit.freeze(traced.eval())
+            torch.jit.save(self.module, path)
+
+        self.module.eval()
+
+    def head_logits(self, batch, heads=HEAD_NAMES):
+        with torch.no_grad():
+            outputs = self.module(*[tensor.cpu() for tensor in _inputs(batch)])
+        return {head: outputs[OUTPUTS.index(head)] for head in heads}
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime session over the exported encoder and heads (requires onnxruntime)"""
+
+    name = "onnx"
+
+    def __init__(self, model: nn.Module, example: Dict[str, torch.Tensor], export_dir: str,
+                 intra_op_threads: Optional[int] = None):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("The onnx backend requires onnxruntime: pip install onnxruntime")
+
+        self.path = os.path.join(export_dir, "heads_embedding.onnx")
+        if not os.path.isfile(self.path):
+            self._export(model, example, self.path)
+
+        self._open_session(intra_op_threads)
+
+    def _open_session(self, intra_op_threads: Optional[int]):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = onnxruntime.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [item.name for item in self.session.get_inputs()]
+
+    def after_fork(self, num_threads: Optional[int] = None):
+        # The session's thread pool belongs to the parent; build a new one here
+        super().after_fork(num_threads)
+        self._open_session(num_threads)
+
+    @staticmethod
+    def _export(model: nn.Module, example: Dict[str, torch.Tensor], path: str):
+        kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            kwargs["dynamo"] = False
+
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES}
+        dynamic_axes.update({name: {0: "batch"} for name in OUTPUT_NAMES})
+
+        with torch.no_grad():
+            torch.onnx.export(
+                _Heads(model.cpu().eval()),
+                tuple(_inputs(example)),
+                path,
+                input_names=list(INPUT_NAMES),
+                output_names=list(OUTPUT_NAMES),
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                **kwargs
+            )
+
+    def head_logits(self, batch, heads=HEAD_NAMES):
+        feeds = {
+            name: tensor.cpu().numpy().astype(np.int64)
+            for name, tensor in zip(INPUT_NAMES, _inputs(batch))
+            if name in self.input_names
+        }
+        outputs = self.session.run([OUTPUT_NAMES[OUTPUTS.index(head)] for head in heads], feeds)
+        return {head: torch.from_numpy(output) for head, output in zip(heads, outputs)}
+
+
+def create_backend(name: str, model: nn.Module, tokenizer, export_dir: Optional[str] = None,
+                   num_threads: Optional[int] = None) -> InferenceBackend:
+    """
+    Build an inference backend by name. Exported graphs are cached in
+    `export_dir` (e.g. the model artifact directory) and reused on restart.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name}. Choose from {', '.join(BACKENDS)}")
+
+    configure_threads(num_threads)
+
+    if name == "eager":
+        return EagerBackend(model)
+    if name == "quantized":
+        return QuantizedBackend(model)
+
+    export_dir = _writable_dir(export_dir)
+    example = tokenizer(["Example agreement text.", "Second example"], padding=True, return_tensors="pt")
+
+    if name == "torchscript":
+        return TorchScriptBackend(model, example, export_dir)
+    return OnnxBackend(model, example, export_dir, intra_op_threads=num_threads)
+
+
+def parity_check(reference: InferenceBackend, candidate: InferenceBackend, tokenizer,
+                 texts: List[str], max_length: int = 512) -> Dict:
+    """
+    Compare a backend against the eager reference on the same inputs, for
+    every head. Returns each head's largest probability difference and label
+    agreement rate, and the worst of both over all heads.
+    """
+    batch = tokenizer(texts, truncation=True, max_length=max_length, padding=True, return_tensors="pt")
+    expected_logits = reference.head_logits(batch, HEAD_NAMES)
+    actual_logits = candidate.head_logits(batch, HEAD_NAMES)
+
+    heads = {}
+    for head in HEAD_NAMES:
+        expected = torch.softmax(expected_logits[head].float(), dim=1)
+        actual = torch.softmax(actual_logits[head].float(), dim=1)
+        heads[head] = {
+            "max_prob_diff": float((expected - actual).abs().max()),
+            "label_agreement": float((expected.argmax(dim=1) == actual.argmax(dim=1)).float().mean())
+        }
+
+    return {
+        "backend": candidate.name,
+        "samples": len(texts),
+        "max_prob_diff": max(result["max_prob_diff"] for result in heads.values()),
+        "label_agreement": min(result["label_agreement"] for result in heads.values()),
+        "heads": heads
+    }
+
+
+def _writable_dir(preferred: Optional[str]) -> str:
+    if preferred:
+        try:
+            os.makedirs(preferred, exist_ok=True)
+            probe = os.path.join(preferred, ".write-test")
+            with open(probe, "w") as f:
+                f.write("")
+            os.remove(probe)
+            return preferred
+        except OSError:
+            pass
+    return tempfile.mkdtemp(prefix="legal-validator-export-")
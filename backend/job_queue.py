@@ -0,0 +1,218 @@
+"""
+Analysis Job Queue
+Runs analyses on a bounded worker pool; clients poll for status and results
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when admission control rejects a job"""
+
+
+class JobQueue:
+    """
+    In-process job queue.
+
+    `run_job(payload, report)` does the work; it may call
+    `report(progress, stage)` with progress in [0, 1] and must return a
+    JSON-serializable result. At most `max_workers` jobs run at once and at
+    most `max_pending` jobs may be queued or running; beyond that `submit`
+    raises QueueFullError so callers can shed load. Finished jobs are kept
+    for `ttl_seconds`. With `sqlite_path`, job records are also persisted so
+    results can still be fetched after a restart or from another worker;
+    every `submit` deletes records older than `ttl_seconds`, whichever
+    process wrote them.
+    """
+
+    def __init__(self, run_job: Callable[[Any, Callable[[float, str], None]], Dict],
+                 max_workers: int = 2, max_pending: int = 32, ttl_seconds: float = 3600,
+                 sqlite_path: Optional[str] = None):
+        self.run_job = run_job
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, updated_at REAL NOT NULL, record TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+            self._sweep(time.time())
+            # Jobs that were in flight when the process stopped will never finish
+            for job_id, record in self._db.execute("SELECT id, record FROM jobs").fetchall():
+                job = json.loads(record)
+                if job["status"] in ("queued", "running"):
+                    job.update(status="failed", error="Server restarted before the job finished")
+                    self._db.execute("UPDATE jobs SET record = ? WHERE id = ?", (json.dumps(job), job_id))
+            self._db.commit()
+
+    def submit(self, payload: Any, metadata: Optional[Dict] = None) -> str:
+        """Queue a job and return its id, or raise QueueFullError"""
+        now = time.time()
+
+        with self._lock:
+            self._expire(now)
+            self._sweep(now)
+
+            if self._active_count() >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending)")
+
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "status": "queued",
+                "progress": 0.0,
+                "stage": "queued",
+                "created_at": now,
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            job.update(metadata or {})
+            self._jobs[job_id] = job
+            self.submitted += 1
+            self._persist(job)
+
+        self._executor.submit(self._run, job_id, payload)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a snapshot of a job, or None if unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                snapshot = dict(job)
+                if snapshot["status"] == "queued":
+                    snapshot["queue_position"] = sum(
+                        1 for other in self._jobs.values()
+                        if other["status"] == "queued" and other["created_at"] <= job["created_at"]
+                    )
+                return snapshot
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT record FROM jobs WHERE id = ? AND updated_at >= ?",
+                    (job_id, time.time() - self.ttl_seconds)
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0])
+
+        return None
+
+    def metrics(self) -> Dict:
+        """Queue depth and throughput counters"""
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job["status"] == "queued")
+            running = sum(1 for job in self._jobs.values() if job["status"] == "running")
+            return {
+                "queued": queued,
+                "running": running,
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "saturation": round((queued + running) / self.max_pending, 4) if self.max_pending else 0.0
+            }
+
+    def estimated_wait(self) -> int:
+        """Rough seconds until a new job would start (used for Retry-After)"""
+        with self._lock:
+            finished = [
+                job["finished_at"] - job["started_at"] for job in self._jobs.values()
+                if job["finished_at"] and job["started_at"]
+            ]
+            average = sum(finished) / len(finished) if finished else 5.0
+            backlog = self._active_count() / max(1, self.max_workers)
+        return max(1, int(round(average * backlog)))
+
+    def reset_after_fork(self):
+        """
+        Threads and SQLite handles do not survive fork(); call in a forked
+        child to get a fresh worker pool and database connection. Each
+        worker process keeps its own in-memory jobs, so use `sqlite_path`
+        when clients may poll a different worker than the one they submitted to.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis-job")
+        self._lock = threading.Lock()
+        if self.sqlite_path:
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job_id: str, payload: Any):
+        self._update(job_id, status="running", stage="starting", started_at=time.time())
+
+        def report(progress: float, stage: str):
+            self._update(job_id, progress=round(min(max(progress, 0.0), 1.0), 4), stage=stage)
+
+        try:
+            result = self.run_job(payload, report)
+        except Exception as e:
+            self._update(job_id, status="failed", stage="failed", error=str(e), finished_at=time.time())
+            with self._lock:
+                self.failed += 1
+            return
+
+        self._update(job_id, status="completed", stage="done", progress=1.0,
+                     result=result, finished_at=time.time())
+        with self._lock:
+            self.completed += 1
+
+    def _update(self, job_id: str, **changes):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(changes)
+            if "status" in changes:
+                self._persist(job)
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+
+    def _expire(self, now: float):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] and now - job["finished_at"] > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _sweep(self, now: float):
+        # Independent of the in-memory jobs: rows may come from other workers or an earlier run
+        if self._db is not None:
+            self._db.execute("DELETE FROM jobs WHERE updated_at < ?", (now - self.ttl_seconds,))
+            self._db.commit()
+
+    def _persist(self, job: Dict):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (id, updated_at, record) VALUES (?, ?, ?)",
+            (job["id"], time.time(), json.dumps(job))
+        )
+        self._db.commit()
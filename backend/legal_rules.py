@@ -0,0 +1,283 @@
+"""
+Legal Validation Rules
+Keyword and pattern rules loaded from a rule-pack file, compiled once and hot-reloaded when it changes
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from rule_engine import RuleEngine, RuleHits
+
+RULE_PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rule_packs")
+RULE_PACK = os.environ.get("RULE_PACK", os.path.join(RULE_PACK_DIR, "india.json"))
+# How often (at most) the rule-pack file is checked for changes
+RULE_PACK_CHECK_SECONDS = float(os.environ.get("RULE_PACK_CHECK_SECONDS", 2.0))
+
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+REQUIREMENT_KEYS = ("required_clauses", "optional_clauses", "prohibited_terms")
+
+
+class RulePackError(ValueError):
+    """The rule-pack file is missing, malformed or fails validation"""
+
+
+class RulePack:
+    """
+    One validated, compiled version of a rule-pack file; never modified after
+    construction. Validation takes one pack for a document and uses it for
+    the scan and every check, so a reload never mixes rule versions in a report.
+
+    `version` is the pack's declared version; `fingerprint` is a hash of its
+    content, used to key cached results.
+    """
+
+    def __init__(self, data: Dict, source: str = "<memory>"):
+        _validate(data)
+
+        self.source = source
+        self.name = data["name"]
+        self.version = str(data["version"])
+        self.jurisdiction = data.get("jurisdiction")
+        self.fingerprint = hashlib.sha256(
+            json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+
+        # clause name -> (keywords, description, suggestion)
+        self.clause_checks = MappingProxyType({
+            name: (tuple(check["keywords"]), check["description"], check["suggestion"])
+            for name, check in data["clause_checks"].items()
+        })
+        self.requirements = MappingProxyType({
+            document_type: MappingProxyType({key: tuple(requirement.get(key, ())) for key in REQUIREMENT_KEYS})
+            for document_type, requirement in data["requirements"].items()
+        })
+        self.pattern_rules = tuple(MappingProxyType(dict(rule)) for rule in data["pattern_rules"])
+        self.pattern_info = MappingProxyType({rule["flaw_type"]: rule for rule in self.pattern_rules})
+        self.section_27_keywords = tuple(data["section_27_keywords"])
+        # (keyword, flaw_type, description, severity) used when the ML validator is unavailable
+        self.fallback_checks = tuple(
+            (check["keyword"], check["flaw_type"], check["description"], check["severity"])
+            for check in data["fallback_checks"]
+        )
+        # clause-head label -> (severity, description, suggestion) for clauses the model flags
+        self.clause_flaw_guidance = MappingProxyType({
+            label: (guidance["severity"], guidance["description"], guidance["suggestion"])
+            for label, guidance in data["clause_flaw_guidance"].items()
+        })
+
+        # document type -> (flaw_type, keywords, description, suggestion) for each keyword-checked clause
+        self.structural_checks = MappingProxyType({
+            document_type: tuple(
+                (f"MISSING_{name.upper()}",) + self.clause_checks[name]
+                for name in requirement["required_clauses"] if name in self.clause_checks
+            )
+            for document_type, requirement in self.requirements.items()
+        })
+
+        keywords = [keyword for keywords, _, _ in self.clause_checks.values() for keyword in keywords]
+        keywords.extend(self.section_27_keywords)
+        keywords.extend(keyword for keyword, _, _, _ in self.fallback_checks)
+        self.engine = RuleEngine(keywords, {rule["flaw_type"]: rule["pattern"] for rule in self.pattern_rules})
+
+    @classmethod
+    def from_file(cls, path: str) -> "RulePack":
+        """Load a .json (or, with PyYAML installed, .yaml/.yml) rule pack"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if path.lower().endswith((".yaml", ".yml")):
+                    try:
+                        import yaml
+                    except ImportError:
+                        raise RulePackError("PyYAML is required for YAML rule packs (pip install pyyaml)")
+                    data = yaml.safe_load(f)
+                else:
+                    data = json.load(f)
+        except (OSError, ValueError) as e:
+            if isinstance(e, RulePackError):
+                raise
+            raise RulePackError(f"Cannot read rule pack {path}: {e}") from e
+
+        return cls(data, path)
+
+    def requirements_for(self, document_type: str):
+        return self.requirements.get(document_type, self.requirements["GENERAL"])
+
+    def scan(self, text: str) -> RuleHits:
+        """Scan `text` with this pack's engine; the hits remember the pack"""
+        hits = self.engine.scan(text)
+        hits.rules = self
+        return hits
+
+    def describe(self) -> Dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "jurisdiction": self.jurisdiction,
+            "fingerprint": self.fingerprint,
+            "source": self.source
+        }
+
+
+def _validate(data) -> None:
+    """Raise RulePackError listing every problem in a rule-pack document"""
+    errors: List[str] = []
+
+    def check(condition: bool, message: str) -> bool:
+        if not condition:
+            errors.append(message)
+        return condition
+
+    def strings(value, where: str, allow_empty: bool = True) -> bool:
+        return check(isinstance(value, list) and all(isinstance(item, str) and item for item in value)
+                     and (allow_empty or bool(value)), f"{where} must be a list of non-empty strings")
+
+    def entry(value, where: str, fields: Tuple[str, ...]) -> bool:
+        if not check(isinstance(value, dict), f"{where} must be an object"):
+            return False
+        ok = True
+        for field in fields:
+            ok &= check(isinstance(value.get(field), str) and bool(value.get(field)),
+                        f"{where}.{field} must be a non-empty string")
+        if "severity" in fields and isinstance(value.get("severity"), str):
+            ok &= check(value["severity"] in SEVERITIES, f"{where}.severity must be one of {', '.join(SEVERITIES)}")
+        return ok
+
+    if not isinstance(data, dict):
+        raise RulePackError("Rule pack must be an object")
+
+    for key in ("name", "version"):
+        check(isinstance(data.get(key), (str, int)) and str(data.get(key)), f"'{key}' is required")
+
+    sections = {"requirements": dict, "clause_checks": dict, "pattern_rules": list,
+                "section_27_keywords": list, "fallback_checks": list, "clause_flaw_guidance": dict}
+    for key, kind in sections.items():
+        check(isinstance(data.get(key), kind), f"'{key}' must be a{'n object' if kind is dict else ' list'}")
+    if errors:
+        raise RulePackError("; ".join(errors))
+
+    for name, clause in data["clause_checks"].items():
+        if entry(clause, f"clause_checks.{name}", ("description", "suggestion")):
+            strings(clause.get("keywords"), f"clause_checks.{name}.keywords", allow_empty=False)
+
+    check("GENERAL" in data["requirements"], "requirements.GENERAL is required (the fallback type)")
+    for document_type, requirement in data["requirements"].items():
+        if check(isinstance(requirement, dict), f"requirements.{document_type} must be an object"):
+            for key in REQUIREMENT_KEYS:
+                strings(requirement.get(key, []), f"requirements.{document_type}.{key}")
+
+    flaw_types = set()
+    for index, rule in enumerate(data["pattern_rules"]):
+        where = f"pattern_rules[{index}]"
+        if not entry(rule, where, ("pattern", "flaw_type", "severity", "description", "suggestion")):
+            continue
+        check(rule["flaw_type"] not in flaw_types, f"{where}.flaw_type {rule['flaw_type']} is duplicated")
+        flaw_types.add(rule["flaw_type"])
+        try:
+            check(not re.compile(rule["pattern"]).groupindex, f"{where}.pattern must not use named groups")
+        except re.error as e:
+            errors.append(f"{where}.pattern is not a valid regex: {e}")
+
+    strings(data["section_27_keywords"], "section_27_keywords")
+    for index, fallback in enumerate(data["fallback_checks"]):
+        entry(fallback, f"fallback_checks[{index}]", ("keyword", "flaw_type", "description", "severity"))
+    for label, guidance in data["clause_flaw_guidance"].items():
+        entry(guidance, f"clause_flaw_guidance.{label}", ("severity", "description", "suggestion"))
+
+    if errors:
+        raise RulePackError("; ".join(errors))
+
+
+class RulePackStore:
+    """
+    The current rule pack for one file. `current()` stats the file at most
+    every `check_seconds`; when it has changed, the new version is loaded,
+    validated and compiled off to the side and then swapped in with one
+    assignment. A version that fails validation is reported and the previous
+    pack stays in use. Only the very first load raises.
+    """
+
+    def __init__(self, path: str, check_seconds: float = RULE_PACK_CHECK_SECONDS):
+        self.path = path
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._pack = RulePack.from_file(path)
+        self._next_check = time.monotonic() + check_seconds
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def current(self) -> RulePack:
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._pack
+
+    def reload_if_changed(self) -> bool:
+        """Load the file if it changed since the last attempt; True if a new pack is in use"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_seconds
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                return False
+            self._signature = signature
+
+            try:
+                pack = RulePack.from_file(self.path)
+            except RulePackError as e:
+                self.last_error = str(e)
+                print(f"⚠️  Rule pack {self.path} rejected, keeping version {self._pack.version}: {e}")
+                return False
+
+            self.last_error = None
+            if pack.fingerprint == self._pack.fingerprint:
+                return False
+
+            self._pack = pack
+            self.reloads += 1
+            print(f"✓ Rule pack reloaded: {pack.name} version {pack.version} ({pack.fingerprint})")
+            return True
+
+
+_store: Optional[RulePackStore] = None
+_store_lock = threading.Lock()
+
+
+def get_rule_store() -> RulePackStore:
+    """Return the process-wide rule-pack store, loading RULE_PACK on first use"""
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = RulePackStore(RULE_PACK)
+    return _store
+
+
+def get_rule_pack() -> RulePack:
+    """The current rule pack (reloaded if the file changed)"""
+    return get_rule_store().current()
+
+
+if __name__ == "__main__":
+    # Check a rule pack before deploying it: python legal_rules.py rule_packs/india.json
+    import sys
+
+    for path in sys.argv[1:] or [RULE_PACK]:
+        try:
+            pack = RulePack.from_file(path)
+        except RulePackError as e:
+            print(f"❌ {path}: {e}")
+            sys.exit(1)
+        print(f"✓ {path}: {pack.name} version {pack.version} ({pack.fingerprint}), "
+              f"{len(pack.pattern_rules)} patterns, {len(pack.requirements)} document types")
@@ -4,30 +4,41 @@ Validates legal documents and identifies flaws
 """
 
 import torch
-from transformers import (
-    AutoTokenizer,
-    AutoModelForSequenceClassification,
-    Trainer,
-    TrainingArguments,
-)
-from datasets import Dataset, DatasetDict
+from transformers import AutoTokenizer
 import json
 import os
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 import numpy as np
-from dataclasses import dataclass, asdict
-import re
+from model_store import ModelArtifactStore
+from shared_encoder import EMBEDDING, HeadAdapter, SharedEncoderClassifier
+from inference_backends import HEAD_NAMES, create_backend
+from rule_engine import RuleHits
+from metrics import StageTimer
+from clause_cache import ClauseCache
+from clause_index import MIN_CALIBRATION_ACCURACY, ClauseIndex
+from clause_segmenter import Clause, segment_clauses
+from flaw_set import FlawSet, LegalFlaw
+from legal_rules import RulePack, get_rule_pack
+from reference_clauses import CALIBRATION_CLAUSES, REFERENCE_CLAUSES, UNRELATED_CLAUSES
 
+if TYPE_CHECKING:
+    # Training-only dependencies; imported inside the training methods so serving never loads them
+    from datasets import DatasetDict
 
-@dataclass
-class LegalFlaw:
-    """Represents a legal flaw in a document"""
-    flaw_type: str
-    severity: str
-    location: str
-    description: str
-    suggestion: str
-    clause_text: str = ""
+
+BASE_MODEL = os.environ.get("LEGAL_VALIDATOR_BASE_MODEL", "nlpaueb/legal-bert-base-uncased")
+
+# Sliding-window inference settings (tokens)
+WINDOW_SIZE = 512
+WINDOW_STRIDE = 128
+WINDOW_BATCH_SIZE = 16
+TOP_WINDOWS = 3
+
+# Clause-head predictions below this probability are not reported
+CLAUSE_FLAW_THRESHOLD = 0.6
+
+# Per-clause analyses kept for incremental re-validation (validate_revision)
+CLAUSE_CACHE_SIZE = int(os.environ.get("CLAUSE_CACHE_SIZE", 20000))
 
 
 class LegalDocumentValidator:
@@ -35,32 +46,149 @@ class LegalDocumentValidator:
     Validates legal documents and identifies flaws
     """
 
-    def __init__(self, use_gpu: bool = True):
+    def __init__(self, use_gpu: bool = True, model_version: Optional[str] = None,
+                 store: Optional[ModelArtifactStore] = None, train: bool = False,
+                 chunked: bool = True, window_aggregation: str = "mean",
+                 backend: Optional[str] = None, num_threads: Optional[int] = None,
+                 mmap_weights: Optional[bool] = None, clause_classification: Optional[bool] = None,
+                 reference_matching: Optional[bool] = None):
         self.device = torch.device('cuda' if use_gpu and torch.cuda.is_available() else 'cpu')
         print(f"🔧 Device: {self.device}")
 
+        backend = backend or os.environ.get("INFERENCE_BACKEND", "eager")
+        num_threads = num_threads or int(os.environ.get("INFERENCE_THREADS", 0)) or None
+        if mmap_weights is None:
+            mmap_weights = os.environ.get("MMAP_WEIGHTS", "1") == "1"
+        if backend != "eager" and self.device.type != "cpu":
+            print(f"⚠️  Backend '{backend}' is CPU-only; using eager on {self.device}")
+            backend = "eager"
+
+        if window_aggregation not in ("mean", "max"):
+            raise ValueError(f"Unknown window aggregation: {window_aggregation}")
+        self.chunked = chunked
+        self.window_aggregation = window_aggregation
+
+        self.store = store or ModelArtifactStore()
+        artifact_path = None if train else self.store.resolve(model_version)
+
+        if artifact_path is None and model_version and not train:
+            raise ValueError(f"Model version not found in {self.store.root}: {model_version}")
+
         print("\n📚 Loading models for legal validation...")
-        print("   • Loading document classifier...")
-        self.doc_tokenizer = AutoTokenizer.from_pretrained("nlpaueb/legal-bert-base-uncased")
-        self.doc_classifier = AutoModelForSequenceClassification.from_pretrained(
-            "nlpaueb/legal-bert-base-uncased",
-            num_labels=2
-        ).to(self.device)
+        if artifact_path:
+            manifest = self.store.load_manifest(os.path.basename(artifact_path))
+            if "model" not in manifest.get("components", []):
+                raise ValueError(
+                    f"Artifact {manifest['version']} predates the shared encoder; "
+                    "run train_validator.py to publish a new version"
+                )
+            self.model_version = manifest["version"]
+            model_source = os.path.join(artifact_path, "model")
+            tokenizer_source = os.path.join(artifact_path, "tokenizer")
+            print(f"   • Using fine-tuned artifact {self.model_version}")
+        else:
+            self.model_version = "base"
+            model_source = BASE_MODEL
+            tokenizer_source = BASE_MODEL
 
-        print("   • Loading clause analyzer...")
-        self.clause_tokenizer = AutoTokenizer.from_pretrained("nlpaueb/legal-bert-base-uncased")
-        self.clause_classifier = AutoModelForSequenceClassification.from_pretrained(
-            "nlpaueb/legal-bert-base-uncased",
-            num_labels=len(self._get_flaw_types())
+        print("   • Loading shared encoder with document and clause heads...")
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_source)
+        self.model = SharedEncoderClassifier.from_pretrained(
+            model_source,
+            num_doc_labels=2,
+            num_clause_labels=len(self._get_flaw_types()),
+            # Page-cache backed weights are shared by every worker process;
+            # training writes every weight, so it gets ordinary copies
+            mmap_weights=mmap_weights and not train and self.device.type == "cpu"
         ).to(self.device)
 
         print("✓ Models loaded")
 
-        self.legal_requirements = self._define_legal_requirements()
+        self.clause_cache = ClauseCache(max_entries=CLAUSE_CACHE_SIZE)
+
+        if train:
+            print("\n🔧 Training on legal flaw detection data...")
+            self._train_on_legal_data()
+            print("✓ Training complete")
+        elif artifact_path is None:
+            print("⚠️  No fine-tuned artifact found; document classifier head is untrained.")
+            print("   Run `python train_validator.py` to create one.")
+
+        self.model.eval()
 
-        print("\n🔧 Training on legal flaw detection data...")
-        self._train_on_legal_data()
-        print("✓ Training complete")
+        # Per-clause classification only makes sense once the clause head has been fine-tuned
+        if clause_classification is None:
+            clause_classification = "clause" in self.model.trained_heads
+        self.clause_classification = clause_classification
+
+        print(f"   • Preparing {backend} inference backend...")
+        export_dir = os.path.join(artifact_path, "exports") if artifact_path else None
+        self.backend = create_backend(backend, self.model, self.tokenizer,
+                                      export_dir=export_dir, num_threads=num_threads)
+
+        # Approved clauses to match document clauses against (see reference_clauses.py).
+        # Opt-in: it costs a clause-encoder pass per document and is only
+        # meaningful with an encoder whose embeddings pass calibration.
+        if reference_matching is None:
+            reference_matching = not train and os.environ.get("REFERENCE_CLAUSES", "0") == "1"
+        self.reference_index = None
+        if reference_matching:
+            index_dir = os.environ.get("CLAUSE_INDEX_DIR") or (
+                os.path.join(artifact_path, "clause_index") if artifact_path
+                else os.path.join(self.store.root, "clause_index-base")
+            )
+            index = ClauseIndex(index_dir, f"{self.model_version}:{self.backend.name}:{BASE_MODEL}")
+            embedded = index.update(REFERENCE_CLAUSES, self._embed_texts, CALIBRATION_CLAUSES, UNRELATED_CLAUSES)
+            print(f"   • Reference clause index: {len(index)} clauses, {embedded} newly embedded")
+            if index.calibrated:
+                self.reference_index = index
+            else:
+                print(f"⚠️  Reference matching disabled: this encoder separates labelled clause pairs with "
+                      f"{index.calibration.get('accuracy', 0.0):.0%} accuracy (needs "
+                      f"{MIN_CALIBRATION_ACCURACY:.0%})")
+
+    @property
+    def cache_tag(self) -> str:
+        """Identifies everything besides rules that affects results"""
+        mode = 'chunked' if self.chunked else 'truncated'
+        clauses = 'clauses' if self.clause_classification else 'no-clauses'
+        references = f"refs-{self.reference_index.fingerprint}" if self.reference_index else 'no-refs'
+        return f"{self.model_version}:{self.backend.name}:{mode}:{self.window_aggregation}:{clauses}:{references}"
+
+    @property
+    def clause_outputs(self) -> Tuple[str, ...]:
+        """What the per-clause encoder pass computes: clause-head logits and/or reference-matching embeddings"""
+        return (("clause",) if self.clause_classification else ()) + ((EMBEDDING,) if self.reference_index else ())
+
+    def after_fork(self, num_threads: Optional[int] = None):
+        """Set this process's inference threads and rebuild per-process runtime state"""
+        self.backend.after_fork(num_threads)
+        self.clause_cache.reset_after_fork()
+
+    def save_artifact(self, metadata: Optional[Dict] = None, components: Optional[Dict] = None,
+                      promote: bool = True) -> str:
+        """
+        Write the fine-tuned encoder, heads and tokenizer as a new store
+        version, plus any extra `components` (e.g. the document-type classifier);
+        LATEST moves to it only if `promote`
+        """
+        if self.backend.name == "quantized":
+            raise ValueError("The quantized backend converts the model to int8 in place; save from an eager validator")
+
+        info = {
+            "base_model": BASE_MODEL,
+            "trained_from": self.model_version,
+            "architecture": "shared_encoder",
+        }
+        info.update(metadata or {})
+
+        version = self.store.save(
+            {"model": self.model, "tokenizer": self.tokenizer, **(components or {})},
+            metadata=info,
+            promote=promote
+        )
+        self.model_version = version
+        return version
 
     def _get_flaw_types(self) -> List[str]:
         """Define types of legal flaws to detect"""
@@ -83,85 +211,23 @@ class LegalDocumentValidator:
             "UNENFORCEABLE_CLAUSE"
         ]
 
-    def _define_legal_requirements(self) -> Dict:
-        """Define what makes a legal document valid"""
-        return {
-            "NDA": {
-                "required_clauses": [
-                    "parties_identification",
-                    "confidential_information_definition",
-                    "obligations",
-                    "term_duration",
-                    "governing_law",
-                    "signatures"
-                ],
-                "optional_clauses": [
-                    "dispute_resolution",
-                    "remedies",
-                    "return_of_materials"
-                ],
-                "prohibited_terms": [
-                    "perpetual confidentiality",
-                    "unlimited liability",
-                ]
-            },
-            "EMPLOYMENT_AGREEMENT": {
-                "required_clauses": [
-                    "parties_identification",
-                    "position_duties",
-                    "compensation",
-                    "term_termination",
-                    "governing_law",
-                    "signatures"
-                ],
-                "optional_clauses": [
-                    "benefits",
-                    "non_compete",
-                    "intellectual_property"
-                ],
-                "prohibited_terms": []
-            },
-            "FOUNDER_AGREEMENT": {
-                "required_clauses": [
-                    "parties_identification",
-                    "equity_distribution",
-                    "vesting_schedule",
-                    "intellectual_property",
-                    "governing_law",
-                    "signatures"
-                ],
-                "optional_clauses": [
-                    "non_compete",
-                    "dispute_resolution"
-                ],
-                "prohibited_terms": []
-            },
-            "SAFE_AGREEMENT": {
-                "required_clauses": [
-                    "parties_identification",
-                    "investment_amount",
-                    "valuation_cap",
-                    "conversion_terms",
-                    "governing_law",
-                    "signatures"
-                ],
-                "optional_clauses": [],
-                "prohibited_terms": []
-            },
-            "GENERAL": {
-                "required_clauses": [
-                    "parties_identification",
-                    "effective_date",
-                    "governing_law",
-                    "signatures"
-                ],
-                "optional_clauses": [],
-                "prohibited_terms": []
-            }
-        }
+    @property
+    def rules(self) -> RulePack:
+        """The current rule pack (legal_rules.py); re-read from disk when its file changes"""
+        return get_rule_pack()
+
+    @property
+    def legal_requirements(self) -> Dict:
+        """Document type -> required, optional and prohibited clauses, from the rule pack"""
+        return self.rules.requirements
+
+    def _rules_for(self, hits: Optional[RuleHits]) -> RulePack:
+        """The pack that produced `hits`, so every check uses the rule version of the scan"""
+        return hits.rules if hits is not None and hits.rules is not None else self.rules
 
-    def _create_training_data(self) -> DatasetDict:
+    def _create_training_data(self) -> "DatasetDict":
         """Create synthetic training data"""
+        from datasets import Dataset, DatasetDict
 
         training_samples = [
             {
@@ -228,12 +294,52 @@ This agreement starts now and continues forever.""",
             "train": Dataset.from_list(training_samples)
         })
 
+    def _create_clause_training_data(self) -> "DatasetDict":
+        """Create synthetic clause-level training data for the clause head"""
+        from datasets import Dataset, DatasetDict
+
+        flaw_types = self._get_flaw_types()
+        samples = []
+
+        # Every clause of a valid template is an example of a sound clause
+        for document in self._create_training_data()["train"]:
+            if document["label"] == 0:
+                samples.extend(
+                    {"text": clause.text.strip(), "label": flaw_types.index("NO_FLAW")}
+                    for clause in segment_clauses(document["text"])
+                )
+
+        flawed_clauses = [
+            ("This Agreement is between someone and someone else.", "MISSING_PARTIES"),
+            ("The Services shall be provided by the other party to Party B.", "MISSING_PARTIES"),
+            ("This agreement is effective immediately.", "MISSING_DATE"),
+            ("Payment is due on the agreed date.", "MISSING_DATE"),
+            ("The parties may possibly cooperate on reasonable matters as appropriate.", "AMBIGUOUS_TERMS"),
+            ("He will be paid some amount.", "VAGUE_PAYMENT_TERMS"),
+            ("Fees shall be paid as mutually determined from time to time.", "VAGUE_PAYMENT_TERMS"),
+            ("This agreement starts now and continues forever.", "INVALID_DURATION"),
+            ("The obligations herein shall be perpetual and indefinite.", "INVALID_DURATION"),
+            ("The Employee may try to do some work as needed.", "UNCLEAR_OBLIGATIONS"),
+            ("The Contractor shall be liable for all losses of any kind without limit.", "MISSING_LIABILITY_LIMIT"),
+            ("Any work the Consultant creates remains with whoever made it.", "MISSING_INTELLECTUAL_PROPERTY"),
+            ("The Employee shall not work for any competitor anywhere for ten years after leaving.",
+             "UNENFORCEABLE_CLAUSE"),
+            ("Either party may end this at any time for any reason without notice.", "MISSING_TERMINATION_CLAUSE"),
+        ]
+        samples.extend({"text": text, "label": flaw_types.index(flaw)} for text, flaw in flawed_clauses)
+
+        return DatasetDict({
+            "train": Dataset.from_list(samples)
+        })
+
     def _train_on_legal_data(self):
-        """Train the classifier on legal documents"""
+        """Train the document and clause heads on legal documents"""
+        from transformers import Trainer, TrainingArguments
+
         dataset = self._create_training_data()
 
         def tokenize_function(examples):
-            return self.doc_tokenizer(
+            return self.tokenizer(
                 examples["text"],
                 padding="max_length",
                 truncation=True,
@@ -254,13 +360,25 @@ This agreement starts now and continues forever.""",
         )
 
         trainer = Trainer(
-            model=self.doc_classifier,
+            model=self.model,
             args=training_args,
             train_dataset=tokenized_dataset["train"],
         )
 
         trainer.train()
 
+        # Clause head: same encoder, clause-level examples
+        clause_dataset = self._create_clause_training_data().map(tokenize_function, batched=True)
+        clause_trainer = Trainer(
+            model=HeadAdapter(self.model, "clause"),
+            args=training_args,
+            train_dataset=clause_dataset["train"],
+        )
+        clause_trainer.train()
+
+        self.model.trained_heads.update({"doc", "clause"})
+        self.model.eval()
+
     def validate_document(self, text: str, document_type: str = "GENERAL") -> Dict:
         """
         Main validation function
@@ -268,221 +386,727 @@ This agreement starts now and continues forever.""",
         print(f"\n📄 Validating {document_type} document...")
         print(f"📏 Length: {len(text)} characters")
 
-        # Overall document classification
-        is_valid, confidence = self._classify_document(text)
+        timer = StageTimer()
+
+        # Overall document classification (and per-clause, if enabled)
+        classification = self._run_models([text], timer)[0]
+
+        return self._build_report(text, document_type, classification, timer)
+
+    def validate_documents(self, texts: List[str], document_types: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Validate several documents at once.
+        Model windows from all documents share dynamically padded batches.
+        """
+        if document_types is None:
+            document_types = ["GENERAL"] * len(texts)
+        if len(document_types) != len(texts):
+            raise ValueError("texts and document_types must have the same length")
+
+        print(f"\n📚 Validating batch of {len(texts)} documents...")
+
+        batch_timer = StageTimer()
+        classifications = self._run_models(texts, batch_timer)
 
+        reports = []
+        for text, document_type, classification in zip(texts, document_types, classifications):
+            # The model batch is shared, so each document reports the whole batch time
+            timer = StageTimer()
+            timer.stages.update(batch_timer.stages)
+            reports.append(self._build_report(text, document_type, classification, timer))
+
+        return reports
+
+    def validate_revision(self, text: str, document_type: str = "GENERAL",
+                          previous_id: Optional[str] = None,
+                          previous_text: Optional[str] = None) -> Dict:
+        """
+        Validate an edited draft, re-analysing only clauses not seen before.
+
+        The document is segmented into clauses and each clause's model logits
+        (both heads, one encoder pass) and rule hits are cached by content.
+        Clauses shared with any earlier revision are reused; only new or
+        edited clauses go through the model and the rule scan. Document-level
+        scores are aggregated over clauses instead of token windows, and the
+        rule checks run on hits merged from the per-clause results.
+
+        `previous_id` (from an earlier report's `revision.id`) or
+        `previous_text` identify the draft this one was edited from; they
+        only affect the reported diff, never the result.
+        """
+        print(f"\n📝 Validating revision of {document_type} document...")
+        timer = StageTimer()
+        rules = self.rules
+
+        with timer.stage("segment_clauses"):
+            clauses = segment_clauses(text)
+
+        with timer.stage("cache_lookup"):
+            tag = f"{self.cache_tag}:{rules.fingerprint}"
+            keys = [ClauseCache.clause_key(clause.text, tag) for clause in clauses]
+            analyses = self.clause_cache.get_many(keys)
+
+            if previous_text is not None:
+                previous_id = ClauseCache.revision_id(previous_text)
+            previous_keys = self.clause_cache.revision(previous_id) if previous_id else None
+            if previous_keys is None and previous_text is not None:
+                previous_keys = [ClauseCache.clause_key(clause.text, tag)
+                                 for clause in segment_clauses(previous_text)]
+
+        # Identical clauses within the draft are analysed once
+        missing = {}
+        for index, analysis in enumerate(analyses):
+            if analysis is None:
+                missing.setdefault(keys[index], []).append(index)
+
+        with timer.stage("analyze_clauses"):
+            fresh = self._analyze_clauses([clauses[indices[0]] for indices in missing.values()], rules)
+            for (key, indices), analysis in zip(missing.items(), fresh):
+                self.clause_cache.put(key, analysis)
+                for index in indices:
+                    analyses[index] = analysis
+
+        with timer.stage("rule_scan"):
+            hits = self._merge_clause_hits(text, clauses, analyses, rules)
+
+        with timer.stage("classify_document"):
+            if clauses:
+                classification = self._aggregate_windows(
+                    text,
+                    torch.tensor([analysis["doc_logits"] for analysis in analyses]),
+                    [(clause.char_start, clause.char_end) for clause in clauses]
+                )
+            else:
+                classification = self._classify_texts([text])[0]
+
+            if self.clause_outputs:
+                classification["clauses"] = [
+                    self._clause_result(clause, analysis) for clause, analysis in zip(clauses, analyses)
+                ]
+
+        report = self._build_report(text, document_type, classification, timer, hits=hits)
+
+        revision_id = ClauseCache.revision_id(text)
+        self.clause_cache.remember_revision(revision_id, keys)
+
+        previous = set(previous_keys) if previous_keys is not None else None
+        current = set(keys)
+        report["revision"] = {
+            "id": revision_id,
+            "previous_id": previous_id,
+            "previous_found": previous is not None,
+            "clauses_total": len(clauses),
+            "clauses_changed": len(current - previous) if previous is not None else None,
+            "clauses_removed": len(previous - current) if previous is not None else None,
+            "clauses_reanalyzed": sum(len(indices) for indices in missing.values()),
+            "clauses_reused": len(clauses) - sum(len(indices) for indices in missing.values())
+        }
+        return report
+
+    def validate_document_stages(self, text: str, document_type: str = "GENERAL") -> Iterator[Tuple[str, Dict]]:
+        """
+        Validate one document in stages, yielding (event, data) as each
+        completes, cheapest first:
+          ("flaw", {"stage": "rules", "flaw": ...})    structural, pattern and semantic flaws
+          ("verdict", {...})                             document-model classification
+          ("flaw", {"stage": "clauses", "flaw": ...})  clause-head flaws (if enabled)
+          ("report", {...})                              same report as validate_document
+        Flaws are yielded before deduplication; the report has the final list.
+        """
+        print(f"\n📄 Validating {document_type} document (staged)...")
+        timer = StageTimer()
+
+        with timer.stage("rule_scan"):
+            hits = self.rules.scan(text)
+
+        rule_flaws = self._rule_flaws(text, document_type, hits, timer)
+        for flaw in rule_flaws:
+            yield "flaw", {"stage": "rules", "flaw": flaw.to_dict()}
+
+        with timer.stage("classify_document"):
+            classification = self._classify_texts([text])[0]
+        yield "verdict", {
+            "is_valid": classification["is_valid"],
+            "confidence": float(classification["confidence"]),
+            "windows_analyzed": classification["windows_analyzed"],
+            "top_windows": self._locate_windows(classification["top_windows"], hits)
+        }
+
+        clause_flaws, reference_flaws, references = [], [], None
+        if self.clause_outputs:
+            with timer.stage("segment_clauses"):
+                clauses = segment_clauses(text)
+            with timer.stage("classify_clauses"):
+                classification["clauses"] = self._classify_clauses([clauses])[0]
+            with timer.stage("clause_flaws"):
+                clause_flaws = self._clause_flaws(classification["clauses"], hits)
+            for flaw in clause_flaws:
+                yield "flaw", {"stage": "clauses", "flaw": flaw.to_dict()}
+
+            with timer.stage("reference_clauses"):
+                reference_flaws, references = self._reference_report(document_type, classification["clauses"], hits)
+            for flaw in reference_flaws:
+                yield "flaw", {"stage": "references", "flaw": flaw.to_dict()}
+
+        yield "report", self._assemble_report(classification, rule_flaws + clause_flaws + reference_flaws,
+                                              hits, timer, references)
+
+    def _analyze_clauses(self, clauses: List[Clause], rules: RulePack) -> List[Dict]:
+        """
+        Cacheable analysis of each clause on its own: both heads' outputs
+        (and reference-clause matches, if enabled) from one batched encoder
+        pass, plus keyword and pattern hits with offsets relative to the
+        clause start.
+        """
+        if not clauses:
+            return []
+
+        encoding = self.tokenizer(
+            [clause.text for clause in clauses],
+            truncation=True,
+            max_length=WINDOW_SIZE,
+            padding=False
+        )
+        outputs = HEAD_NAMES + ((EMBEDDING,) if self.reference_index else ())
+        logits = self._batched_logits(dict(encoding), outputs)
+        clause_confidence, clause_labels = torch.softmax(logits["clause"], dim=1).max(dim=1)
+        flaw_types = self._get_flaw_types()
+        if self.reference_index:
+            reference_scores, reference_rows = self.reference_index.match(logits[EMBEDDING].numpy())
+
+        analyses = []
+        for index, clause in enumerate(clauses):
+            hits = rules.engine.scan(clause.text)
+            analysis = {
+                "doc_logits": logits["doc"][index].tolist(),
+                "flaw_type": flaw_types[clause_labels[index].item()],
+                "probability": clause_confidence[index].item(),
+                "keywords": hits.keyword_positions,
+                "patterns": {rule_id: spans for rule_id, spans in hits.pattern_matches.items() if spans}
+            }
+            if self.reference_index:
+                analysis["reference_scores"] = reference_scores[index].tolist()
+                analysis["reference_rows"] = reference_rows[index].tolist()
+            analyses.append(analysis)
+        return analyses
+
+    def _clause_result(self, clause: Clause, analysis: Dict) -> Dict:
+        """A clause with whichever per-clause outputs are enabled (see `clause_outputs`)"""
+        result = {"clause": clause}
+        if self.clause_classification:
+            result["flaw_type"] = analysis["flaw_type"]
+            result["probability"] = analysis["probability"]
+        if self.reference_index:
+            result["reference_scores"] = analysis["reference_scores"]
+            result["reference_rows"] = analysis["reference_rows"]
+        return result
+
+    def _merge_clause_hits(self, text: str, clauses: List[Clause], analyses: List[Dict],
+                           rules: RulePack) -> RuleHits:
+        """
+        Document-level rule hits from per-clause hits. Clauses start at line
+        boundaries, so this matches a full scan for keywords and for patterns
+        that do not run across a clause heading.
+        """
+        keyword_positions: Dict[str, int] = {}
+        pattern_matches: Dict[str, List[Tuple[int, int]]] = {
+            rule_id: [] for rule_id in rules.engine.pattern_ids
+        }
+
+        # Clauses are in document order, so the first offset seen is the earliest
+        for clause, analysis in zip(clauses, analyses):
+            offset = clause.char_start
+            for keyword, position in analysis["keywords"].items():
+                keyword_positions.setdefault(keyword, offset + position)
+            for rule_id, spans in analysis["patterns"].items():
+                pattern_matches[rule_id].extend((offset + start, offset + end) for start, end in spans)
+
+        return RuleHits(text, text.lower(), keyword_positions, pattern_matches, rules=rules)
+
+    def _build_report(self, text: str, document_type: str, classification: Dict,
+                      timer: Optional[StageTimer] = None, hits: Optional[RuleHits] = None) -> Dict:
+        """Run rule-based checks and assemble the validation result"""
+        timer = timer or StageTimer()
+
+        # One pass over the text; every rule family reuses these hits
+        if hits is None:
+            with timer.stage("rule_scan"):
+                hits = self.rules.scan(text)
+
+        rule_flaws = self._rule_flaws(text, document_type, hits, timer)
+
+        # Clauses the clause head flagged
+        with timer.stage("clause_flaws"):
+            clause_flaws = self._clause_flaws(classification.get("clauses", []), hits)
+
+        # Required clauses with no close approved counterpart, and ones that stray from it
+        with timer.stage("reference_clauses"):
+            reference_flaws, references = self._reference_report(
+                document_type, classification.get("clauses", []), hits
+            )
+
+        return self._assemble_report(classification, rule_flaws + clause_flaws + reference_flaws,
+                                     hits, timer, references)
+
+    def _rule_flaws(self, text: str, document_type: str, hits: RuleHits, timer: StageTimer) -> List[LegalFlaw]:
+        """Structural, pattern and semantic rule flaws, in report order"""
         # Rule-based validation
-        structural_flaws = self._check_structural_requirements(text, document_type)
+        with timer.stage("structural_rules"):
+            structural_flaws = self._check_structural_requirements(text, document_type, hits)
 
         # Pattern-based flaw detection
-        pattern_flaws = self._detect_pattern_flaws(text)
+        with timer.stage("pattern_rules"):
+            pattern_flaws = self._detect_pattern_flaws(text, hits)
 
         # Semantic analysis
-        semantic_flaws = self._analyze_semantic_issues(text, document_type)
+        with timer.stage("semantic_rules"):
+            semantic_flaws = self._analyze_semantic_issues(text, document_type, hits)
+
+        return structural_flaws + pattern_flaws + semantic_flaws
+
+    def _assemble_report(self, classification: Dict, all_flaws: List[LegalFlaw],
+                         hits: RuleHits, timer: StageTimer, references: Optional[List[Dict]] = None) -> Dict:
+        """Deduplicate flaws and combine them with the model classification (and reference matches)"""
+        is_valid, confidence = classification["is_valid"], classification["confidence"]
 
         # Combine and deduplicate
-        all_flaws = structural_flaws + pattern_flaws + semantic_flaws
-        unique_flaws = self._deduplicate_flaws(all_flaws)
-        unique_flaws.sort(key=lambda x: {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}[x.severity])
+        with timer.stage("deduplication"):
+            unique_flaws = FlawSet(all_flaws)
 
-        # Calculate compliance
-        is_compliant = len([f for f in unique_flaws if f.severity in ["CRITICAL", "HIGH"]]) == 0
+        with timer.stage("assemble_report"):
+            report = {
+                "is_valid": is_valid,
+                "confidence": float(confidence),
+                **unique_flaws.summary(),
+                "windows_analyzed": classification["windows_analyzed"],
+                "top_windows": self._locate_windows(classification["top_windows"], hits),
+                "clauses_analyzed": len(classification.get("clauses", []))
+            }
+            if references is not None:
+                report["reference_clauses"] = references
 
         print(f"✓ Validation complete: {len(unique_flaws)} issues found")
 
-        return {
-            "is_compliant": is_compliant,
-            "is_valid": is_valid,
-            "confidence": float(confidence),
-            "total_flaws": len(unique_flaws),
-            "critical_flaws": len([f for f in unique_flaws if f.severity == "CRITICAL"]),
-            "high_flaws": len([f for f in unique_flaws if f.severity == "HIGH"]),
-            "medium_flaws": len([f for f in unique_flaws if f.severity == "MEDIUM"]),
-            "low_flaws": len([f for f in unique_flaws if f.severity == "LOW"]),
-            "flaws": [asdict(f) for f in unique_flaws]
-        }
+        report["timings"] = timer.as_ms()
+        return report
+
+    def _locate_windows(self, top_windows: List[Dict], hits: RuleHits) -> List[Dict]:
+        """Point reviewers at the lines behind the model score"""
+        return [
+            dict(window, line=hits.line_index.line_of(window["char_start"]))
+            for window in top_windows
+        ]
+
+    def _run_models(self, texts: List[str], timer: StageTimer) -> List[Dict]:
+        """Document classification for every text, plus per-clause predictions and reference matches if enabled"""
+        with timer.stage("classify_document"):
+            classifications = self._classify_texts(texts)
+
+        if self.clause_outputs:
+            with timer.stage("segment_clauses"):
+                clause_lists = [segment_clauses(text) for text in texts]
+            with timer.stage("classify_clauses"):
+                for classification, clauses in zip(classifications, self._classify_clauses(clause_lists)):
+                    classification["clauses"] = clauses
+
+        return classifications
 
     def _classify_document(self, text: str) -> Tuple[bool, float]:
         """ML classification"""
-        inputs = self.doc_tokenizer(
-            text,
-            return_tensors="pt",
+        classification = self._classify_texts([text])[0]
+        return classification["is_valid"], classification["confidence"]
+
+    def _classify_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        ML classification for a list of documents.
+
+        In chunked mode each text is split into overlapping token windows covering
+        the whole document; otherwise only the first 512 tokens are used.
+        Windows from all texts are sorted by length and run in batches padded to
+        the longest window, then their logits are aggregated per document and the
+        windows with the highest invalid probability are reported back.
+        """
+        if not texts:
+            return []
+
+        window_logits, window_spans, doc_windows = self._window_logits(texts)
+
+        return [
+            self._aggregate_windows(text, window_logits[windows], [window_spans[w] for w in windows])
+            for text, windows in zip(texts, doc_windows)
+        ]
+
+    def _window_logits(self, texts: List[str]) -> Tuple[torch.Tensor, List[Tuple[int, int]], List[List[int]]]:
+        """
+        Document-head logits and character span of every window of every
+        text, plus the window indices belonging to each text.
+        """
+        encoding = self.tokenizer(
+            texts,
             truncation=True,
-            max_length=512,
-            padding=True
-        ).to(self.device)
+            max_length=WINDOW_SIZE,
+            stride=WINDOW_STRIDE if self.chunked else 0,
+            return_overflowing_tokens=self.chunked,
+            return_offsets_mapping=True,
+            padding=False
+        )
+        offsets = encoding.pop("offset_mapping")
+        window_docs = encoding.pop("overflow_to_sample_mapping", None) or list(range(len(texts)))
+
+        window_logits = self._batched_logits(encoding, ("doc",))["doc"]
 
-        with torch.no_grad():
-            outputs = self.doc_classifier(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1)
-            prediction = torch.argmax(probs, dim=1).item()
-            confidence = probs[0][prediction].item()
+        # Character span of each window: first and last non-special token
+        window_spans = [
+            (window_offsets[1][0], window_offsets[-2][1]) if len(window_offsets) > 2 else (0, 0)
+            for window_offsets in offsets
+        ]
 
-        return (prediction == 0), confidence
+        doc_windows = [[] for _ in texts]
+        for window, doc in enumerate(window_docs):
+            doc_windows[doc].append(window)
 
-    def _check_structural_requirements(self, text: str, doc_type: str) -> List[LegalFlaw]:
-        """Check required clauses"""
+        return window_logits, window_spans, doc_windows
+
+    def _aggregate_windows(self, text: str, logits: torch.Tensor,
+                           spans: List[Tuple[int, int]]) -> Dict:
+        """
+        Document score from per-window logits (mean of logits, or the worst
+        window with `window_aggregation="max"`), plus the windows with the
+        highest invalid probability.
+        """
+        probs_by_window = torch.softmax(logits, dim=1)
+
+        if self.window_aggregation == "max":
+            # A single clearly-flawed section marks the whole document invalid
+            probs = probs_by_window[torch.argmax(probs_by_window[:, 1])]
+        else:
+            probs = torch.softmax(logits.mean(dim=0), dim=0)
+
+        prediction = torch.argmax(probs).item()
+
+        top_windows = []
+        for rank in torch.argsort(probs_by_window[:, 1], descending=True)[:TOP_WINDOWS].tolist():
+            char_start, char_end = spans[rank]
+            top_windows.append({
+                "window": rank,
+                "char_start": char_start,
+                "char_end": char_end,
+                "invalid_probability": float(probs_by_window[rank, 1]),
+                "preview": text[char_start:char_start + 120].strip()
+            })
+
+        return {
+            "is_valid": prediction == 0,
+            "confidence": float(probs[prediction]),
+            "windows_analyzed": len(spans),
+            "top_windows": top_windows
+        }
+
+    def _batched_logits(self, encoding: Dict[str, List[List[int]]],
+                        heads: Tuple[str, ...]) -> Dict[str, torch.Tensor]:
+        """
+        Logits of the given heads (or the clause `embedding`) for every
+        unpadded sequence in `encoding`. Sequences are sorted by length and
+        batched, each batch padded only to its longest; all heads share one
+        encoder pass.
+        """
+        count = len(encoding["input_ids"])
+        order = sorted(range(count), key=lambda i: len(encoding["input_ids"][i]))
+        widths = {
+            "doc": self.model.doc_head.out_features,
+            "clause": self.model.clause_head.out_features,
+            EMBEDDING: self.model.config.hidden_size
+        }
+        logits_out = {head: torch.empty((count, widths[head])) for head in heads}
+
+        for start in range(0, count, WINDOW_BATCH_SIZE):
+            indices = order[start:start + WINDOW_BATCH_SIZE]
+            batch = self.tokenizer.pad(
+                {key: [values[i] for i in indices] for key, values in encoding.items()},
+                padding="longest",
+                return_tensors="pt"
+            ).to(self.device)
+            for head, logits in self.backend.head_logits(batch, heads).items():
+                logits_out[head][indices] = logits.float().cpu()
+
+        return logits_out
+
+    def _classify_clauses(self, clause_lists: List[List[Clause]]) -> List[List[Dict]]:
+        """
+        Clause-head prediction and/or reference-clause matches (see
+        `clause_outputs`) for every clause of every document, in one
+        length-sorted, dynamically padded pass. Clauses are at most about one
+        window long and do not overlap, so this costs no more than the
+        document pass over the same text.
+        """
+        clauses = [clause for clause_list in clause_lists for clause in clause_list]
+        if not clauses:
+            return [[] for _ in clause_lists]
+
+        encoding = self.tokenizer(
+            [clause.text for clause in clauses],
+            truncation=True,
+            max_length=WINDOW_SIZE,
+            padding=False
+        )
+        outputs = self._batched_logits(dict(encoding), self.clause_outputs)
+        analyses = [{} for _ in clauses]
+
+        if "clause" in outputs:
+            confidence, labels = torch.softmax(outputs["clause"], dim=1).max(dim=1)
+            flaw_types = self._get_flaw_types()
+            for analysis, label, probability in zip(analyses, labels.tolist(), confidence.tolist()):
+                analysis["flaw_type"], analysis["probability"] = flaw_types[label], probability
+
+        if EMBEDDING in outputs:
+            # Every clause of every document against every reference, in one multiply
+            scores, rows = self.reference_index.match(outputs[EMBEDDING].numpy())
+            for analysis, clause_scores, clause_rows in zip(analyses, scores, rows):
+                analysis["reference_scores"], analysis["reference_rows"] = clause_scores, clause_rows
+
+        analyses = iter(analyses)
+        return [
+            [self._clause_result(clause, next(analyses)) for clause in clause_list]
+            for clause_list in clause_lists
+        ]
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Unit-length clause embeddings, as used for reference matching"""
+        encoding = self.tokenizer(texts, truncation=True, max_length=WINDOW_SIZE, padding=False)
+        return self._batched_logits(dict(encoding), (EMBEDDING,))[EMBEDDING].numpy()
+
+    def _clause_flaws(self, clause_results: List[Dict], hits: RuleHits) -> List[LegalFlaw]:
+        """Turn confident clause-head predictions into flaws located at their clause"""
         flaws = []
-        requirements = self.legal_requirements.get(doc_type, self.legal_requirements["GENERAL"])
-        text_lower = text.lower()
-
-        clause_checks = {
-            "parties_identification": (
-                ["party", "parties", "between", "by and between"],
-                "Document must clearly identify all parties",
-                "Add: 'This Agreement is entered into between [Party A] and [Party B]'"
-            ),
-            "effective_date": (
-                ["date", "dated", "as of", "entered into as of"],
-                "Document must have an effective date",
-                "Add effective date: 'as of [Date]'"
-            ),
-            "governing_law": (
-                ["governing law", "governed by", "laws of", "jurisdiction"],
-                "Document must specify governing law",
-                "Add: 'This Agreement shall be governed by the laws of [Jurisdiction]'"
-            ),
-            "signatures": (
-                ["signature", "signed", "executed"],
-                "Document must have signature provisions",
-                "Add signature section for all parties"
-            ),
-            "equity_distribution": (
-                ["equity", "shares", "ownership", "stock"],
-                "Founder agreement must define equity split",
-                "Add: 'Equity shall be distributed as follows: [details]'"
-            ),
-            "vesting_schedule": (
-                ["vesting", "vest", "cliff"],
-                "Founder agreement must include vesting terms",
-                "Add: 'Equity shall vest over [period] with [cliff]'"
-            ),
-            "intellectual_property": (
-                ["intellectual property", "ip", "patents", "copyright"],
-                "Document should address IP ownership",
-                "Add: 'All intellectual property shall belong to [Party]'"
-            ),
-            "compensation": (
-                ["compensation", "salary", "payment"],
-                "Employment agreement must specify compensation",
-                "Add: 'Employee shall receive [amount] per [period]'"
-            ),
-            "investment_amount": (
-                ["purchase amount", "investment", "inr", "rs"],
-                "SAFE must specify investment amount",
-                "Add: 'Purchase Amount: INR [amount]'"
-            ),
-            "valuation_cap": (
-                ["valuation cap", "cap"],
-                "SAFE should include valuation cap",
-                "Add: 'Valuation Cap: INR [amount]'"
+        guidance = self._rules_for(hits).clause_flaw_guidance
+
+        for result in clause_results:
+            flaw_type, probability = result.get("flaw_type", "NO_FLAW"), result.get("probability", 0.0)
+            if flaw_type == "NO_FLAW" or probability < CLAUSE_FLAW_THRESHOLD:
+                continue
+
+            clause = result["clause"]
+            severity, description, suggestion = guidance.get(
+                flaw_type, ("MEDIUM", "Clause flagged by the clause classifier", "Review this clause")
             )
-        }
 
-        for clause_name in requirements["required_clauses"]:
-            if clause_name in clause_checks:
-                keywords, description, suggestion = clause_checks[clause_name]
-                if not any(keyword in text_lower for keyword in keywords):
-                    flaws.append(LegalFlaw(
-                        flaw_type=f"MISSING_{clause_name.upper()}",
-                        severity="CRITICAL",
-                        location="Document-wide",
-                        description=description,
-                        suggestion=suggestion
-                    ))
+            # Point at the clause's first non-blank character
+            start = clause.char_start + len(clause.text) - len(clause.text.lstrip())
+            line, column, section = hits.line_index.locate(start)
+
+            flaws.append(LegalFlaw(
+                flaw_type=flaw_type,
+                severity=severity,
+                location=f"Clause {clause.title}, {hits.line_index.describe(start)}",
+                description=f"{description} (model confidence {probability:.0%})",
+                suggestion=suggestion,
+                clause_text=clause.text.strip()[:300],
+                line=line,
+                column=column,
+                section=clause.section or section,
+                char_start=clause.char_start,
+                char_end=clause.char_end
+            ))
 
         return flaws
 
-    def _detect_pattern_flaws(self, text: str) -> List[LegalFlaw]:
-        """Pattern matching for flaws"""
-        flaws = []
-        text_lower = text.lower()
+    def _reference_report(self, document_type: str, clause_results: List[Dict],
+                          hits: RuleHits) -> Tuple[List[LegalFlaw], Optional[List[Dict]]]:
+        """Reference-clause flaws and per-requirement matches (None if reference matching is off)"""
+        if self.reference_index is None:
+            return [], None
+        return self._reference_flaws(document_type, self._reference_matches(clause_results, hits), hits)
 
-        patterns = [
-            {
-                "pattern": r'\b(someone|somebody|party [a-z]|the other party)\b',
-                "flaw_type": "AMBIGUOUS_PARTIES",
-                "severity": "CRITICAL",
-                "description": "Document uses vague party identifiers",
-                "suggestion": "Replace with specific party names"
-            },
-            {
-                "pattern": r'\b(some amount|to be determined|tbd|___+)\b',
-                "flaw_type": "INCOMPLETE_TERMS",
-                "severity": "CRITICAL",
-                "description": "Document contains incomplete terms",
-                "suggestion": "Fill in all specific terms"
-            },
-            {
-                "pattern": r'\b(forever|perpetual|indefinite)\b',
-                "flaw_type": "INVALID_DURATION",
-                "severity": "HIGH",
-                "description": "Potentially unenforceable perpetual terms",
-                "suggestion": "Specify a reasonable fixed term"
-            },
-            {
-                "pattern": r'\b(may|might|possibly)\b',
-                "flaw_type": "WEAK_OBLIGATIONS",
-                "severity": "MEDIUM",
-                "description": "Weak, non-binding language",
-                "suggestion": "Use 'shall', 'will', 'must'"
+    def _reference_matches(self, clause_results: List[Dict], hits: RuleHits, offset: int = 0) -> Dict[str, Dict]:
+        """
+        For each requirement in the reference index, the document clause
+        closest to any of its approved clauses, located for reporting.
+        `offset` is added to character positions (for streamed chunks).
+        """
+        scored = [result for result in clause_results if "reference_scores" in result]
+        if not scored:
+            return {}
+
+        scores = np.asarray([result["reference_scores"] for result in scored], dtype=np.float32)
+        best_clauses = scores.argmax(axis=0)
+
+        matches = {}
+        for group, requirement in enumerate(self.reference_index.requirements):
+            best = int(best_clauses[group])
+            similarity = float(scores[best, group])
+            if not np.isfinite(similarity):
+                continue
+
+            clause = scored[best]["clause"]
+            start = clause.char_start + len(clause.text) - len(clause.text.lstrip())
+            line, column, section = hits.line_index.locate(start)
+            matches[requirement] = {
+                "similarity": similarity,
+                "reference": int(scored[best]["reference_rows"][group]),
+                "clause": clause.title,
+                "location": f"Clause {clause.title}, {hits.line_index.describe(start)}",
+                "clause_text": clause.text.strip()[:300],
+                "line": line,
+                "column": column,
+                "section": clause.section or section,
+                "char_start": offset + clause.char_start,
+                "char_end": offset + clause.char_end
             }
-        ]
+        return matches
+
+    def _reference_flaws(self, document_type: str, matches: Dict[str, Dict],
+                         hits: RuleHits) -> Tuple[List[LegalFlaw], List[Dict]]:
+        """
+        Compare the document's best clause matches with the requirements of
+        its type: a required clause with no match is missing; a clause that
+        matches but not closely enough to an approved one is nonstandard.
+        A requirement whose keyword check passes is never reported missing
+        (status "keyword"); the keyword rules are the authority on presence.
+        """
+        index = self.reference_index
+        rules = self._rules_for(hits)
+        requirements = rules.requirements_for(document_type)
+        first_rows = {entry["requirement"]: row for row, entry in reversed(list(enumerate(index.entries)))}
+
+        flaws, summary = [], []
+        for requirement in requirements["required_clauses"] + requirements["optional_clauses"]:
+            if requirement not in first_rows:
+                continue  # Checked by keyword rules only (parties, dates, signatures)
+
+            required = requirement in requirements["required_clauses"]
+            label = requirement.replace("_", " ")
+            match = matches.get(requirement)
+            similarity = match["similarity"] if match else None
+
+            if match is None or similarity < index.match_threshold:
+                check = rules.clause_checks.get(requirement)
+                status = "keyword" if check and hits.has_any(check[0]) else "missing"
+            elif similarity < index.approved_threshold:
+                status = "nonstandard"
+            else:
+                status = "matched"
 
-        for pattern_info in patterns:
-            matches = list(re.finditer(pattern_info["pattern"], text_lower, re.IGNORECASE))
+            summary.append({
+                "requirement": requirement,
+                "required": required,
+                "status": status,
+                "similarity": round(similarity, 4) if similarity is not None else None,
+                "clause": match["clause"] if match and status in ("matched", "nonstandard") else None,
+                "line": match["line"] if match and status in ("matched", "nonstandard") else None
+            })
+
+            reference = index.entries[match["reference"] if match else first_rows[requirement]]["text"]
+            if status == "missing" and required:
+                closest = f" (closest: clause {match['clause']}, similarity {similarity:.2f})" if match else ""
+                flaws.append(LegalFlaw(
+                    flaw_type=f"MISSING_{requirement.upper()}",
+                    severity="HIGH",
+                    location="Document-wide",
+                    description=f"No clause matches an approved {label} clause{closest}",
+                    suggestion=f"Add a {label} clause, e.g.: \"{reference[:200]}\""
+                ))
+            elif status == "nonstandard":
+                flaws.append(LegalFlaw(
+                    flaw_type="NONSTANDARD_CLAUSE",
+                    severity="MEDIUM" if required else "LOW",
+                    location=match["location"],
+                    description=f"{label.capitalize()} clause departs from the approved wording "
+                                f"(similarity {similarity:.2f})",
+                    suggestion=f"Compare with the approved clause: \"{reference[:200]}\"",
+                    clause_text=match["clause_text"],
+                    line=match["line"],
+                    column=match["column"],
+                    section=match["section"],
+                    char_start=match["char_start"],
+                    char_end=match["char_end"]
+                ))
+
+        return flaws, summary
+
+    def _check_structural_requirements(self, text: str, doc_type: str,
+                                       hits: Optional[RuleHits] = None) -> List[LegalFlaw]:
+        """Check required clauses"""
+        flaws = []
+        hits = hits or self.rules.scan(text)
+        checks = self._rules_for(hits).structural_checks
+        for flaw_type, keywords, description, suggestion in checks.get(doc_type, checks["GENERAL"]):
+            if not hits.has_any(keywords):
+                flaws.append(LegalFlaw(
+                    flaw_type=flaw_type,
+                    severity="CRITICAL",
+                    location="Document-wide",
+                    description=description,
+                    suggestion=suggestion
+                ))
+
+        return flaws
+
+    def _detect_pattern_flaws(self, text: str, hits: Optional[RuleHits] = None) -> List[LegalFlaw]:
+        """Pattern matching for flaws"""
+        flaws = []
+        hits = hits or self.rules.scan(text)
+
+        for pattern_info in self._rules_for(hits).pattern_rules:
+            matches = hits.matches(pattern_info["flaw_type"])
 
             if matches:
-                first_match = matches[0]
-                start = max(0, first_match.start() - 30)
-                end = min(len(text), first_match.end() + 30)
+                first_start, first_end = matches[0]
+                start = max(0, first_start - 30)
+                end = min(len(text), first_end + 30)
                 context = text[start:end]
+                line, column, section = hits.line_index.locate(first_start)
 
                 flaws.append(LegalFlaw(
                     flaw_type=pattern_info["flaw_type"],
                     severity=pattern_info["severity"],
-                    location=f"Line ~{text[:first_match.start()].count(chr(10)) + 1}",
+                    location=hits.line_index.describe(first_start),
                     description=f"{pattern_info['description']} ({len(matches)} instance(s))",
                     suggestion=pattern_info["suggestion"],
-                    clause_text=context.strip()
+                    clause_text=context.strip(),
+                    line=line,
+                    column=column,
+                    section=section
                 ))
 
         return flaws
 
-    def _analyze_semantic_issues(self, text: str, doc_type: str) -> List[LegalFlaw]:
+    def _analyze_semantic_issues(self, text: str, doc_type: str,
+                                 hits: Optional[RuleHits] = None) -> List[LegalFlaw]:
         """Semantic analysis"""
-        flaws = []
-        text_lower = text.lower()
+        hits = hits or self.rules.scan(text)
+        return self._brevity_flaws(len(text)) + self._section_27_flaws(hits)
 
-        if len(text) < 300:
-            flaws.append(LegalFlaw(
-                flaw_type="INSUFFICIENT_DETAIL",
-                severity="MEDIUM",
-                location="Document-wide",
-                description="Document is unusually brief",
-                suggestion="Ensure all material terms are detailed"
-            ))
+    def _brevity_flaws(self, length: int) -> List[LegalFlaw]:
+        """Flag documents too short to hold the material terms"""
+        if length >= 300:
+            return []
 
-        if "section 27" in text_lower and "non-compete" in text_lower:
+        return [LegalFlaw(
+            flaw_type="INSUFFICIENT_DETAIL",
+            severity="MEDIUM",
+            location="Document-wide",
+            description="Document is unusually brief",
+            suggestion="Ensure all material terms are detailed"
+        )]
+
+    def _section_27_flaws(self, hits: RuleHits) -> List[LegalFlaw]:
+        """Non-compete language that may be void under Section 27"""
+        flaws = []
+
+        keywords = self._rules_for(hits).section_27_keywords
+        if keywords and all(hits.has(keyword) for keyword in keywords):
+            # Located at the last keyword of the rule (the non-compete itself)
+            position = hits.keyword_positions[keywords[-1]]
+            line, column, section = hits.line_index.locate(position)
             flaws.append(LegalFlaw(
                 flaw_type="SECTION_27_VIOLATION",
                 severity="CRITICAL",
-                location="Non-compete clause",
+                location=f"Non-compete clause, {hits.line_index.describe(position)}",
                 description="Non-compete may violate Section 27 of Indian Contract Act",
-                suggestion="Remove post-termination non-compete or limit to employment period only"
+                suggestion="Remove post-termination non-compete or limit to employment period only",
+                line=line,
+                column=column,
+                section=section
             ))
 
         return flaws
-
-    def _deduplicate_flaws(self, flaws: List[LegalFlaw]) -> List[LegalFlaw]:
-        """Remove duplicates"""
-        seen = set()
-        unique = []
-
-        for flaw in flaws:
-            key = (flaw.flaw_type, flaw.location)
-            if key not in seen:
-                seen.add(key)
-                unique.append(flaw)
-
-        return unique
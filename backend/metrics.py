@@ -0,0 +1,163 @@
+"""
+Metrics
+Per-stage timers and a Prometheus-style metrics registry
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named stage, in the order stages first ran"""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, timings_ms: Dict[str, float]):
+        """Add stages reported elsewhere in milliseconds (e.g. by the validator)"""
+        for name, milliseconds in timings_ms.items():
+            self.add(name, milliseconds / 1000.0)
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created"""
+        return time.perf_counter() - self.started_at
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000.0, 3) for name, seconds in self.stages.items()}
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms keyed by name and labels,
+    rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix: str = "legal_analyzer"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._gauges: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], _Histogram] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Iterable[float]] = None):
+        self._help[name] = (kind, help_text)
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def observe_stages(self, timer: StageTimer, **labels):
+        """Record every stage of a timer in the stage latency histogram"""
+        for stage, seconds in timer.stages.items():
+            self.observe("stage_seconds", seconds, stage=stage, **labels)
+
+    def render(self) -> str:
+        """Prometheus text format (version 0.0.4)"""
+        lines = []
+
+        with self._lock:
+            names = sorted({name for name, _ in list(self._counters) + list(self._gauges) + list(self._histograms)})
+
+            for name in names:
+                metric = f"{self.prefix}_{name}"
+                kind, help_text = self._help.get(name, ("untyped", name))
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+
+                for (key_name, labels), value in sorted(self._counters.items()):
+                    if key_name == name:
+                        lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+
+                for (key_name, labels), value in sorted(self._gauges.items()):
+                    if key_name == name:
+                        lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+
+                for (key_name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if key_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{metric}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{metric}_sum{_labels(labels)} {_number(histogram.total)}")
+                    lines.append(f"{metric}_count{_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for _, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("stage_seconds", "histogram", "Time spent per analysis stage")
+REGISTRY.describe("request_seconds", "histogram", "End-to-end request latency by endpoint")
+REGISTRY.describe("documents_total", "counter", "Documents analysed by endpoint")
+REGISTRY.describe("model_batch_size", "histogram", "Documents per model batch", buckets=BATCH_SIZE_BUCKETS)
+REGISTRY.describe("model_batch_windows", "histogram", "Token windows per model batch", buckets=BATCH_SIZE_BUCKETS)
+REGISTRY.describe("result_cache", "gauge", "Result cache counters")
+REGISTRY.describe("jobs", "gauge", "Job queue depth and counters")
+REGISTRY.describe("micro_batches_total", "gauge", "Micro-batches processed")
@@ -0,0 +1,124 @@
+"""
+Dynamic Micro-Batching
+Gathers concurrent requests into batches bounded by size and wait time
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads and hands them to
+    `process_batch` together.
+
+    A batch is dispatched as soon as it holds `max_batch_size` items or the
+    oldest item has waited `max_wait_ms`, whichever comes first.
+    `process_batch` receives a list of items and must return a list of
+    results in the same order.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.batches_processed = 0
+        self.items_processed = 0
+
+        self._start()
+
+    def _start(self):
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def reset_after_fork(self):
+        """
+        Threads do not survive fork(); call in a forked child (e.g. a
+        pre-forked server worker) to start a fresh worker thread and queue.
+        """
+        self.batches_processed = 0
+        self.items_processed = 0
+        self._start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the returned future resolves to its result"""
+        if self._stopped.is_set():
+            raise RuntimeError("MicroBatcher is stopped")
+
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def process(self, item: Any, timeout: float = None) -> Any:
+        """Submit one item and wait for its result"""
+        return self.submit(item).result(timeout=timeout)
+
+    def process_many(self, items: List[Any], timeout: float = None) -> List[Any]:
+        """Submit several items and wait for all results, in order"""
+        futures = [self.submit(item) for item in items]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def stop(self):
+        """Stop accepting work and let the worker thread exit"""
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items_processed / self.batches_processed if self.batches_processed else 0.0
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                self._queue.put(None)
+                break
+            batch.append(entry)
+
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [entry for entry in self._collect(first) if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"process_batch returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches_processed += 1
+            self.items_processed += len(items)
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,131 @@
+"""
+Model Artifact Store
+Versioned on-disk storage for fine-tuned validator weights
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "LEGAL_VALIDATOR_MODEL_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_store")
+)
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+
+
+class ModelArtifactStore:
+    """
+    Stores fine-tuned model artifacts as numbered versions:
+
+        <root>/v0001/manifest.json
+        <root>/v0001/<component>/...
+        <root>/LATEST
+
+    A version is written to a staging directory and renamed into place,
+    so readers never observe a half-written artifact.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+
+    def list_versions(self) -> List[str]:
+        """Return completed versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if name.startswith("v") and name[1:].isdigit()
+            and os.path.isfile(os.path.join(self.root, name, MANIFEST_FILE))
+        )
+
+    def latest_version(self) -> Optional[str]:
+        """Return the version named in LATEST, or the newest one on disk"""
+        latest_path = os.path.join(self.root, LATEST_FILE)
+        if os.path.isfile(latest_path):
+            with open(latest_path, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+            if version in self.list_versions():
+                return version
+
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def resolve(self, version: Optional[str] = None) -> Optional[str]:
+        """Return the directory of a version (default: latest), or None"""
+        version = version or self.latest_version()
+        if version is None:
+            return None
+
+        path = os.path.join(self.root, version)
+        if not os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+            return None
+        return path
+
+    def load_manifest(self, version: Optional[str] = None) -> Optional[Dict]:
+        """Read the manifest of a version (default: latest)"""
+        path = self.resolve(version)
+        if path is None:
+            return None
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, components: Dict, metadata: Optional[Dict] = None, promote: bool = True) -> str:
+        """
+        Save a new version, and point LATEST at it unless `promote` is False.
+
+        `components` maps a sub-directory name to any object exposing
+        `save_pretrained(path)` (models, tokenizers).
+        Returns the new version name.
+        """
+        os.makedirs(self.root, exist_ok=True)
+
+        previous = self.latest_version()
+        versions = self.list_versions()
+        next_number = int(versions[-1][1:]) + 1 if versions else 1
+        version = f"v{next_number:04d}"
+
+        staging = os.path.join(self.root, f".staging-{version}-{os.getpid()}")
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        os.makedirs(staging)
+
+        try:
+            for name, component in components.items():
+                component.save_pretrained(os.path.join(staging, name))
+
+            manifest = {
+                "version": version,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "components": sorted(components),
+            }
+            manifest.update(metadata or {})
+
+            with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+
+            os.rename(staging, os.path.join(self.root, version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if promote:
+            self.set_latest(version)
+        elif previous is not None and self.latest_version() != previous:
+            # Without a LATEST file the newest version would be served; pin the one that was
+            self.set_latest(previous)
+        return version
+
+    def set_latest(self, version: str):
+        """Point LATEST at a version (used for promotion and rollback)"""
+        if version not in self.list_versions():
+            raise ValueError(f"Unknown model version: {version}")
+
+        tmp_path = os.path.join(self.root, f".{LATEST_FILE}.{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, LATEST_FILE))
@@ -0,0 +1,251 @@
+"""
+PDF Extraction Pipeline
+Extracts PDF page text in parallel worker processes, in page order, within a page and time budget
+"""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional
+
+
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", max(1, min(4, (os.cpu_count() or 2) - 1))))
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 500))
+PDF_TIME_BUDGET = float(os.environ.get("PDF_TIME_BUDGET", 60))
+
+# Below this many pages, process start-up and IPC cost more than they save
+PARALLEL_MIN_PAGES = 8
+# Workers open the document once each, so tasks cost little beyond their pages
+MIN_PAGES_PER_TASK = 4
+TASKS_PER_WORKER = 4
+# Tasks stop between pages at the deadline; the caller waits this much longer
+# for a page still running, then gives up on it (the worker is left to finish)
+PAGE_GRACE_SECONDS = float(os.environ.get("PDF_PAGE_GRACE", 5))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Worker side: the document this process last opened, as (path, reader)
+_worker_document = None
+
+
+def _ready() -> bool:
+    return True
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # fork where available: spawn/forkserver would re-import app.py (and load
+            # the model) in every worker. Workers only run PyPDF2, never torch.
+            method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _pool
+
+
+def start_pool():
+    """
+    Create the shared pool and start its worker processes now. Call while the
+    process is still single-threaded (at app import, or first thing in a
+    pre-forked worker): forking once torch, the tokenizer or the server's own
+    threads are running can copy a lock some other thread holds and deadlock
+    the worker.
+    """
+    if PDF_WORKERS < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        # spawned workers start from a fresh interpreter; starting them here,
+        # while this module may itself be imported by a spawned child, would fail
+        return
+    pool = _get_pool()
+    for future in [pool.submit(_ready) for _ in range(PDF_WORKERS)]:
+        future.result()
+
+
+def shutdown_pool(terminate: bool = False):
+    """
+    Stop the shared worker pool (it is recreated on next use). Running tasks
+    finish in the background unless `terminate` kills the worker processes.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            # The pool forgets its processes on shutdown, so take them first
+            processes = list((getattr(_pool, "_processes", None) or {}).values()) if terminate else []
+            _pool.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+            _pool = None
+
+
+def reset_after_fork():
+    """
+    A pool inherited through fork() belongs to the parent; drop it without
+    touching the parent's workers and start this process's own
+    """
+    global _pool, _pool_lock
+
+    _pool = None
+    _pool_lock = threading.Lock()
+    start_pool()
+
+
+def _open_document(path: str):
+    global _worker_document
+
+    if _worker_document is None or _worker_document[0] != path:
+        import PyPDF2
+
+        _worker_document = (path, PyPDF2.PdfReader(path))
+    return _worker_document[1]
+
+
+def _extract_pages(path: str, start: int, end: int, deadline: Optional[float] = None) -> List[str]:
+    """
+    Worker: extract text of pages [start, end) of the PDF at `path`, stopping
+    early once the wall-clock `deadline` (time.time()) has passed; may return
+    fewer pages
+    """
+    if deadline is not None and time.time() > deadline:
+        return []
+
+    reader = _open_document(path)
+    pages = []
+    for number in range(start, end):
+        if deadline is not None and time.time() > deadline:
+            break
+        pages.append(reader.pages[number].extract_text() or '')
+    return pages
+
+
+class PdfExtraction:
+    """
+    Page-ordered text extraction for one PDF.
+
+    Iterate `pages()` to receive page text as soon as each page (in order) is
+    ready, or call `text()` for the whole document. Extraction stops at
+    `max_pages` pages or after `time_budget` seconds of extraction; worker
+    tasks check the deadline between pages, and a page still running past
+    the deadline is abandoned. `truncated` tells whether the budget cut the
+    document short.
+    """
+
+    def __init__(self, data: bytes, max_pages: int = PDF_MAX_PAGES,
+                 time_budget: float = PDF_TIME_BUDGET, parallel: bool = True):
+        import PyPDF2
+
+        self.data = data
+        self.time_budget = time_budget
+        self.parallel = parallel
+
+        self._reader = PyPDF2.PdfReader(io.BytesIO(data))
+        self.total_pages = len(self._reader.pages)
+        self.page_limit = min(self.total_pages, max_pages) if max_pages else self.total_pages
+
+        self.pages_extracted = 0
+        self.truncated = self.page_limit < self.total_pages
+
+    def pages(self) -> Iterator[str]:
+        """Yield page text in page order"""
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+
+        if not self.parallel or PDF_WORKERS < 2 or self.page_limit < PARALLEL_MIN_PAGES:
+            yield from self._serial_pages(self.time_budget or None)
+        else:
+            yield from self._parallel_pages(deadline)
+
+        if self.truncated:
+            print(f"⚠️  PDF truncated: extracted {self.pages_extracted} of {self.total_pages} pages")
+
+    def text(self) -> str:
+        """Whole-document text within the budget"""
+        return ''.join(self.pages())
+
+    def _serial_pages(self, budget: Optional[float], first: int = 0) -> Iterator[str]:
+        # Only time spent extracting counts, not time the consumer spends between pages
+        spent = 0.0
+        for number in range(first, self.page_limit):
+            if budget is not None and spent > budget:
+                self.truncated = True
+                return
+            started = time.monotonic()
+            page_text = self._reader.pages[number].extract_text() or ''
+            spent += time.monotonic() - started
+            self.pages_extracted += 1
+            yield page_text
+
+    def _parallel_pages(self, deadline: Optional[float]) -> Iterator[str]:
+        pool = _get_pool()
+        per_task = max(MIN_PAGES_PER_TASK, -(-self.page_limit // (PDF_WORKERS * TASKS_PER_WORKER)))
+        # Workers compare against the wall clock; monotonic clocks are per process
+        wall_deadline = None if deadline is None else time.time() + (deadline - time.monotonic())
+
+        # Workers read the document from a file once each instead of receiving
+        # the bytes with every task; the name is never reused, since workers
+        # recognise a document they already opened by its path
+        fd, path = tempfile.mkstemp(prefix=f"pdf-pages-{uuid.uuid4().hex}-", suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.data)
+
+        tasks = [
+            (start, min(start + per_task, self.page_limit),
+             pool.submit(_extract_pages, path, start, min(start + per_task, self.page_limit), wall_deadline))
+            for start in range(0, self.page_limit, per_task)
+        ]
+
+        try:
+            for start, end, future in tasks:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic()) + PAGE_GRACE_SECONDS
+                try:
+                    pages = future.result(timeout=timeout)
+                except FutureTimeout:
+                    # A page ran far past the deadline. Stop waiting for this
+                    # document only; the worker and the other requests' tasks carry on.
+                    print("⚠️  PDF page extraction overran its budget; returning the pages so far")
+                    self.truncated = True
+                    return
+                except (CancelledError, BrokenProcessPool):
+                    # A worker died and took the pool with it
+                    shutdown_pool()
+                    budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    yield from self._serial_pages(budget, first=start)
+                    return
+
+                for page_text in pages:
+                    self.pages_extracted += 1
+                    yield page_text
+
+                if len(pages) < end - start:
+                    # The task stopped at the deadline
+                    self.truncated = True
+                    return
+        finally:
+            # Queued tasks are dropped; running ones stop at the deadline by
+            # themselves, and a worker that has the file open keeps reading it
+            for _, _, future in tasks:
+                future.cancel()
+            os.unlink(path)
+
+
+def iter_pdf_pages(data: bytes, **budget) -> Iterator[str]:
+    """
+    Yield PDF page text in order as pages become available, so a consumer
+    (the chunked path of /analyze/stream) works on early pages while later
+    ones are still being extracted
+    """
+    return PdfExtraction(data, **budget).pages()
+
+
+def extract_pdf_text(data: bytes, **budget) -> str:
+    """Extract PDF text with parallel page extraction and a page/time budget"""
+    return PdfExtraction(data, **budget).text()
@@ -0,0 +1,193 @@
+"""
+Reference Clauses
+Approved wording for the substantive clauses each document type requires (see legal_requirements)
+"""
+
+from typing import Dict, List
+
+# Requirement name (as in LegalDocumentValidator._define_legal_requirements) -> approved clauses.
+# Parties, dates and signatures are left to the keyword rules: they live in the
+# preamble and execution block rather than in clauses of their own.
+REFERENCE_CLAUSES: Dict[str, List[str]] = {
+    "confidential_information_definition": [
+        "\"Confidential Information\" means all non-public information disclosed by the Disclosing Party to "
+        "the Receiving Party, whether oral, written or electronic, including trade secrets, business plans, "
+        "technical data, customer lists and financial information.",
+        "Confidential Information does not include information that is or becomes publicly available through "
+        "no fault of the Receiving Party, was lawfully known to it before disclosure, or is independently "
+        "developed without use of the Disclosing Party's information.",
+    ],
+    "obligations": [
+        "The Receiving Party shall hold the Confidential Information in strict confidence, use it solely for "
+        "the Purpose, and not disclose it to any third party except its employees and advisers who need to know "
+        "it and are bound by obligations of confidentiality no less protective than these.",
+        "The Receiving Party shall protect the Confidential Information with at least the same degree of care "
+        "it uses for its own confidential information, and in no event less than reasonable care.",
+    ],
+    "term_duration": [
+        "This Agreement shall remain in effect for three (3) years from the Effective Date, and the obligations "
+        "of confidentiality shall survive for three (3) years after its expiry or termination.",
+    ],
+    "return_of_materials": [
+        "Upon the Disclosing Party's written request, the Receiving Party shall promptly return or destroy all "
+        "documents and materials containing Confidential Information and certify in writing that it has done so.",
+    ],
+    "remedies": [
+        "The Receiving Party acknowledges that unauthorised disclosure may cause irreparable harm, and the "
+        "Disclosing Party shall be entitled to seek injunctive relief in addition to any other remedy available "
+        "at law or in equity.",
+    ],
+    "position_duties": [
+        "The Employee is employed as Senior Software Engineer, reporting to the Chief Technology Officer, and "
+        "shall perform the duties reasonably assigned by the Company consistent with that position.",
+    ],
+    "compensation": [
+        "The Company shall pay the Employee a gross annual salary of INR 24,00,000, payable in equal monthly "
+        "instalments in arrears, subject to deduction of applicable taxes.",
+        "In consideration of the Services, the Client shall pay the fees set out in Schedule 1 within thirty "
+        "(30) days of receipt of a valid invoice.",
+    ],
+    "term_termination": [
+        "Either party may terminate this employment by giving the other thirty (30) days' written notice, or "
+        "salary in lieu of notice. The Company may terminate immediately for gross misconduct.",
+    ],
+    "benefits": [
+        "The Employee shall be entitled to medical insurance, statutory provident fund contributions and twenty "
+        "(20) days of paid leave per calendar year in accordance with Company policy.",
+    ],
+    "non_compete": [
+        "During the term of employment the Employee shall not engage in any business that competes with the "
+        "Company. This restriction does not apply after the employment ends.",
+        "During the period of association, no Founder shall be engaged in any business competing with the "
+        "Company, consistent with Section 27 of the Indian Contract Act, 1872.",
+    ],
+    "intellectual_property": [
+        "All inventions, works of authorship and other intellectual property created by the Employee in the "
+        "course of employment shall be the exclusive property of the Company, and the Employee hereby assigns "
+        "all rights in them to the Company.",
+        "Each Founder assigns to the Company all intellectual property relating to the Company's business that "
+        "the Founder created before or during their association with the Company.",
+    ],
+    "equity_distribution": [
+        "The equity of the Company shall be held by the Founders as follows: Founder A, 50%; Founder B, 30%; "
+        "Founder C, 20%, in each case subject to the vesting schedule below.",
+    ],
+    "vesting_schedule": [
+        "Each Founder's shares shall vest over four (4) years, with twenty-five percent (25%) vesting after a "
+        "one (1) year cliff and the remainder vesting monthly thereafter. Unvested shares may be repurchased "
+        "by the Company at face value if the Founder leaves.",
+    ],
+    "investment_amount": [
+        "In exchange for the payment by the Investor of INR 50,00,000 (the \"Purchase Amount\") on the date of "
+        "this instrument, the Company issues to the Investor the right to certain shares of its capital.",
+    ],
+    "valuation_cap": [
+        "The \"Post-Money Valuation Cap\" is INR 40,00,00,000, and the Discount Rate is 80%.",
+    ],
+    "conversion_terms": [
+        "If there is an Equity Financing before this instrument terminates, it shall automatically convert into "
+        "the number of shares of Safe Preferred Stock equal to the Purchase Amount divided by the Conversion "
+        "Price, being the lower of the Safe Price and the Discount Price.",
+        "If there is a Liquidity Event before this instrument terminates, the Investor shall receive the greater "
+        "of the Purchase Amount and the amount payable on the number of shares equal to the Purchase Amount "
+        "divided by the Liquidity Price.",
+    ],
+    "governing_law": [
+        "This Agreement shall be governed by and construed in accordance with the laws of India, and the courts "
+        "at Bengaluru shall have exclusive jurisdiction.",
+    ],
+    "dispute_resolution": [
+        "Any dispute arising out of or in connection with this Agreement shall be referred to arbitration by a "
+        "sole arbitrator under the Arbitration and Conciliation Act, 1996. The seat of arbitration shall be "
+        "Mumbai and the language English.",
+    ],
+}
+
+
+# Labelled held-out clauses for calibrating the similarity thresholds (see
+# clause_index.py). Each is written independently of the approved wording
+# above: a clause is a positive pair with its own requirement and a negative
+# pair with every other one.
+CALIBRATION_CLAUSES: Dict[str, List[str]] = {
+    "confidential_information_definition": [
+        "For the purposes of this Agreement, confidential information covers any proprietary data, know-how, "
+        "source code, pricing and customer details that one party shares with the other in any form.",
+    ],
+    "obligations": [
+        "The Recipient will keep all information received from the Discloser secret, will use it only to "
+        "evaluate the proposed transaction and will not pass it on to anyone without prior written consent.",
+    ],
+    "term_duration": [
+        "The confidentiality obligations under this Agreement continue for a period of five (5) years from the "
+        "date of signing.",
+    ],
+    "return_of_materials": [
+        "When the discussions end, the Recipient must hand back or securely delete every copy of the "
+        "information it received and confirm the deletion in writing within fourteen days.",
+    ],
+    "remedies": [
+        "Because money damages would not adequately compensate a breach, the non-breaching party may obtain "
+        "an injunction or specific performance from any competent court.",
+    ],
+    "position_duties": [
+        "You are appointed as Marketing Manager and will lead the brand team, reporting to the Head of Sales, "
+        "with such responsibilities as the Company may reasonably assign from time to time.",
+    ],
+    "compensation": [
+        "Your fixed annual remuneration will be INR 18,00,000, paid monthly by bank transfer after statutory "
+        "deductions, and reviewed each April.",
+    ],
+    "term_termination": [
+        "Your employment may be ended by either side on sixty (60) days' notice in writing; the Company may "
+        "dismiss you without notice for serious misconduct.",
+    ],
+    "benefits": [
+        "You will be covered under the Company's group health policy and receive twenty-four days of annual "
+        "leave together with employer provident fund contributions.",
+    ],
+    "non_compete": [
+        "While engaged by the Company, the Employee will not work for or advise any competitor of the Company.",
+    ],
+    "intellectual_property": [
+        "Everything the Consultant creates under this engagement, including software, designs and documents, "
+        "belongs to the Client, and the Consultant transfers all copyright and patent rights in it to the Client.",
+    ],
+    "equity_distribution": [
+        "The founders will hold the share capital of the Company in the ratio 60:40 between Asha and Ravi.",
+    ],
+    "vesting_schedule": [
+        "Founder shares vest monthly over thirty-six months after a twelve month cliff; unvested shares of a "
+        "departing founder may be bought back by the Company at par value.",
+    ],
+    "investment_amount": [
+        "The Investor shall invest a sum of INR 1,00,00,000 in the Company on the date of signing this "
+        "instrument in return for the right to future equity.",
+    ],
+    "valuation_cap": [
+        "The valuation cap for conversion is INR 25 crore on a post-money basis.",
+    ],
+    "conversion_terms": [
+        "On the next priced equity round, the amount invested converts into preferred shares at the lower of "
+        "the capped price and the discounted round price.",
+    ],
+    "governing_law": [
+        "This contract is subject to Indian law, and any proceedings arising from it may be brought only "
+        "before the courts of New Delhi.",
+    ],
+    "dispute_resolution": [
+        "Disputes between the parties will first be negotiated in good faith for thirty days and then settled "
+        "by arbitration in Chennai under the Arbitration and Conciliation Act, 1996.",
+    ],
+}
+
+# Boilerplate that matches no requirement: a negative pair with every one
+UNRELATED_CLAUSES: List[str] = [
+    "This Agreement may be executed in any number of counterparts, each of which shall be deemed an original.",
+    "All notices under this Agreement shall be in writing and delivered by hand, courier or email to the "
+    "addresses set out above.",
+    "If any provision of this Agreement is held invalid, the remaining provisions shall continue in full force.",
+    "This Agreement constitutes the entire agreement between the parties and supersedes all prior "
+    "understandings relating to its subject matter.",
+    "No failure or delay in exercising any right under this Agreement shall operate as a waiver of that right.",
+    "Headings are for convenience only and do not affect the interpretation of this Agreement.",
+]
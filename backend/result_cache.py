@@ -0,0 +1,152 @@
+"""
+Result Cache
+Content-addressed cache of validation results (in-process LRU + optional SQLite)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ResultCache:
+    """
+    Caches validation results by a hash of the document text, document type,
+    model version and rules version, so a change to any of them is a miss.
+
+    The memory tier is an LRU bounded by `max_entries` and `ttl_seconds`.
+    If `sqlite_path` is given, results are also written to SQLite and
+    survive restarts; disk hits are promoted back into memory. Each write
+    to disk deletes expired rows and the oldest rows beyond `max_disk_entries`.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600,
+                 sqlite_path: Optional[str] = None, max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self.max_disk_entries = max_disk_entries
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if sqlite_path:
+            directory = os.path.dirname(os.path.abspath(sqlite_path))
+            os.makedirs(directory, exist_ok=True)
+            self._connect()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)")
+        self._db.commit()
+
+    def reset_after_fork(self):
+        """SQLite handles must not cross fork(); open a fresh one in the child"""
+        self._lock = threading.Lock()
+        if self.sqlite_path:
+            self._connect()
+
+    @staticmethod
+    def make_key(text: str, document_type: str, model_version: str, rules_version: str) -> str:
+        """Content address of one analysis"""
+        digest = hashlib.sha256()
+        for part in (model_version, rules_version, document_type):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached result, or None on a miss or expired entry"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created_at, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    created_at, payload = row
+                    if now - created_at <= self.ttl_seconds:
+                        value = json.loads(payload)
+                        self._remember(key, created_at, value)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict):
+        """Store a result in memory (and on disk if enabled)"""
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, created_at, value)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, created_at, payload) VALUES (?, ?, ?)",
+                    (key, created_at, json.dumps(value))
+                )
+                self._db.execute("DELETE FROM results WHERE created_at < ?", (created_at - self.ttl_seconds,))
+                # Oldest first; both deletes walk the created_at index
+                self._db.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_disk_entries": self.max_disk_entries if self._db is not None else None,
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "disk_enabled": self._db is not None
+            }
+
+    def _remember(self, key: str, created_at: float, value: Dict):
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,180 @@
+"""
+Rule Engine
+Finds every keyword and pattern rule in a single pass over a document
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from text_index import LineIndex
+
+
+class KeywordAutomaton:
+    """
+    Substring matcher over lowercase keywords (same semantics as
+    `keyword in text`) that records the first position of every keyword.
+
+    With the `pyahocorasick` C extension installed, all keywords are found
+    in one Aho-Corasick pass whose cost is linear in the text length and
+    independent of the number of keywords. Without it, each keyword is
+    located with `str.find`; that is still C-speed, but scales with the
+    number of keywords.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+
+        try:
+            import ahocorasick
+        except ImportError:
+            self._automaton = None
+            return
+
+        self._automaton = ahocorasick.Automaton()
+        for keyword in self.keywords:
+            self._automaton.add_word(keyword, keyword)
+        if self.keywords:
+            self._automaton.make_automaton()
+
+    @property
+    def is_native(self) -> bool:
+        return self._automaton is not None
+
+    def first_positions(self, text_lower: str) -> Dict[str, int]:
+        """Map each keyword found in `text_lower` to its first start offset"""
+        first: Dict[str, int] = {}
+        remaining = len(self.keywords)
+        if not remaining:
+            return first
+
+        if self._automaton is None:
+            for keyword in self.keywords:
+                position = text_lower.find(keyword)
+                if position >= 0:
+                    first[keyword] = position
+            return first
+
+        for end, keyword in self._automaton.iter(text_lower):
+            if keyword not in first:
+                first[keyword] = end - len(keyword) + 1
+                remaining -= 1
+                if not remaining:
+                    break
+
+        return first
+
+
+class RuleHits:
+    """
+    Keyword and pattern hits for one document, shared by all flaw detectors.
+    `rules` is the rule pack that produced them (see legal_rules.RulePack),
+    so the checks run against the same rule version as the scan.
+    """
+
+    __slots__ = ("text", "text_lower", "keyword_positions", "pattern_matches", "_line_index", "rules")
+
+    def __init__(self, text: str, text_lower: str, keyword_positions: Dict[str, int],
+                 pattern_matches: Dict[str, List[Tuple[int, int]]], line_index=None, rules=None):
+        self.text = text
+        self.text_lower = text_lower
+        self.keyword_positions = keyword_positions
+        self.pattern_matches = pattern_matches
+        self._line_index = line_index
+        self.rules = rules
+
+    @property
+    def line_index(self) -> LineIndex:
+        """
+        Line/section index of the text, built on first use. Anything with the
+        same `locate`/`describe`/`line_of` methods can be supplied instead,
+        e.g. to report positions of a chunk relative to the whole document.
+        """
+        if self._line_index is None:
+            self._line_index = LineIndex(self.text)
+        return self._line_index
+
+    def has(self, keyword: str) -> bool:
+        return keyword in self.keyword_positions
+
+    def has_any(self, keywords: Iterable[str]) -> bool:
+        return any(keyword in self.keyword_positions for keyword in keywords)
+
+    def first_position(self, keywords: Iterable[str]) -> Optional[int]:
+        """Earliest offset at which any of `keywords` occurs, or None"""
+        positions = [self.keyword_positions[k] for k in keywords if k in self.keyword_positions]
+        return min(positions) if positions else None
+
+    def matches(self, rule_id: str) -> List[Tuple[int, int]]:
+        """(start, end) spans of a pattern rule, in document order"""
+        return self.pattern_matches.get(rule_id, [])
+
+
+class RuleEngine:
+    """
+    Compiled keyword and regex rules, built once and reused for every document.
+
+    Keywords go into one keyword automaton; pattern rules are combined into
+    one regex, so the text is scanned once for keywords and once for
+    patterns: an alternation of all rules finds the offsets where any rule
+    matches, and there one zero-width lookahead per rule (a named group
+    each) reports every rule that matches. Patterns are written in lowercase
+    and run against the lowercased text, and may not use named groups.
+
+    Lookaheads consume nothing, so a match of one rule never hides an
+    overlapping match of another; each rule's matches are then filtered
+    exactly as its own `re.finditer` would (non-overlapping, leftmost first).
+    """
+
+    def __init__(self, keywords: Iterable[str], patterns: Dict[str, str]):
+        self.automaton = KeywordAutomaton(keywords)
+
+        self._group_to_rule: Dict[str, str] = {}
+        alternatives = []
+        for index, (rule_id, pattern) in enumerate(patterns.items()):
+            group = f"r{index}"
+            if re.compile(pattern).groupindex:  # Also fails fast on an invalid rule
+                raise ValueError(f"Pattern rule {rule_id} must not use named groups")
+            self._group_to_rule[group] = rule_id
+            alternatives.append((group, pattern))
+
+        self.pattern_ids = list(patterns)
+        self._combined = None
+        self._combined_ignorecase = None
+
+        if alternatives:
+            # Hoisting a shared leading word boundary means the rules are
+            # only attempted at word starts instead of at every character
+            prefix = r"\b" if all(pattern.startswith(r"\b") for _, pattern in alternatives) else ""
+            bodies = [(group, pattern[len(prefix):]) for group, pattern in alternatives]
+            any_rule = "(?=(?:" + "|".join(body for _, body in bodies) + "))"
+            lookaheads = "".join(f"(?:(?=(?P<{group}>{body})))?" for group, body in bodies)
+            combined = prefix + any_rule + lookaheads
+            self._combined = re.compile(combined)
+            self._combined_ignorecase = re.compile(combined, re.IGNORECASE)
+
+    def scan(self, text: str) -> RuleHits:
+        """Find all keyword and pattern hits in `text`"""
+        text_lower = text.lower()
+        keyword_positions = self.automaton.first_positions(text_lower)
+
+        pattern_matches: Dict[str, List[Tuple[int, int]]] = {rule_id: [] for rule_id in self.pattern_ids}
+        if self._combined is not None:
+            # Offsets must refer to `text`; lowercasing a few characters (e.g. 'İ')
+            # changes the length, in which case match the original case-insensitively
+            if len(text_lower) == len(text):
+                matches = self._combined.finditer(text_lower)
+            else:
+                matches = self._combined_ignorecase.finditer(text)
+
+            # Where the next match of each rule may start, as in re.finditer
+            resume = {group: 0 for group in self._group_to_rule}
+            for match in matches:
+                for group, rule_id in self._group_to_rule.items():
+                    start, end = match.span(group)
+                    if start < resume[group]:
+                        # No match here, or inside this rule's previous match
+                        continue
+                    pattern_matches[rule_id].append((start, end))
+                    resume[group] = end if end > start else end + 1
+
+        return RuleHits(text, text_lower, keyword_positions, pattern_matches)
@@ -0,0 +1,248 @@
+"""
+Shared Legal-BERT Encoder
+One encoder with lightweight document and clause classification heads
+"""
+
+import ctypes
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Sequence
+
+import torch
+from torch import nn
+from transformers import AutoConfig, AutoModel
+from transformers.modeling_outputs import SequenceClassifierOutput
+from safetensors.torch import load_file, save_file
+
+
+# Pseudo-head: mean-pooled, L2-normalized token states, for similarity search
+EMBEDDING = "embedding"
+
+HEADS_WEIGHTS_FILE = "heads.safetensors"
+HEADS_CONFIG_FILE = "heads_config.json"
+ENCODER_WEIGHTS_FILE = "model.safetensors"
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+def load_mmap_state_dict(path: str) -> Dict[str, torch.Tensor]:
+    """
+    Tensors of a safetensors file, backed by a private memory map instead
+    of copies. Pages come from the OS page cache, so every process mapping
+    the same file (forked or not) shares one physical copy until written.
+    """
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_size
+    state = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        if end == start:
+            state[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        itemsize = torch.empty((), dtype=dtype).element_size()
+        state[name] = torch.frombuffer(
+            buffer, dtype=dtype, count=(end - start) // itemsize, offset=data_start + start
+        ).reshape(info["shape"])
+    return state
+
+
+def _release_freed_memory():
+    """Return freed heap pages to the OS (glibc only; no-op elsewhere)"""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _mmap_encoder(path: str) -> Optional[nn.Module]:
+    """Build the encoder with weights memory-mapped from `path`, or None if the file doesn't cover it"""
+    weights_path = os.path.join(path, ENCODER_WEIGHTS_FILE)
+    if not os.path.isfile(weights_path):
+        return None
+
+    encoder = AutoModel.from_config(AutoConfig.from_pretrained(path))
+    expected = set(encoder.state_dict())
+    prefix = f"{encoder.base_model_prefix}."
+
+    state = {}
+    for key, tensor in load_mmap_state_dict(weights_path).items():
+        if key not in expected and key.startswith(prefix):
+            key = key[len(prefix):]
+        if key in expected:
+            state[key] = tensor
+
+    # state_dict() omits non-persistent buffers (e.g. position ids); those keep their initial values
+    if expected - set(state):
+        return None
+
+    encoder.load_state_dict(state, assign=True)
+    _release_freed_memory()
+    return encoder.eval()
+
+
+class SharedEncoderClassifier(nn.Module):
+    """
+    Legal-BERT encoder shared by two classification heads.
+
+    Both heads read the same pooled representation, so a batch is encoded
+    once no matter how many heads are evaluated.
+    """
+
+    HEAD_NAMES = ("doc", "clause")
+
+    def __init__(self, encoder: nn.Module, num_doc_labels: int, num_clause_labels: int,
+                 dropout: Optional[float] = None):
+        super().__init__()
+        self.encoder = encoder
+        self.config = encoder.config
+
+        hidden_size = encoder.config.hidden_size
+        if dropout is None:
+            dropout = getattr(encoder.config, "hidden_dropout_prob", 0.1)
+
+        self.dropout = nn.Dropout(dropout)
+        self.doc_head = nn.Linear(hidden_size, num_doc_labels)
+        self.clause_head = nn.Linear(hidden_size, num_clause_labels)
+
+        for head in (self.doc_head, self.clause_head):
+            nn.init.normal_(head.weight, std=getattr(encoder.config, "initializer_range", 0.02))
+            nn.init.zeros_(head.bias)
+
+        # Heads whose weights came from fine-tuning rather than random init
+        self.trained_heads = set()
+
+    @classmethod
+    def from_pretrained(cls, path: str, num_doc_labels: int = 2, num_clause_labels: int = 2,
+                        mmap_weights: bool = False) -> "SharedEncoderClassifier":
+        """
+        Load an encoder, plus trained heads if `path` is a saved artifact.
+        With `mmap_weights`, encoder weights in a local safetensors file are
+        memory-mapped rather than copied into the process (see
+        `load_mmap_state_dict`); otherwise, or if that isn't possible, they
+        are loaded normally.
+        """
+        encoder = _mmap_encoder(path) if mmap_weights and os.path.isdir(path) else None
+        if encoder is None:
+            encoder = AutoModel.from_pretrained(path)
+
+        config_path = os.path.join(path, HEADS_CONFIG_FILE)
+        if os.path.isfile(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                heads_config = json.load(f)
+            num_doc_labels = heads_config["num_doc_labels"]
+            num_clause_labels = heads_config["num_clause_labels"]
+        else:
+            heads_config = {}
+
+        model = cls(encoder, num_doc_labels, num_clause_labels)
+
+        weights_path = os.path.join(path, HEADS_WEIGHTS_FILE)
+        if os.path.isfile(weights_path):
+            model.load_heads(load_file(weights_path))
+            # Artifacts saved before clause training only ever fine-tuned the document head
+            model.trained_heads = set(heads_config.get("trained_heads", ["doc"]))
+
+        return model
+
+    def save_pretrained(self, path: str):
+        """Save encoder weights and head weights side by side"""
+        os.makedirs(path, exist_ok=True)
+        self.encoder.save_pretrained(path)
+
+        heads = {
+            f"{name}.{key}": tensor.detach().cpu().contiguous()
+            for name in ("doc_head", "clause_head")
+            for key, tensor in getattr(self, name).state_dict().items()
+        }
+        save_file(heads, os.path.join(path, HEADS_WEIGHTS_FILE))
+
+        with open(os.path.join(path, HEADS_CONFIG_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "num_doc_labels": self.doc_head.out_features,
+                "num_clause_labels": self.clause_head.out_features,
+                "trained_heads": sorted(self.trained_heads),
+            }, f, indent=2)
+
+    def load_heads(self, state: Dict[str, torch.Tensor]):
+        """Load head weights saved by `save_pretrained`"""
+        for name in ("doc_head", "clause_head"):
+            prefix = f"{name}."
+            getattr(self, name).load_state_dict({
+                key[len(prefix):]: tensor for key, tensor in state.items() if key.startswith(prefix)
+            })
+
+    @staticmethod
+    def _pooled(outputs) -> torch.Tensor:
+        pooled = getattr(outputs, "pooler_output", None)
+        if pooled is None:
+            pooled = outputs.last_hidden_state[:, 0]
+        return pooled
+
+    @staticmethod
+    def mean_embedding(hidden_states: torch.Tensor, attention_mask: Optional[torch.Tensor]) -> torch.Tensor:
+        """Unit-length mean of the non-padding token states"""
+        if attention_mask is None:
+            summed, counts = hidden_states.sum(dim=1), hidden_states.new_full((hidden_states.shape[0], 1),
+                                                                              hidden_states.shape[1])
+        else:
+            mask = attention_mask.unsqueeze(-1).to(hidden_states.dtype)
+            summed, counts = (hidden_states * mask).sum(dim=1), mask.sum(dim=1).clamp(min=1)
+        return nn.functional.normalize(summed / counts, dim=1)
+
+    def heads(self, pooled: torch.Tensor, names: Sequence[str] = HEAD_NAMES) -> Dict[str, torch.Tensor]:
+        """Run the requested heads over an already-encoded batch"""
+        pooled = self.dropout(pooled)
+        return {name: getattr(self, f"{name}_head")(pooled) for name in names}
+
+    def classify(self, input_ids, attention_mask=None, token_type_ids=None,
+                 names: Sequence[str] = HEAD_NAMES) -> Dict[str, torch.Tensor]:
+        """
+        Encode once and return logits for every requested head, plus the
+        clause embedding if `EMBEDDING` is among `names`
+        """
+        outputs = self.encoder(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids,
+        )
+        results = self.heads(self._pooled(outputs), [name for name in names if name != EMBEDDING])
+        if EMBEDDING in names:
+            results[EMBEDDING] = self.mean_embedding(outputs.last_hidden_state, attention_mask)
+        return results
+
+    def forward(self, input_ids=None, attention_mask=None, token_type_ids=None,
+                labels=None, head: str = "doc") -> SequenceClassifierOutput:
+        """Single-head forward pass (used by `Trainer`)"""
+        logits = self.classify(input_ids, attention_mask, token_type_ids, names=(head,))[head]
+
+        loss = None
+        if labels is not None:
+            loss = nn.functional.cross_entropy(logits, labels)
+
+        return SequenceClassifierOutput(loss=loss, logits=logits)
+
+
+class HeadAdapter(nn.Module):
+    """One head of a SharedEncoderClassifier as a single-task model, for `Trainer`"""
+
+    def __init__(self, model: SharedEncoderClassifier, head: str):
+        super().__init__()
+        self.model = model
+        self.head = head
+
+    def forward(self, input_ids=None, attention_mask=None, token_type_ids=None,
+                labels=None) -> SequenceClassifierOutput:
+        return self.model(input_ids, attention_mask, token_type_ids, labels=labels, head=self.head)
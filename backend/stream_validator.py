@@ -0,0 +1,399 @@
+"""
+Streaming Validator
+Validates very large text documents chunk by chunk, holding about two chunks of text at a time
+"""
+
+import codecs
+import io
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import torch
+
+from clause_segmenter import last_boundary, segment_clauses
+from flaw_set import FlawSet, LegalFlaw
+from legal_validator import TOP_WINDOWS, LegalDocumentValidator
+from metrics import StageTimer
+from rule_engine import RuleHits
+from text_index import LineIndex
+
+
+# Characters read per chunk, and characters of each chunk carried into the
+# next one so matches that cross a boundary are still found
+CHUNK_CHARS = 1024 * 1024
+OVERLAP_CHARS = 4096
+
+
+TextSource = Union[str, os.PathLike, io.IOBase, Iterable[Union[str, bytes]]]
+
+
+class _ChunkIndex:
+    """
+    LineIndex of one chunk that reports lines, columns and sections as they
+    are in the whole document
+    """
+
+    def __init__(self, text: str, base_line: int, base_column: int, base_section: Optional[str]):
+        self.index = LineIndex(text)
+        self.base_line = base_line
+        self.base_column = base_column
+        self.base_section = base_section
+
+    def line_of(self, position: int) -> int:
+        return self.base_line + self.index.line_of(position) - 1
+
+    def locate(self, position: int) -> Tuple[int, int, Optional[str]]:
+        local_line = self.index.line_of(position)
+        column = self.index.column_of(position)
+        if local_line == 1:
+            # The chunk may start mid-line
+            column += self.base_column - 1
+        section = self.index.section_of(position) or self.base_section
+        return self.base_line + local_line - 1, column, section
+
+    def describe(self, position: int) -> str:
+        line, _, section = self.locate(position)
+        return f"Line {line} ({section})" if section else f"Line {line}"
+
+
+class _KnownPositions:
+    """Locations recorded when keywords were first seen, for checks that run after their chunk is gone"""
+
+    def __init__(self):
+        self.locations: Dict[int, Tuple[int, int, Optional[str]]] = {}
+
+    def line_of(self, position: int) -> int:
+        return self.locations[position][0]
+
+    def locate(self, position: int) -> Tuple[int, int, Optional[str]]:
+        return self.locations[position]
+
+    def describe(self, position: int) -> str:
+        line, _, section = self.locate(position)
+        return f"Line {line} ({section})" if section else f"Line {line}"
+
+
+def _uncut(owned: int, span_lists: Iterable[List[Tuple[int, int]]]) -> int:
+    """
+    Move the cut back to the start of any pattern match crossing it, so the
+    match is carried whole into the next window instead of being counted
+    here and found again, truncated, there. A match that starts the window
+    stays owned (the window cannot shrink to nothing).
+    """
+    moved = True
+    while moved:
+        moved = False
+        for spans in span_lists:
+            for start, end in spans:
+                if 0 < start < owned < end:
+                    owned, moved = start, True
+    return owned
+
+
+def iter_text(source: TextSource, chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """
+    Yield the text of a file path, file object or iterable of str/bytes
+    pieces in chunks of about `chunk_chars`. Files are decoded as UTF-8
+    with universal newlines, like `read_file_content` does for .txt.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", errors="replace") as f:
+            yield from iter_text(f, chunk_chars)
+        return
+
+    if hasattr(source, "read"):
+        if isinstance(source, io.TextIOBase):
+            yield from iter(lambda: source.read(chunk_chars), "")
+            return
+
+        wrapper = io.TextIOWrapper(source, encoding="utf-8", errors="replace")
+        try:
+            yield from iter(lambda: wrapper.read(chunk_chars), "")
+        finally:
+            # Leave the caller's binary stream open
+            wrapper.detach()
+        return
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffered: List[str] = []
+    size = 0
+    for piece in source:
+        if isinstance(piece, bytes):
+            piece = decoder.decode(piece)
+        buffered.append(piece)
+        size += len(piece)
+        if size >= chunk_chars:
+            yield "".join(buffered)
+            buffered, size = [], 0
+
+    buffered.append(decoder.decode(b"", final=True))
+    tail = "".join(buffered)
+    if tail:
+        yield tail
+
+
+class StreamingValidation:
+    """
+    One streaming validation run. Text is fed in chunks; each chunk is
+    joined to the carried-over end of the previous one and scanned once
+    (one lowercase view), and flaws are yielded as soon as they are found:
+    rule flaws before the chunk's model pass, clause flaws right after it.
+
+    Each scan window "owns" the text up to a cut point near its end. Pattern
+    and clause results are only taken from the owned part, and the rest is
+    carried into the next window, so a match crossing a chunk boundary is
+    found whole and counted once. The state kept between chunks holds the
+    first position of each keyword and the count and first match of each
+    pattern rule. It also holds a running sum of document-head logits and
+    the top windows. None of that grows with the document. What does grow
+    are the clause-head flaws, kept for the final report (which, like
+    `validate_document`'s, lists every one): peak memory is about two chunks
+    plus the model plus a few hundred bytes per clause flaw found.
+    """
+
+    def __init__(self, validator: LegalDocumentValidator, document_type: str = "GENERAL",
+                 chunk_chars: int = CHUNK_CHARS, overlap_chars: int = OVERLAP_CHARS):
+        if chunk_chars <= 2 * overlap_chars:
+            raise ValueError("chunk_chars must be more than twice overlap_chars")
+
+        self.validator = validator
+        self.document_type = document_type
+        self.chunk_chars = chunk_chars
+        self.overlap_chars = overlap_chars
+        self.timer = StageTimer()
+        # One rule pack for the whole run, even if the file is reloaded meanwhile
+        self.rules = validator.rules
+
+        self.carry = ""
+        self.offset = 0  # Document offset of the carried text
+        self.line, self.column, self.section = 1, 1, None
+        self.chunks = 0
+
+        self.keyword_positions: Dict[str, int] = {}
+        self.known_positions = _KnownPositions()
+        self.pattern_counts: Dict[str, int] = {}
+        self.pattern_flaws: Dict[str, LegalFlaw] = {}
+        self.other_flaws: List[LegalFlaw] = []
+        self.section_27_reported = False
+
+        self.logit_sum = None
+        self.windows = 0
+        self.top_windows: List[Dict] = []
+        self.worst_probs = None
+        self.clauses = 0
+        self.reference_matches: Dict[str, Dict] = {}
+        self.report: Optional[Dict] = None
+
+    def feed(self, text: str) -> Iterator[Dict]:
+        """Add the next piece of the document, yielding the flaws it reveals (consume fully)"""
+        # Slice large pieces so no scan window exceeds chunk_chars plus the carry
+        for start in range(0, len(text), self.chunk_chars):
+            self.carry += text[start:start + self.chunk_chars]
+            while len(self.carry) >= self.chunk_chars:
+                yield from self._process(final=False)
+
+    def finish(self) -> Iterator[Dict]:
+        """Process the remaining text and yield the last flaws; the final report is then in `self.report`"""
+        yield from self._process(final=True)
+        document_length = self.offset
+
+        hits = RuleHits("", "", self.keyword_positions, {}, line_index=self.known_positions, rules=self.rules)
+        with self.timer.stage("structural_rules"):
+            structural = self.validator._check_structural_requirements("", self.document_type, hits)
+        with self.timer.stage("semantic_rules"):
+            brevity = self.validator._brevity_flaws(document_length)
+        for flaw in structural + brevity:
+            yield flaw.to_dict()
+
+        references = None
+        reference_flaws: List[LegalFlaw] = []
+        if self.validator.reference_index is not None:
+            with self.timer.stage("reference_clauses"):
+                reference_flaws, references = self.validator._reference_flaws(
+                    self.document_type, self.reference_matches, hits
+                )
+            for flaw in reference_flaws:
+                yield flaw.to_dict()
+
+        # Pattern flaws were reported at their first match; the final report has the total count
+        pattern_flaws = [
+            flaw.replace(description=f"{self.rules.pattern_info[rule_id]['description']} "
+                                      f"({self.pattern_counts[rule_id]} instance(s))")
+            for rule_id, flaw in self.pattern_flaws.items()
+        ]
+
+        with self.timer.stage("deduplication"):
+            all_flaws = structural + pattern_flaws + self.other_flaws + reference_flaws + brevity
+            unique_flaws = FlawSet(all_flaws)
+
+        with self.timer.stage("assemble_report"):
+            is_valid, confidence = self._verdict()
+            report = {
+                "is_valid": is_valid,
+                "confidence": confidence,
+                **unique_flaws.summary(),
+                "windows_analyzed": self.windows,
+                "top_windows": self.top_windows,
+                "clauses_analyzed": self.clauses,
+                "characters": document_length,
+                "chunks": self.chunks
+            }
+            if references is not None:
+                report["reference_clauses"] = references
+
+        report["timings"] = self.timer.as_ms()
+        self.report = report
+
+    def _process(self, final: bool) -> Iterator[Dict]:
+        window = self.carry
+        if not window:
+            return
+
+        with self.timer.stage("rule_scan"):
+            scanned = self.rules.engine.scan(window)
+
+            # Own up to the last clause heading (else line break) before the
+            # overlap, so the carried text is at least `overlap_chars` long and
+            # clauses are not split between windows
+            if final:
+                owned = len(window)
+            else:
+                limit = len(window) - self.overlap_chars
+                owned = last_boundary(window, len(window) // 2, limit)
+                if not owned:
+                    newline = window.rfind("\n", limit - self.overlap_chars, limit)
+                    owned = newline + 1 if newline >= 0 else limit
+                owned = _uncut(owned, scanned.pattern_matches.values())
+
+            index = _ChunkIndex(window, self.line, self.column, self.section)
+            hits = RuleHits(window, scanned.text_lower, scanned.keyword_positions, {
+                rule_id: [span for span in spans if span[0] < owned]
+                for rule_id, spans in scanned.pattern_matches.items()
+            }, line_index=index, rules=self.rules)
+
+        found = []
+
+        with self.timer.stage("pattern_rules"):
+            new_rules = {}
+            for rule_id, spans in hits.pattern_matches.items():
+                if spans:
+                    self.pattern_counts[rule_id] = self.pattern_counts.get(rule_id, 0) + len(spans)
+                    if rule_id not in self.pattern_flaws:
+                        new_rules[rule_id] = spans
+            if new_rules:
+                first_hits = RuleHits(window, "", {}, new_rules, line_index=index, rules=self.rules)
+                for flaw in self.validator._detect_pattern_flaws(window, first_hits):
+                    self.pattern_flaws[flaw.flaw_type] = flaw
+                    found.append(flaw.to_dict())
+
+            for keyword, position in hits.keyword_positions.items():
+                if position < owned and keyword not in self.keyword_positions:
+                    self.keyword_positions[keyword] = self.offset + position
+                    self.known_positions.locations[self.offset + position] = index.locate(position)
+
+        with self.timer.stage("semantic_rules"):
+            if not self.section_27_reported:
+                known = RuleHits("", "", self.keyword_positions, {},
+                                 line_index=self.known_positions, rules=self.rules)
+                for flaw in self.validator._section_27_flaws(known):
+                    self.section_27_reported = True
+                    self.other_flaws.append(flaw)
+                    found.append(flaw.to_dict())
+
+        # Rule flaws go out before the (much slower) model pass over the chunk
+        yield from found
+        yield from self._run_models(window[:owned], hits)
+
+        # Carry the unowned tail into the next window
+        self.line, self.column, self.section = index.locate(owned)
+        self.offset += owned
+        self.carry = window[owned:]
+        self.chunks += 1
+
+    def _run_models(self, text: str, hits: RuleHits) -> Iterator[Dict]:
+        validator = self.validator
+        if not text.strip():
+            return
+
+        # Truncated mode only ever looks at the first window of the document
+        if validator.chunked or self.windows == 0:
+            with self.timer.stage("classify_document"):
+                logits, spans, _ = validator._window_logits([text])
+                self._add_windows(text, logits, spans)
+
+        if validator.clause_outputs:
+            with self.timer.stage("segment_clauses"):
+                clauses = segment_clauses(text)
+            with self.timer.stage("classify_clauses"):
+                results = validator._classify_clauses([clauses])[0]
+            with self.timer.stage("clause_flaws"):
+                for flaw in validator._clause_flaws(results, hits):
+                    flaw.char_start += self.offset
+                    flaw.char_end += self.offset
+                    self.other_flaws.append(flaw)
+                    yield flaw.to_dict()
+            if validator.reference_index is not None:
+                # Keep the closest clause per requirement across chunks; flaws are decided at the end
+                with self.timer.stage("reference_clauses"):
+                    for requirement, match in validator._reference_matches(results, hits, self.offset).items():
+                        best = self.reference_matches.get(requirement)
+                        if best is None or match["similarity"] > best["similarity"]:
+                            self.reference_matches[requirement] = match
+            self.clauses += len(clauses)
+
+    def _add_windows(self, text: str, logits: torch.Tensor, spans: List[Tuple[int, int]]):
+        """Fold one chunk's window logits into the running aggregate and top windows"""
+        logits = logits.double()
+        self.logit_sum = logits.sum(dim=0) if self.logit_sum is None else self.logit_sum + logits.sum(dim=0)
+
+        probs = torch.softmax(logits, dim=1)
+        candidates = list(self.top_windows)
+        for rank in torch.argsort(probs[:, 1], descending=True)[:TOP_WINDOWS].tolist():
+            char_start, char_end = spans[rank]
+            candidates.append({
+                "window": self.windows + rank,
+                "char_start": self.offset + char_start,
+                "char_end": self.offset + char_end,
+                "invalid_probability": float(probs[rank, 1]),
+                "preview": text[char_start:char_start + 120].strip(),
+                "line": self.line + text.count("\n", 0, char_start)
+            })
+            if self.worst_probs is None or float(probs[rank, 1]) > float(self.worst_probs[1]):
+                self.worst_probs = probs[rank]
+
+        candidates.sort(key=lambda window: window["invalid_probability"], reverse=True)
+        self.top_windows = candidates[:TOP_WINDOWS]
+        self.windows += len(spans)
+
+    def _verdict(self) -> Tuple[bool, float]:
+        if self.logit_sum is None:
+            return False, 0.0
+
+        if self.validator.window_aggregation == "max":
+            probs = self.worst_probs
+        else:
+            probs = torch.softmax(self.logit_sum / self.windows, dim=0)
+
+        prediction = int(torch.argmax(probs))
+        return prediction == 0, float(probs[prediction])
+
+
+def validate_stream(validator: LegalDocumentValidator, source: TextSource,
+                    document_type: str = "GENERAL", chunk_chars: int = CHUNK_CHARS,
+                    overlap_chars: int = OVERLAP_CHARS) -> Iterator[Dict]:
+    """
+    Validate a document from a path, file object or iterable of text pieces
+    without loading it whole. Yields `{"event": "flaw", "flaw": ...}` as each
+    flaw is found, `{"event": "progress", ...}` after each chunk, and a final
+    `{"event": "report", "report": ...}` shaped like `validate_document`'s.
+    """
+    run = StreamingValidation(validator, document_type, chunk_chars, overlap_chars)
+
+    for piece in iter_text(source, chunk_chars):
+        for flaw in run.feed(piece):
+            yield {"event": "flaw", "flaw": flaw}
+        yield {"event": "progress", "characters": run.offset, "chunks": run.chunks}
+
+    for flaw in run.finish():
+        yield {"event": "flaw", "flaw": flaw}
+    yield {"event": "report", "report": run.report}
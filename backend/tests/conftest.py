@@ -0,0 +1,44 @@
+"""
+Test configuration
+Backend modules are flat files imported by name, so the backend directory goes on sys.path
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CONTRACT = os.path.join(BACKEND_DIR, "..", "sample_contract.txt")
+
+sys.path.insert(0, BACKEND_DIR)
+# Importing app.py must not start loading the configured model
+os.environ["VALIDATOR_LOAD"] = "lazy"
+
+
+@pytest.fixture(scope="session")
+def sample_contract():
+    with open(SAMPLE_CONTRACT, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def stub_validator(tmp_path_factory, sample_contract):
+    """
+    A LegalDocumentValidator on a tiny random BERT (benchmarks/stub_model.py):
+    real tokenization, windowing and rules, no download. Needs torch and transformers.
+    """
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+    from stub_model import build_stub_model
+
+    import legal_validator
+    from model_store import ModelArtifactStore
+
+    stub_dir = build_stub_model(str(tmp_path_factory.mktemp("stub-model")), hidden_size=32, layers=1,
+                                vocab_source=sample_contract)
+    store = ModelArtifactStore(str(tmp_path_factory.mktemp("model-store")))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(legal_validator, "BASE_MODEL", stub_dir)
+        yield legal_validator.LegalDocumentValidator(use_gpu=False, store=store, reference_matching=False)
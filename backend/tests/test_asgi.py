@@ -0,0 +1,78 @@
+"""
+ASGI app tests
+Upload size limits, driven through the raw ASGI interface
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("a2wsgi")
+
+import asgi  # noqa: E402
+
+BOUNDARY = "limit-test"
+
+
+def multipart(field, filename, content):
+    return (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: text/plain\r\n\r\n").encode("utf-8") + content + f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+
+def post(path, body, headers=(), piece=64 * 1024):
+    """Send `body` in pieces, without Content-Length unless given; return (status, body)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())] + list(headers),
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 5000),
+    }
+    pieces = [body[start:start + piece] for start in range(0, len(body), piece)] or [b""]
+    messages = [{"type": "http.request", "body": data, "more_body": index < len(pieces) - 1}
+                for index, data in enumerate(pieces)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    return status, b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+
+@pytest.fixture
+def limit(monkeypatch):
+    monkeypatch.setitem(asgi.config, "MAX_CONTENT_LENGTH", 256 * 1024)
+    return 256 * 1024
+
+
+@pytest.mark.parametrize("path", ["/analyze", "/analyze/batch"])
+def test_chunked_body_over_limit_is_rejected(limit, path):
+    status, body = post(path, multipart("file", "big.txt", b"x" * (limit + 1)))
+
+    assert status == 413
+    assert b"File too large" in body
+
+
+def test_understated_content_length_is_rejected(limit):
+    body = multipart("file", "big.txt", b"x" * (limit + 1))
+    status, _ = post("/analyze", body, headers=[(b"content-length", b"100")])
+
+    assert status == 413
+
+
+def test_declared_content_length_over_limit_is_rejected(limit):
+    status, _ = post("/analyze", b"", headers=[(b"content-length", str(limit + 1).encode())])
+
+    assert status == 413
+
+
+def test_body_under_limit_is_parsed(limit):
+    status, body = post("/analyze", multipart("other", "small.txt", b"x" * 1000))
+
+    assert status == 400
+    assert b"No file provided" in body
@@ -0,0 +1,57 @@
+"""
+Benchmark Suite tests
+Synthetic contracts are reproducible, and a run is compared against a baseline
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import suite  # noqa: E402
+from synthetic import DOCUMENT_TYPES, format_size, generate_contract, generate_corpus, parse_size  # noqa: E402
+
+
+def test_parse_and_format_sizes():
+    assert parse_size("1KB") == 1024
+    assert parse_size(" 5mb ") == 5 * 1024 * 1024
+    assert parse_size("1.5KB") == 1536
+    assert parse_size("300") == 300
+    with pytest.raises(ValueError):
+        parse_size("5GB")
+
+    assert [format_size(size) for size in (1024, 5 * 1024 * 1024, 1536, 300)] == ["1KB", "5MB", "1536B", "300B"]
+
+
+def test_generated_contracts_are_reproducible():
+    first = generate_contract("NDA", 16 * 1024)
+
+    assert first == generate_contract("NDA", 16 * 1024)
+    assert first != generate_contract("NDA", 16 * 1024, seed=1)
+    assert 16 * 1024 - 4 <= len(first.encode("utf-8")) <= 16 * 1024
+    assert "NON-DISCLOSURE" in first.upper()
+    with pytest.raises(ValueError):
+        generate_contract("LEASE", 1024)
+
+
+def test_corpus_covers_every_size_and_type():
+    corpus = generate_corpus([1024, 4096])
+
+    assert [(entry["size_label"], entry["document_type"]) for entry in corpus] == [
+        (label, document_type) for label in ("1KB", "4KB") for document_type in DOCUMENT_TYPES
+    ]
+
+
+def test_compare_reports_regressions_past_the_tolerance(tmp_path):
+    def entry(target, median_ms):
+        return {"target": target, "size_label": "1KB", "document_type": "NDA", "median_ms": median_ms}
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": [entry("validator", 10.0), entry("analyze", 10.0)]}))
+
+    results = [entry("validator", 12.0), entry("analyze", 13.0), entry("stream", 99.0)]
+
+    assert suite.compare(results, str(baseline), tolerance=0.25) == [("analyze", "1KB", "NDA")]
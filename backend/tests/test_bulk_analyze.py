@@ -0,0 +1,106 @@
+"""
+Bulk Analysis tests
+Directory and ZIP inputs, and a results file that doubles as a resumable checkpoint
+"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+import bulk_analyze
+
+
+@pytest.fixture
+def contracts(tmp_path, sample_contract):
+    folder = tmp_path / "contracts"
+    (folder / "nested").mkdir(parents=True)
+    (folder / "a.txt").write_text(sample_contract, encoding="utf-8")
+    (folder / "nested" / "b.txt").write_text(sample_contract[:3000], encoding="utf-8")
+    (folder / "empty.txt").write_text("   ", encoding="utf-8")
+    (folder / "notes.md").write_text("not a contract", encoding="utf-8")
+    return folder
+
+
+@pytest.fixture
+def run(stub_validator, monkeypatch, tmp_path):
+    monkeypatch.setattr(bulk_analyze, "_load_validator", lambda model_version: stub_validator)
+    output = str(tmp_path / "results.jsonl")
+
+    def run(source, **options):
+        return bulk_analyze.run(str(source), output, workers=1, batch_size=2, document_type="NDA", **options)
+
+    run.output = output
+    return run
+
+
+def read_records(output):
+    with open(output, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_list_documents_from_directory_and_zip(contracts, tmp_path):
+    archive = tmp_path / "contracts.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name in ("a.txt", "nested/b.txt", "notes.md"):
+            zf.write(contracts / name, name)
+
+    from_folder = bulk_analyze.list_documents(str(contracts), max_bytes=3000)
+    from_zip = bulk_analyze.list_documents(str(archive), max_bytes=3000)
+
+    assert [(name, error) for name, _, error in from_folder] == [
+        ("a.txt", "File too large"), ("empty.txt", None), ("nested/b.txt", None)
+    ]
+    assert [(name, error) for name, _, error in from_zip] == [("a.txt", "File too large"), ("nested/b.txt", None)]
+    with pytest.raises(ValueError):
+        bulk_analyze.list_documents(str(contracts / "a.txt"), max_bytes=3000)
+
+
+def test_load_checkpoint_drops_a_cut_off_line(tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text(
+        json.dumps({"file": "a.txt", "fingerprint": "1", "success": True}) + "\n"
+        + json.dumps({"file": "b.txt", "fingerprint": "2", "success": False}) + "\n"
+        + '{"file": "c.t', encoding="utf-8"
+    )
+
+    assert bulk_analyze.load_checkpoint(str(output)) == {"a.txt": "1", "b.txt": "2"}
+    assert output.read_text(encoding="utf-8").endswith("}\n")
+    assert bulk_analyze.load_checkpoint(str(output), retry_failed=True) == {"a.txt": "1"}
+
+
+def test_run_writes_one_record_per_file(contracts, run):
+    progress = run(contracts)
+
+    records = {record["file"]: record for record in read_records(run.output)}
+    assert set(records) == {"a.txt", "empty.txt", "nested/b.txt"}
+    assert records["empty.txt"] == {
+        "file": "empty.txt", "fingerprint": records["empty.txt"]["fingerprint"],
+        "success": False, "error": "Could not read file content"
+    }
+    assert records["a.txt"]["success"] and records["a.txt"]["document_type"] == "NDA"
+    assert records["a.txt"]["validation"]["total_flaws"] > 0
+    assert (progress.done, progress.failed) == (3, 1)
+
+
+def test_rerun_resumes_and_reanalyzes_changed_files(contracts, run, sample_contract):
+    run(contracts)
+
+    assert run(contracts).total == 0
+
+    (contracts / "nested" / "b.txt").write_text(sample_contract[:2000], encoding="utf-8")
+    os.utime(contracts / "nested" / "b.txt", ns=(1, 1))
+    progress = run(contracts)
+    assert progress.total == 1
+    assert [record["file"] for record in read_records(run.output)].count("nested/b.txt") == 2
+
+    assert run(contracts, retry_failed=True).total == 1
+
+
+def test_restart_discards_earlier_results(contracts, run):
+    run(contracts)
+
+    run(contracts, resume=False)
+
+    assert len(read_records(run.output)) == 3
@@ -0,0 +1,115 @@
+"""
+Clause Cache tests
+Per-clause reuse and revision diffs for /analyze/revision
+"""
+
+import io
+import json
+
+import pytest
+
+from clause_cache import ClauseCache
+
+
+def test_lru_evicts_oldest_clause():
+    cache = ClauseCache(max_entries=2)
+    keys = [ClauseCache.clause_key(text, "tag") for text in ("a", "b", "c")]
+
+    cache.put(keys[0], {"clause": "a"})
+    cache.put(keys[1], {"clause": "b"})
+    assert cache.get_many([keys[0]]) == [{"clause": "a"}]
+    cache.put(keys[2], {"clause": "c"})
+
+    assert cache.get_many(keys) == [{"clause": "a"}, None, {"clause": "c"}]
+    stats = cache.stats()
+    assert stats["clauses"] == 2
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_keys_depend_on_text_and_tag():
+    assert ClauseCache.clause_key("text", "model-a") == ClauseCache.clause_key("text", "model-a")
+    assert ClauseCache.clause_key("text", "model-a") != ClauseCache.clause_key("text", "model-b")
+    assert ClauseCache.clause_key("text", "model-a") != ClauseCache.clause_key("text.", "model-a")
+    assert len(ClauseCache.revision_id("draft")) == 16
+
+
+def test_revisions_are_bounded():
+    cache = ClauseCache(max_revisions=2)
+    for name in ("one", "two", "three"):
+        cache.remember_revision(name, [name])
+
+    assert cache.revision("one") is None
+    assert cache.revision("three") == ["three"]
+    cache.clear()
+    assert cache.stats()["revisions"] == 0
+
+
+EDITED_FROM = "1.3 All shares shall be issued"
+EDITED_TO = "1.3 All shares shall be allotted"
+
+
+@pytest.fixture
+def client(stub_validator, monkeypatch):
+    import app as flask_backend
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    stub_validator.clause_cache.clear()
+    return flask_backend.app.test_client()
+
+
+def post_revision(client, text, **fields):
+    data = {"file": (io.BytesIO(text.encode("utf-8")), "draft.txt"), "document_type": "FOUNDER_AGREEMENT"}
+    for name, value in fields.items():
+        data[name] = (io.BytesIO(value.encode("utf-8")), "previous.txt") if name == "previous" else value
+    response = client.post("/analyze/revision", data=data, content_type="multipart/form-data")
+    assert response.status_code == 200
+    return json.loads(response.data)["validation"]
+
+
+def test_revision_reanalyzes_only_edited_clauses(client, stub_validator, sample_contract):
+    assert EDITED_FROM in sample_contract
+    draft = sample_contract.replace(EDITED_FROM, EDITED_TO)
+
+    first = post_revision(client, sample_contract)["revision"]
+    assert first["previous_found"] is False
+    assert first["clauses_reanalyzed"] == first["clauses_total"] > 1
+    assert first["clauses_changed"] is None
+
+    second = post_revision(client, draft, previous_id=first["id"])["revision"]
+    assert second["previous_found"] is True
+    assert (second["clauses_changed"], second["clauses_removed"]) == (1, 1)
+    assert second["clauses_reanalyzed"] == 1
+    assert second["clauses_reused"] == second["clauses_total"] - 1
+
+    unknown = post_revision(client, draft, previous_id="0" * 16)["revision"]
+    assert unknown["previous_found"] is False
+    assert unknown["clauses_reanalyzed"] == 0
+
+
+def test_revision_diff_against_uploaded_previous(client, sample_contract):
+    draft = sample_contract.replace(EDITED_FROM, EDITED_TO)
+
+    revision = post_revision(client, draft, previous=sample_contract)["revision"]
+
+    assert revision["previous_found"] is True
+    assert revision["previous_id"] == ClauseCache.revision_id(sample_contract)
+    assert (revision["clauses_changed"], revision["clauses_removed"]) == (1, 1)
+    assert revision["clauses_reanalyzed"] == revision["clauses_total"]
+
+
+def test_reused_clauses_give_the_same_report(client, stub_validator, sample_contract):
+    draft = sample_contract.replace(EDITED_FROM, EDITED_TO)
+
+    post_revision(client, sample_contract)
+    reused = post_revision(client, draft)
+    stub_validator.clause_cache.clear()
+    fresh = post_revision(client, draft)
+
+    assert reused["revision"]["clauses_reanalyzed"] == 1
+    assert fresh["revision"]["clauses_reanalyzed"] == fresh["revision"]["clauses_total"]
+    assert reused["flaws"] == fresh["flaws"]
+    assert reused["is_valid"] == fresh["is_valid"]
+    assert reused["confidence"] == pytest.approx(fresh["confidence"])
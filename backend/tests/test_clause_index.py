@@ -0,0 +1,88 @@
+"""
+Reference Clause Index tests
+Calibration on labelled pairs, and index reuse across updates
+"""
+
+import numpy as np
+
+from clause_index import ClauseIndex
+
+DIMENSION = 16
+REFERENCES = {"governing_law": ["law a", "law b"], "vesting_schedule": ["vest a"]}
+CALIBRATION = {"governing_law": ["law c"], "vesting_schedule": ["vest b"]}
+UNRELATED = ["counterparts", "notices"]
+
+
+def separable_embed(texts):
+    """Texts of the same topic point the same way; unrelated text is orthogonal to both"""
+    axes = {"law": 0, "vest": 1}
+    vectors = np.zeros((len(texts), DIMENSION), dtype=np.float32)
+    for row, text in enumerate(texts):
+        topic = text.split()[0]
+        vectors[row, axes.get(topic, 2 + row % (DIMENSION - 2))] = 1.0
+        vectors[row, 15] = 0.1 * (row % 3)
+    return vectors
+
+
+def collapsed_embed(texts):
+    """Like an untrained encoder: every text is nearly the same vector"""
+    rng = np.random.default_rng(len(texts))
+    return np.ones((len(texts), DIMENSION), dtype=np.float32) + 1e-4 * rng.standard_normal((len(texts), DIMENSION))
+
+
+def test_separable_encoder_is_calibrated(tmp_path):
+    index = ClauseIndex(str(tmp_path), "separable")
+    index.update(REFERENCES, separable_embed, CALIBRATION, UNRELATED)
+
+    assert index.calibrated
+    assert index.calibration["accuracy"] == 1.0
+    assert index.calibration["positives"] == 2
+    # 2 labelled clauses x 1 other requirement + 2 unrelated x 2 requirements
+    assert index.calibration["negatives"] == 6
+    assert index.calibration["negative_median"] < index.match_threshold <= index.approved_threshold
+
+    scores, _ = index.match(separable_embed(["law d", "notices"]))
+    law = index.requirements.index("governing_law")
+    assert scores[0, law] >= index.match_threshold
+    assert scores[1, law] < index.match_threshold
+
+
+def test_collapsed_encoder_is_not_calibrated(tmp_path):
+    index = ClauseIndex(str(tmp_path), "collapsed")
+    index.update(REFERENCES, collapsed_embed, CALIBRATION, UNRELATED)
+
+    assert not index.calibrated
+
+
+def test_without_labelled_pairs_index_is_not_calibrated(tmp_path):
+    index = ClauseIndex(str(tmp_path), "separable")
+    index.update(REFERENCES, separable_embed)
+
+    assert not index.calibrated
+
+
+def test_update_reuses_saved_index(tmp_path):
+    calls = []
+
+    def counting_embed(texts):
+        calls.append(list(texts))
+        return separable_embed(texts)
+
+    ClauseIndex(str(tmp_path), "separable").update(REFERENCES, counting_embed, CALIBRATION, UNRELATED)
+    calls.clear()
+
+    reloaded = ClauseIndex(str(tmp_path), "separable")
+    assert reloaded.update(REFERENCES, counting_embed, CALIBRATION, UNRELATED) == 0
+    assert calls == []
+    assert reloaded.calibrated
+
+    # A new reference embeds only itself (plus the calibration clauses for new thresholds)
+    changed = dict(REFERENCES, governing_law=["law a", "law b", "law e"])
+    assert reloaded.update(changed, counting_embed, CALIBRATION, UNRELATED) == 1
+    assert calls[0] == ["law e"]
+
+
+def test_other_encoder_does_not_load_index(tmp_path):
+    ClauseIndex(str(tmp_path), "separable").update(REFERENCES, separable_embed, CALIBRATION, UNRELATED)
+
+    assert len(ClauseIndex(str(tmp_path), "another encoder")) == 0
@@ -0,0 +1,69 @@
+"""
+Clause Segmenter tests
+Clause spans are exact, contiguous and labelled; batching clauses does not change their results
+"""
+
+import pytest
+
+from clause_segmenter import last_boundary, segment_clauses
+
+
+def test_spans_are_exact_and_cover_the_document(sample_contract):
+    clauses = segment_clauses(sample_contract)
+
+    assert len(clauses) > 10
+    assert not sample_contract[:clauses[0].char_start].strip()
+    assert not sample_contract[clauses[-1].char_end:].strip()
+    for clause, following in zip(clauses, clauses[1:]):
+        assert clause.char_end == following.char_start
+    for position, clause in enumerate(clauses):
+        assert clause.index == position
+        assert clause.text == sample_contract[clause.char_start:clause.char_end]
+
+
+def test_headings_sub_clauses_and_sections():
+    text = ("AGREEMENT\n\nParties agree as follows.\n\n"
+            "1. EQUITY DISTRIBUTION\n\n1.1 Shares are issued.\n1.2 Shares vest.\n\n"
+            "2. GOVERNING LAW\n\nLaws of India.\n")
+    clauses = segment_clauses(text)
+
+    titles = [clause.title for clause in clauses]
+    assert titles == ["AGREEMENT", "1.1", "1.2", "2. GOVERNING LAW"]
+    # A heading with no body is merged into the clause after it
+    assert clauses[1].text.startswith("1. EQUITY DISTRIBUTION")
+    assert clauses[2].section == "1. EQUITY DISTRIBUTION"
+
+
+def test_long_unstructured_text_is_split_at_paragraphs():
+    paragraph = "This paragraph has no numbering or heading at all. " * 10
+    text = "\n\n".join([paragraph] * 20)
+
+    clauses = segment_clauses(text, max_chars=2000)
+
+    assert len(clauses) > 1
+    assert all(len(clause.text) <= 2000 for clause in clauses)
+    assert "".join(clause.text for clause in clauses) == text
+
+
+def test_last_boundary_prefers_section_headings():
+    text = "1. TERM\n1.1 One year.\n1.2 Renewal.\n2. FEES\n2.1 Monthly.\n"
+
+    assert last_boundary(text, 0, len(text)) == text.index("2. FEES")
+    assert last_boundary(text, 1, text.index("2. FEES")) == text.index("1.2")
+    assert last_boundary("no structure here", 0, 17) is None
+
+
+def test_batched_clause_pass_matches_one_document_at_a_time(stub_validator, sample_contract, monkeypatch):
+    pytest.importorskip("torch")
+    monkeypatch.setattr(stub_validator, "clause_classification", True)
+    documents = [sample_contract, sample_contract[:len(sample_contract) // 3], "1. TERM\n\nOne year.\n"]
+    clause_lists = [segment_clauses(document) for document in documents]
+
+    together = stub_validator._classify_clauses(clause_lists)
+    alone = [stub_validator._classify_clauses([clauses])[0] for clauses in clause_lists]
+
+    for batched, single in zip(together, alone):
+        assert [result["clause"] for result in batched] == [result["clause"] for result in single]
+        assert [result["flaw_type"] for result in batched] == [result["flaw_type"] for result in single]
+        assert [result["probability"] for result in batched] == \
+            pytest.approx([result["probability"] for result in single], abs=1e-5)
@@ -0,0 +1,48 @@
+"""
+Document Type Classifier tests
+Detection on the built-in corpus and loading from a given artifact
+"""
+
+import numpy as np
+import pytest
+
+from doc_type_classifier import COMPONENT, DOCUMENT_TYPES, get_type_classifier, train_default_classifier
+from doc_type_corpus import generate_documents
+from model_store import ModelArtifactStore
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return train_default_classifier(samples_per_type=40)
+
+
+def test_held_out_documents_are_typed(classifier):
+    texts, labels = generate_documents(10, seed=7, fold=1)
+    detected = [result["document_type"] for result in classifier.classify_many(texts)]
+
+    assert sum(a == b for a, b in zip(detected, labels)) / len(labels) >= 0.9
+
+
+def test_batch_matches_single(classifier):
+    texts, _ = generate_documents(2, seed=3, fold=1)
+    batch = classifier.classify_many(texts)
+
+    for text, result in zip(texts, batch):
+        single = classifier.classify(text)
+        assert single["document_type"] == result["document_type"]
+        assert single["confidence"] == pytest.approx(result["confidence"], abs=1e-6)
+
+
+def test_classifier_comes_from_the_requested_artifact(tmp_path, classifier):
+    store = ModelArtifactStore(str(tmp_path))
+    store.save({COMPONENT: classifier})
+    other = train_default_classifier(samples_per_type=10, seed=5)
+    store.save({COMPONENT: other}, promote=False)
+
+    latest = get_type_classifier(store)
+    pinned = get_type_classifier(store, "v0002")
+
+    assert latest is get_type_classifier(store, None)
+    assert np.array_equal(latest.weights, classifier.weights)
+    assert np.array_equal(pinned.weights, other.weights)
+    assert list(latest.document_types) == DOCUMENT_TYPES
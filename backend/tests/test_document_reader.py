@@ -0,0 +1,57 @@
+"""
+Document Reader tests
+Uploads are parsed from their streams, seekable or not, without named temp files
+"""
+
+import io
+
+from werkzeug.datastructures import FileStorage
+
+import document_reader
+from document_reader import read_file_content, read_stream_content, read_upload
+
+
+class OneWayStream(io.RawIOBase):
+    """A readable stream that cannot seek, like a socket-backed upload"""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_text_uses_universal_newlines():
+    assert read_stream_content(io.BytesIO("a\r\nb\rc\n₹".encode("utf-8")), "x.txt") == "a\nb\nc\n₹"
+
+
+def test_stream_is_read_from_the_start():
+    stream = io.BytesIO(b"whole text")
+    stream.read(5)
+
+    assert read_stream_content(stream, "x.TXT") == "whole text"
+
+
+def test_non_seekable_stream_is_spooled(monkeypatch):
+    monkeypatch.setattr(document_reader, "SPOOL_MAX_MEMORY", 16)
+    data = ("clause " * 100).encode("utf-8")
+
+    assert read_stream_content(OneWayStream(data), "big.txt") == data.decode("utf-8")
+
+
+def test_invalid_utf8_text_is_unreadable_but_unknown_types_are_lenient():
+    assert read_stream_content(io.BytesIO(b"\xff\xfe bad"), "x.txt") is None
+    assert read_stream_content(io.BytesIO(b"\xff ok"), "x.doc") == " ok"
+
+
+def test_upload_and_file_paths_agree(tmp_path, sample_contract):
+    path = tmp_path / "contract.txt"
+    path.write_bytes(sample_contract.encode("utf-8"))
+    upload = FileStorage(stream=io.BytesIO(sample_contract.encode("utf-8")), filename="contract.txt")
+
+    assert read_upload(upload) == read_file_content(str(path)) == sample_contract
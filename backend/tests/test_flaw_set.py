@@ -0,0 +1,60 @@
+"""
+Flaw Set tests
+Deduplication, severity counts and ordering, and byte JSON serialization
+"""
+
+import json
+
+from fast_json import dumps
+from flaw_set import FlawSet, LegalFlaw, count_severities, severity_summary
+
+
+def flaw(flaw_type, severity, location="Document-wide"):
+    return LegalFlaw(flaw_type, severity, location, f"{flaw_type} found", "Fix it")
+
+
+def test_duplicates_are_dropped_and_severities_counted():
+    flaws = FlawSet([
+        flaw("MISSING_DATE", "CRITICAL"),
+        flaw("WEAK_OBLIGATION", "MEDIUM", "Line 4"),
+        flaw("MISSING_DATE", "CRITICAL"),
+        flaw("WEAK_OBLIGATION", "MEDIUM", "Line 9"),
+    ])
+
+    assert len(flaws) == 3
+    assert flaws.add(flaw("MISSING_DATE", "LOW")) is False
+    assert flaws.counts == [1, 0, 2, 0]
+
+
+def test_order_is_by_severity_then_insertion():
+    flaws = FlawSet([
+        flaw("A", "LOW"), flaw("B", "HIGH"), flaw("C", "CRITICAL"), flaw("D", "HIGH"), flaw("E", "MEDIUM")
+    ])
+
+    assert [f.flaw_type for f in flaws.ordered()] == ["C", "B", "D", "E", "A"]
+
+
+def test_summary_matches_counting_serialized_flaws():
+    flaws = FlawSet([flaw("A", "HIGH"), flaw("B", "LOW"), flaw("C", "LOW", "Line 2")])
+    summary = flaws.summary()
+
+    assert summary == dict(severity_summary(count_severities(summary["flaws"])), flaws=summary["flaws"])
+    assert summary["is_compliant"] is False
+    assert (summary["total_flaws"], summary["high_flaws"], summary["low_flaws"]) == (3, 1, 2)
+
+
+def test_replace_and_equality():
+    original = flaw("A", "HIGH", "Line 3")
+    changed = original.replace(description="Other")
+
+    assert changed.description == "Other" and changed.location == "Line 3"
+    assert changed != original and changed.replace(description=original.description) == original
+
+
+def test_dumps_returns_utf8_json_bytes():
+    report = {"flaws": [flaw("A", "HIGH").to_dict()], "summary": "₹ 10,000 — due", "confidence": 0.5}
+    body = dumps(report)
+
+    assert isinstance(body, bytes)
+    assert json.loads(body.decode("utf-8")) == report
+    assert "₹".encode("utf-8") in body
@@ -0,0 +1,52 @@
+"""
+Inference Backend tests
+Backends must agree with eager on every head
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from inference_backends import HEAD_NAMES, EagerBackend, parity_check  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def quantized_validator(stub_validator, tmp_path_factory):
+    import legal_validator
+    from model_store import ModelArtifactStore
+
+    return legal_validator.LegalDocumentValidator(
+        use_gpu=False, store=ModelArtifactStore(str(tmp_path_factory.mktemp("quantized-store"))),
+        backend="quantized", reference_matching=False
+    )
+
+
+def test_quantized_backend_keeps_no_fp32_linear(quantized_validator):
+    model = quantized_validator.model
+
+    assert quantized_validator.backend.model is model
+    assert not [name for name, module in model.named_modules() if type(module) is torch.nn.Linear]
+
+
+def test_parity_check_covers_every_head(stub_validator, quantized_validator, sample_contract):
+    texts = [paragraph for paragraph in sample_contract.split("\n\n") if paragraph.strip()][:8]
+    result = parity_check(EagerBackend(stub_validator.model), quantized_validator.backend,
+                          stub_validator.tokenizer, texts)
+
+    assert set(result["heads"]) == set(HEAD_NAMES)
+    assert result["max_prob_diff"] == max(head["max_prob_diff"] for head in result["heads"].values())
+    assert result["max_prob_diff"] < 0.05
+
+
+def test_parity_check_of_identical_backends(stub_validator, sample_contract):
+    backend = EagerBackend(stub_validator.model)
+    result = parity_check(backend, backend, stub_validator.tokenizer, [sample_contract])
+
+    assert result["max_prob_diff"] == 0.0
+    assert result["label_agreement"] == 1.0
+
+
+def test_quantized_validator_refuses_to_save(quantized_validator, sample_contract):
+    assert quantized_validator.validate_document(sample_contract, "NDA")["windows_analyzed"] > 0
+    with pytest.raises(ValueError):
+        quantized_validator.save_artifact()
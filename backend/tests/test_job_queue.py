@@ -0,0 +1,106 @@
+"""
+Job Queue tests
+Job lifecycle, admission control and the shared SQLite job records
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, QueueFullError
+
+
+def wait_for(queue, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {status}: {queue.get(job_id)}")
+
+
+def age_rows(path, seconds):
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE jobs SET updated_at = updated_at - ?", (seconds,))
+
+
+def test_job_reports_progress_and_result():
+    def run(payload, report):
+        report(0.5, "halfway")
+        return {"length": len(payload)}
+
+    queue = JobQueue(run, max_workers=1)
+    job_id = queue.submit("contract text", {"filename": "a.txt"})
+
+    job = wait_for(queue, job_id, "completed")
+    assert job["result"] == {"length": 13}
+    assert (job["progress"], job["stage"], job["filename"]) == (1.0, "done", "a.txt")
+    assert queue.metrics()["completed"] == 1
+
+
+def test_failed_job_keeps_its_error():
+    def run(payload, report):
+        raise ValueError("unreadable")
+
+    queue = JobQueue(run, max_workers=1)
+    job = wait_for(queue, queue.submit(None), "failed")
+
+    assert job["error"] == "unreadable"
+    assert queue.metrics()["failed"] == 1
+
+
+def test_full_queue_rejects_jobs():
+    release = threading.Event()
+    queue = JobQueue(lambda payload, report: release.wait(5) and {}, max_workers=1, max_pending=2)
+    try:
+        first = queue.submit(1)
+        second = queue.submit(2)
+        with pytest.raises(QueueFullError):
+            queue.submit(3)
+
+        assert queue.get(second)["queue_position"] == 1
+        assert queue.metrics()["rejected"] == 1
+    finally:
+        release.set()
+    wait_for(queue, first, "completed")
+
+
+def test_records_are_shared_and_swept_across_processes(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    writer = JobQueue(lambda payload, report: {"ok": True}, ttl_seconds=60, sqlite_path=path)
+    job_id = writer.submit("text")
+    wait_for(writer, job_id, "completed")
+
+    # Another worker sees the record, and stops seeing it once it has expired
+    reader = JobQueue(lambda payload, report: {}, ttl_seconds=60, sqlite_path=path)
+    assert reader.get(job_id)["result"] == {"ok": True}
+    age_rows(path, 120)
+    assert reader.get(job_id) is None
+
+    # A worker with no expiring jobs of its own still deletes expired rows
+    wait_for(reader, reader.submit("other"), "completed")
+    with sqlite3.connect(path) as db:
+        ids = [row[0] for row in db.execute("SELECT id FROM jobs")]
+    assert job_id not in ids and len(ids) == 1
+
+
+def test_restart_fails_unfinished_jobs_and_sweeps(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    release = threading.Event()
+    queue = JobQueue(lambda payload, report: release.wait(5) and {}, max_workers=1, sqlite_path=path)
+    running = queue.submit(1)
+    queued = queue.submit(2)
+    wait_for(queue, running, "running")
+
+    restarted = JobQueue(lambda payload, report: {}, ttl_seconds=60, sqlite_path=path)
+    assert restarted.get(queued)["status"] == "failed"
+    assert "restarted" in restarted.get(running)["error"]
+
+    age_rows(path, 120)
+    JobQueue(lambda payload, report: {}, ttl_seconds=60, sqlite_path=path)
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+    release.set()
@@ -0,0 +1,72 @@
+"""
+Metrics tests
+Stage timers, the Prometheus text format, and /metrics after an analysis
+"""
+
+import io
+import json
+
+from metrics import MetricsRegistry, StageTimer
+
+
+def test_stage_timer_accumulates_and_merges():
+    timer = StageTimer()
+    timer.add("rule_scan", 0.25)
+    timer.add("rule_scan", 0.25)
+    timer.merge({"classify_document": 1500.0})
+    with timer.stage("serialization"):
+        pass
+
+    timings = timer.as_ms()
+    assert list(timings) == ["rule_scan", "classify_document", "serialization"]
+    assert timings["rule_scan"] == 500.0 and timings["classify_document"] == 1500.0
+    assert timer.elapsed() >= 0
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry(prefix="test")
+    registry.describe("requests_total", "counter", "Requests served")
+    registry.describe("batch", "histogram", "Batch sizes", buckets=(1, 4, 16))
+    registry.inc("requests_total", endpoint="analyze")
+    registry.inc("requests_total", 2, endpoint="analyze")
+    registry.set_gauge("queue", 3, field='quoted "name"')
+    for size in (1, 3, 3, 40):
+        registry.observe("batch", size)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{endpoint="analyze"} 3' in lines
+    assert 'test_queue{field="quoted \\"name\\""} 3' in lines
+    assert [line for line in lines if line.startswith("test_batch")] == [
+        'test_batch_bucket{le="1"} 1',
+        'test_batch_bucket{le="4"} 3',
+        'test_batch_bucket{le="16"} 3',
+        'test_batch_bucket{le="+Inf"} 4',
+        "test_batch_sum 47",
+        "test_batch_count 4",
+    ]
+
+
+def test_analysis_shows_up_in_metrics(stub_validator, sample_contract, monkeypatch):
+    import app as flask_backend
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    flask_backend.result_cache.clear()
+    client = flask_backend.app.test_client()
+
+    response = client.post("/analyze", data={
+        "file": (io.BytesIO(sample_contract.encode("utf-8")), "contract.txt"), "document_type": "NDA"
+    }, content_type="multipart/form-data")
+    body = json.loads(response.data)
+    assert {"upload", "extraction", "classify_document"} <= set(body["timings"])
+
+    metrics = client.get("/metrics")
+    text = metrics.data.decode("utf-8")
+    assert metrics.mimetype == "text/plain"
+    assert 'legal_analyzer_documents_total{endpoint="analyze"}' in text
+    assert 'legal_analyzer_stage_seconds_count{endpoint="analyze",stage="extraction"}' in text
+    assert "legal_analyzer_request_seconds_bucket" in text
@@ -0,0 +1,101 @@
+"""
+Micro-Batcher tests
+Concurrent submissions are grouped into bounded batches and answered in order
+"""
+
+import threading
+import time
+
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+def test_concurrent_items_are_batched_and_mapped_back():
+    batches = []
+    release = threading.Event()
+
+    def process(items):
+        release.wait(5)
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=500)
+    try:
+        futures = [batcher.submit(item) for item in range(10)]
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.stop()
+
+    assert results == [item * 10 for item in range(10)]
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(item for batch in batches for item in batch) == list(range(10))
+    assert len(batches) < 10
+    assert batcher.items_processed == 10
+    assert batcher.average_batch_size == 10 / len(batches)
+
+
+def test_results_follow_items_across_threads():
+    batcher = MicroBatcher(lambda items: [f"result-{item}" for item in items], max_batch_size=8, max_wait_ms=20)
+    results = {}
+
+    def worker(start):
+        results[start] = batcher.process_many(list(range(start, start + 5)), timeout=5)
+
+    try:
+        threads = [threading.Thread(target=worker, args=(start,)) for start in range(0, 40, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        batcher.stop()
+
+    for start, values in results.items():
+        assert values == [f"result-{item}" for item in range(start, start + 5)]
+    assert batcher.items_processed == 40
+
+
+def test_lone_item_is_dispatched_after_max_wait():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=8, max_wait_ms=20)
+    try:
+        started = time.monotonic()
+        assert batcher.process("only", timeout=5) == "only"
+        assert time.monotonic() - started < 2
+    finally:
+        batcher.stop()
+
+
+def test_batch_errors_reach_every_caller():
+    def process(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(item) for item in range(3)]
+        for future in futures:
+            with pytest.raises(ValueError, match="model failed"):
+                future.result(timeout=5)
+        assert batcher.batches_processed == 0
+    finally:
+        batcher.stop()
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=2, max_wait_ms=50)
+    try:
+        with pytest.raises(RuntimeError, match="returned 1 results for 2 items"):
+            batcher.process_many(["a", "b"], timeout=5)
+    finally:
+        batcher.stop()
+
+
+def test_stopped_batcher_rejects_work():
+    batcher = MicroBatcher(lambda items: items)
+    batcher.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        batcher.submit(1)
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
@@ -0,0 +1,70 @@
+"""
+Model Artifact Store tests
+Versioning, promotion and rollback
+"""
+
+import os
+
+import pytest
+
+from model_store import LATEST_FILE, ModelArtifactStore
+
+
+class Component:
+    def save_pretrained(self, path):
+        os.makedirs(path)
+        with open(os.path.join(path, "weights.bin"), "w") as f:
+            f.write("0")
+
+
+def test_versions_are_numbered_and_promoted(tmp_path):
+    store = ModelArtifactStore(str(tmp_path))
+
+    assert store.save({"model": Component()}, metadata={"note": "first"}) == "v0001"
+    assert store.save({"model": Component()}) == "v0002"
+    assert store.latest_version() == "v0002"
+    assert store.load_manifest("v0001")["note"] == "first"
+    assert store.load_manifest()["components"] == ["model"]
+
+
+def test_save_without_promote_keeps_latest(tmp_path):
+    store = ModelArtifactStore(str(tmp_path))
+    store.save({"model": Component()})
+
+    assert store.save({"model": Component()}, promote=False) == "v0002"
+    assert store.latest_version() == "v0001"
+    assert store.resolve("v0002") is not None
+
+
+def test_save_without_promote_pins_latest_when_unset(tmp_path):
+    store = ModelArtifactStore(str(tmp_path))
+    store.save({"model": Component()})
+    os.remove(os.path.join(str(tmp_path), LATEST_FILE))
+
+    store.save({"model": Component()}, promote=False)
+
+    assert store.latest_version() == "v0001"
+
+
+def test_set_latest_rolls_back_and_rejects_unknown(tmp_path):
+    store = ModelArtifactStore(str(tmp_path))
+    store.save({"model": Component()})
+    store.save({"model": Component()})
+
+    store.set_latest("v0001")
+    assert store.latest_version() == "v0001"
+    with pytest.raises(ValueError):
+        store.set_latest("v0009")
+
+
+def test_failed_save_leaves_no_version(tmp_path):
+    class Broken:
+        def save_pretrained(self, path):
+            raise OSError("disk full")
+
+    store = ModelArtifactStore(str(tmp_path))
+    with pytest.raises(OSError):
+        store.save({"model": Broken()})
+
+    assert store.list_versions() == []
+    assert os.listdir(str(tmp_path)) == []
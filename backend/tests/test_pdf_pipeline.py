@@ -0,0 +1,109 @@
+"""
+PDF Pipeline tests
+Page order and the time budget, including inside worker processes
+"""
+
+import io
+import os
+import tempfile
+import time
+
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+
+import pdf_pipeline  # noqa: E402
+from pdf_pipeline import PdfExtraction, _extract_pages  # noqa: E402
+
+
+def blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def stuck_first_task(path, start, end, deadline=None):
+    """The first task's page never finishes; the others are instant"""
+    if start == 0:
+        time.sleep(60)
+    return [""] * (end - start)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "PDF_WORKERS", 2)
+    pdf_pipeline.shutdown_pool()
+    yield
+    pdf_pipeline.shutdown_pool(terminate=True)
+
+
+def test_worker_stops_at_deadline(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(blank_pdf(5))
+
+    assert len(_extract_pages(str(path), 0, 5)) == 5
+    assert _extract_pages(str(path), 0, 5, deadline=time.time() - 1) == []
+
+
+def test_worker_opens_each_document_once(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(blank_pdf(8))
+
+    _extract_pages(str(path), 0, 4)
+    reader = pdf_pipeline._worker_document[1]
+    _extract_pages(str(path), 4, 8)
+
+    assert pdf_pipeline._worker_document[1] is reader
+
+
+def test_parallel_extraction_yields_every_page(parallel, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    extraction = PdfExtraction(blank_pdf(40))
+
+    assert len(list(extraction.pages())) == 40
+    assert extraction.pages_extracted == 40
+    assert not extraction.truncated
+    # The document's temporary file is removed once its pages are in
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_budget_truncates(parallel):
+    extraction = PdfExtraction(blank_pdf(40), time_budget=1e-9)
+
+    assert list(extraction.pages()) == []
+    assert extraction.truncated
+
+
+def test_stuck_page_does_not_take_the_pool_down(parallel, monkeypatch):
+    pdf_pipeline.start_pool()
+    pool = pdf_pipeline._pool
+    monkeypatch.setattr(pdf_pipeline, "_extract_pages", stuck_first_task)
+    monkeypatch.setattr(pdf_pipeline, "PAGE_GRACE_SECONDS", 0.5)
+    extraction = PdfExtraction(blank_pdf(40), time_budget=0.5)
+
+    started = time.monotonic()
+    assert list(extraction.pages()) == []
+    assert time.monotonic() - started < 10
+    assert extraction.truncated
+
+    # The pool and its other worker keep serving other documents
+    monkeypatch.setattr(pdf_pipeline, "_extract_pages", _extract_pages)
+    other = PdfExtraction(blank_pdf(40), time_budget=30)
+    assert len(list(other.pages())) == 40
+    assert not other.truncated
+    assert pdf_pipeline._pool is pool
+
+
+def test_reset_after_fork_starts_a_fresh_pool(parallel):
+    pdf_pipeline.start_pool()
+    inherited = pdf_pipeline._pool
+
+    pdf_pipeline.reset_after_fork()
+
+    assert pdf_pipeline._pool is not inherited
+    assert len(list(PdfExtraction(blank_pdf(40)).pages())) == 40
+    inherited.shutdown(wait=True)
+
@@ -0,0 +1,83 @@
+"""
+Pre-fork Serving tests
+Memory-mapped weights load faithfully, and a forked worker serves after after_fork
+"""
+
+import io
+import json
+import os
+import select
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from safetensors.torch import load_file  # noqa: E402
+
+import legal_validator  # noqa: E402
+from shared_encoder import ENCODER_WEIGHTS_FILE, SharedEncoderClassifier, load_mmap_state_dict  # noqa: E402
+
+
+def test_mmap_state_dict_matches_safetensors(stub_validator):
+    path = os.path.join(legal_validator.BASE_MODEL, ENCODER_WEIGHTS_FILE)
+
+    mapped = load_mmap_state_dict(path)
+    loaded = load_file(path)
+
+    assert mapped.keys() == loaded.keys()
+    for name, tensor in loaded.items():
+        assert mapped[name].dtype == tensor.dtype
+        assert torch.equal(mapped[name], tensor)
+
+
+def test_mmap_encoder_gives_the_same_encoder(stub_validator):
+    mapped = SharedEncoderClassifier.from_pretrained(legal_validator.BASE_MODEL, mmap_weights=True)
+    copied = SharedEncoderClassifier.from_pretrained(legal_validator.BASE_MODEL, mmap_weights=False)
+
+    copied_state = copied.encoder.state_dict()
+    for name, tensor in mapped.encoder.state_dict().items():
+        assert torch.equal(tensor, copied_state[name]), name
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork serving needs fork()")
+def test_forked_worker_serves_after_after_fork(stub_validator, sample_contract, monkeypatch):
+    import app as flask_backend
+    import pdf_pipeline
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    flask_backend.result_cache.clear()
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Worker: threads, pools and handles inherited from the parent are dead until after_fork
+        status = 1
+        try:
+            os.close(read_end)
+            flask_backend.after_fork(1)
+            response = flask_backend.app.test_client().post("/analyze", data={
+                "file": (io.BytesIO(sample_contract.encode("utf-8")), "contract.txt"), "document_type": "NDA"
+            }, content_type="multipart/form-data")
+            os.write(write_end, json.dumps([response.status_code,
+                                            response.get_json()["validation"]["total_flaws"]]).encode("utf-8"))
+            status = 0
+        finally:
+            pdf_pipeline.shutdown_pool(terminate=True)
+            os._exit(status)
+
+    os.close(write_end)
+    try:
+        readable, _, _ = select.select([read_end], [], [], 60)
+        assert readable, "forked worker did not answer"
+        status_code, total_flaws = json.loads(os.read(read_end, 4096))
+    finally:
+        os.close(read_end)
+        if not os.waitpid(pid, os.WNOHANG)[0]:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+
+    assert status_code == 200
+    assert total_flaws == stub_validator.validate_document(sample_contract, "NDA")["total_flaws"]
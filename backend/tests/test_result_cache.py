@@ -0,0 +1,60 @@
+"""
+Result Cache tests
+Memory and SQLite tiers, expiry and the disk row cap
+"""
+
+import sqlite3
+
+from result_cache import ResultCache
+
+
+def disk_keys(path):
+    with sqlite3.connect(path) as db:
+        return {key for key, in db.execute("SELECT key FROM results")}
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResultCache(sqlite_path=path).put("a", {"total_flaws": 1})
+
+    cache = ResultCache(sqlite_path=path)
+    assert cache.get("a") == {"total_flaws": 1}
+    assert cache.get("a") == {"total_flaws": 1}
+    assert (cache.disk_hits, cache.memory_hits) == (1, 1)
+
+
+def test_put_trims_disk_to_newest_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(max_entries=2, sqlite_path=path, max_disk_entries=3)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("result_cache.time.time", lambda: next(clock))
+
+    for key in "abcde":
+        cache.put(key, {"key": key})
+
+    assert disk_keys(path) == {"c", "d", "e"}
+    assert cache.get("a") is None
+
+
+def test_put_sweeps_expired_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(ttl_seconds=10, sqlite_path=path)
+    now = [1000.0]
+    monkeypatch.setattr("result_cache.time.time", lambda: now[0])
+
+    cache.put("old", {})
+    now[0] += 5
+    cache.put("newer", {})
+    now[0] += 6
+    cache.put("newest", {})
+
+    assert disk_keys(path) == {"newer", "newest"}
+
+
+def test_key_depends_on_versions():
+    key = ResultCache.make_key("text", "NDA", "model-1", "rules-1")
+
+    assert key == ResultCache.make_key("text", "NDA", "model-1", "rules-1")
+    assert key != ResultCache.make_key("text", "NDA", "model-2", "rules-1")
+    assert key != ResultCache.make_key("text", "NDA", "model-1", "rules-2")
+    assert key != ResultCache.make_key("text", "GENERAL", "model-1", "rules-1")
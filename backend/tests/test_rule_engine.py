@@ -0,0 +1,66 @@
+"""
+Rule Engine tests
+The combined scan must report what one re.finditer per rule reports
+"""
+
+import re
+
+import pytest
+
+from legal_rules import RULE_PACK, RulePack
+from rule_engine import KeywordAutomaton, RuleEngine
+
+
+def per_rule(patterns, text):
+    return {rule_id: [match.span() for match in re.finditer(pattern, text.lower())]
+            for rule_id, pattern in patterns.items()}
+
+
+def test_overlapping_matches_of_different_rules_are_all_reported():
+    patterns = {
+        "RUN": r"\bpending(?:\s+pending)*\b",
+        "PAIR": r"\bpending\s+\w+",
+        "WORD": r"\bpending\b",
+    }
+    text = "Terms pending pending review. Pending."
+
+    hits = RuleEngine([], patterns).scan(text)
+
+    assert hits.matches("RUN") == [(6, 21), (30, 37)]
+    assert hits.matches("PAIR") == [(6, 21)]
+    assert hits.matches("WORD") == [(6, 13), (14, 21), (30, 37)]
+    assert hits.pattern_matches == per_rule(patterns, text)
+
+
+def test_match_starting_inside_another_rules_match():
+    patterns = {"LONG": r"to be determined later", "SHORT": r"determined"}
+    text = "Price to be determined later; quantity determined."
+
+    assert RuleEngine([], patterns).scan(text).pattern_matches == per_rule(patterns, text)
+
+
+def test_shipped_pack_matches_per_rule_scan(sample_contract):
+    pack = RulePack.from_file(RULE_PACK)
+    patterns = {rule["flaw_type"]: rule["pattern"] for rule in pack.pattern_rules}
+    text = sample_contract + "\nPayment: TBD, to be determined and pending pending approval. Perpetual term."
+
+    assert pack.engine.scan(text).pattern_matches == per_rule(patterns, text)
+
+
+def test_offsets_refer_to_original_text_when_lowercasing_changes_length():
+    text = "İstanbul office: fee TBD"
+    hits = RuleEngine([], {"TBD": r"\btbd\b"}).scan(text)
+
+    (start, end), = hits.matches("TBD")
+    assert text[start:end] == "TBD"
+
+
+def test_named_groups_are_rejected():
+    with pytest.raises(ValueError, match="named groups"):
+        RuleEngine([], {"BAD": r"(?P<term>tbd)"})
+
+
+def test_keyword_first_positions():
+    automaton = KeywordAutomaton(["Governed", "party", "missing"])
+
+    assert automaton.first_positions("the party is governed by the party") == {"party": 4, "governed": 13}
@@ -0,0 +1,110 @@
+"""
+Rule Pack tests
+Schema validation and hot reload of rule-pack files
+"""
+
+import copy
+import json
+import os
+
+import pytest
+
+from legal_rules import RULE_PACK, RulePack, RulePackError, RulePackStore
+
+
+@pytest.fixture
+def pack_data():
+    with open(RULE_PACK, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_pack(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_shipped_pack_is_valid():
+    pack = RulePack.from_file(RULE_PACK)
+
+    assert pack.requirements_for("GENERAL") is not None
+    assert pack.describe()["fingerprint"] == pack.fingerprint
+
+
+def test_every_problem_is_listed(pack_data):
+    data = copy.deepcopy(pack_data)
+    index = len(data["pattern_rules"])
+    data["pattern_rules"].append({"pattern": "(unclosed", "flaw_type": "BROKEN", "severity": "LOW",
+                                  "description": "d", "suggestion": "s"})
+    data["pattern_rules"].append({"pattern": "urgent", "flaw_type": "URGENT", "severity": "URGENT",
+                                  "description": "d", "suggestion": "s"})
+    data["pattern_rules"].append(dict(data["pattern_rules"][0]))
+    del data["requirements"]["GENERAL"]
+    name = next(iter(data["clause_checks"]))
+    data["clause_checks"][name]["keywords"] = []
+
+    with pytest.raises(RulePackError) as error:
+        RulePack(data)
+
+    message = str(error.value)
+    assert f"pattern_rules[{index}].pattern is not a valid regex" in message
+    assert f"pattern_rules[{index + 1}].severity must be one of" in message
+    assert f"pattern_rules[{index + 2}].flaw_type {data['pattern_rules'][0]['flaw_type']} is duplicated" in message
+    assert "requirements.GENERAL is required" in message
+    assert f"clause_checks.{name}.keywords must be a list of non-empty strings" in message
+
+
+def test_missing_sections_are_reported_before_their_contents(pack_data):
+    data = copy.deepcopy(pack_data)
+    del data["version"]
+    data["pattern_rules"] = {}
+
+    with pytest.raises(RulePackError, match="'version' is required; 'pattern_rules' must be a list"):
+        RulePack(data)
+
+    with pytest.raises(RulePackError, match="must be an object"):
+        RulePack([])
+
+
+def test_unreadable_file_raises_rule_pack_error(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(RulePackError, match="Cannot read rule pack"):
+        RulePack.from_file(str(path))
+
+
+def test_store_keeps_previous_pack_on_invalid_change(tmp_path, pack_data):
+    path = str(tmp_path / "pack.json")
+    write_pack(path, pack_data)
+    store = RulePackStore(path, check_seconds=0)
+    original = store.current()
+
+    invalid = copy.deepcopy(pack_data)
+    del invalid["requirements"]["GENERAL"]
+    write_pack(path, invalid)
+    # The next write must change the stat signature even within one mtime tick
+    os.utime(path, ns=(0, 1))
+
+    assert store.reload_if_changed() is False
+    assert store.current() is original
+    assert "requirements.GENERAL is required" in store.last_error
+
+    changed = copy.deepcopy(pack_data)
+    changed["version"] = "test-2"
+    write_pack(path, changed)
+
+    assert store.current() is not original
+    assert store.current().version == "test-2"
+    assert store.reloads == 1 and store.last_error is None
+
+
+def test_unchanged_fingerprint_is_not_a_reload(tmp_path, pack_data):
+    path = str(tmp_path / "pack.json")
+    write_pack(path, pack_data)
+    store = RulePackStore(path, check_seconds=0)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(pack_data, f, indent=2)
+
+    assert store.reload_if_changed() is False
+    assert store.reloads == 0
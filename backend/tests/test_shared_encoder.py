@@ -0,0 +1,42 @@
+"""
+Shared Encoder tests
+Both heads and the clause embedding come from one encoder pass
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from shared_encoder import EMBEDDING, SharedEncoderClassifier  # noqa: E402
+
+
+def batch(validator, texts):
+    return validator.tokenizer(texts, padding=True, truncation=True, max_length=64, return_tensors="pt")
+
+
+def test_classify_encodes_once_for_every_head(stub_validator, monkeypatch):
+    model = stub_validator.model
+    calls = []
+    encoder_forward = model.encoder.forward
+    monkeypatch.setattr(model.encoder, "forward", lambda *args, **kwargs: calls.append(1) or
+                        encoder_forward(*args, **kwargs))
+    inputs = batch(stub_validator, ["The Company shall pay the Employee.", "Governing law: India."])
+
+    with torch.no_grad():
+        results = model.classify(**inputs, names=SharedEncoderClassifier.HEAD_NAMES + (EMBEDDING,))
+
+    assert len(calls) == 1
+    assert results["doc"].shape == (2, model.doc_head.out_features)
+    assert results["clause"].shape == (2, model.clause_head.out_features)
+    assert torch.allclose(results[EMBEDDING].norm(dim=1), torch.ones(2))
+
+
+def test_forward_matches_classify_for_one_head(stub_validator):
+    model = stub_validator.model
+    inputs = batch(stub_validator, ["The term is perpetual."])
+
+    with torch.no_grad():
+        logits = model(**inputs, head="clause").logits
+        expected = model.classify(**inputs, names=("clause",))["clause"]
+
+    assert torch.equal(logits, expected)
@@ -0,0 +1,95 @@
+"""
+Server-Sent Events tests
+/analyze/stream emits flaws stage by stage and closes with the /analyze body
+"""
+
+import io
+import json
+
+import pytest
+
+
+def sse_events(body):
+    events = []
+    for frame in body.decode("utf-8").strip().split("\n\n"):
+        event, data = frame.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(stub_validator, monkeypatch):
+    import app as flask_backend
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    flask_backend.result_cache.clear()
+    return flask_backend.app.test_client()
+
+
+def post(client, path, text, **form):
+    return client.post(path, data={
+        "file": (io.BytesIO(text.encode("utf-8")), "contract.txt"), **form
+    }, content_type="multipart/form-data")
+
+
+def test_events_arrive_in_stage_order(client, sample_contract):
+    response = post(client, "/analyze/stream", sample_contract, document_type="NDA")
+
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    events = sse_events(response.data)
+    names = [event for event, _ in events]
+    assert names[0] == "start" and events[0][1]["characters"] == len(sample_contract)
+    assert names[-1] == "summary" and names.count("verdict") == 1
+
+    verdict = names.index("verdict")
+    stages = [data["stage"] for event, data in events if event == "flaw"]
+    assert stages == ["rules"] * stages.count("rules") + ["clauses"] * stages.count("clauses")
+    assert all(data["stage"] == "rules" for _, data in events[1:verdict])
+
+
+def test_summary_matches_analyze(client, sample_contract):
+    streamed = sse_events(post(client, "/analyze/stream", sample_contract, document_type="NDA").data)
+    summary = streamed[-1][1]
+    body = json.loads(post(client, "/analyze", sample_contract, document_type="NDA").data)
+
+    assert summary["validation"] == body["validation"]
+    assert summary["summary"] == body["summary"]
+    assert summary["document_type"] == body["document_type"] == "NDA"
+    streamed_flaws = [data["flaw"]["flaw_type"] for event, data in streamed if event == "flaw"]
+    assert {flaw["flaw_type"] for flaw in body["validation"]["flaws"]} <= set(streamed_flaws)
+
+
+def test_cached_analysis_is_replayed(client, sample_contract):
+    first = sse_events(post(client, "/analyze/stream", sample_contract, document_type="NDA").data)
+    second = sse_events(post(client, "/analyze/stream", sample_contract, document_type="NDA").data)
+
+    replayed = [data for event, data in second if event == "flaw"]
+    assert replayed and all(data["stage"] == "cached" for data in replayed)
+    assert [event for event, _ in second][-2:] == ["verdict", "summary"]
+    assert second[-1][1]["validation"] == first[-1][1]["validation"]
+
+
+def test_fallback_mode_streams_rule_flaws(sample_contract, monkeypatch):
+    import app as flask_backend
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: None)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+
+    events = sse_events(post(flask_backend.app.test_client(), "/analyze/stream", sample_contract).data)
+
+    names = [event for event, _ in events]
+    assert names[0] == "start" and names[-1] == "summary" and "verdict" not in names
+    assert all(data["stage"] == "rules" for event, data in events if event == "flaw")
+
+
+def test_bad_upload_is_rejected_before_streaming(client):
+    response = client.post("/analyze/stream", data={"file": (io.BytesIO(b"x"), "contract.exe")},
+                           content_type="multipart/form-data")
+
+    assert response.status_code == 400 and "error" in response.get_json()
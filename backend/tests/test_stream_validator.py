@@ -0,0 +1,174 @@
+"""
+Streaming Validator tests
+Chunked validation must report what whole-document validation reports
+"""
+
+import io
+import json
+
+import pytest
+
+from legal_rules import RULE_PACK, RulePack
+from stream_validator import StreamingValidation, validate_stream
+
+CHUNK_CHARS = 20000
+OVERLAP_CHARS = 2000
+
+
+def flaw_keys(flaws):
+    return sorted((flaw["flaw_type"], flaw["severity"], flaw["location"], flaw["description"]) for flaw in flaws)
+
+
+def stream_report(validator, text, document_type, rules=None):
+    run = StreamingValidation(validator, document_type, chunk_chars=CHUNK_CHARS, overlap_chars=OVERLAP_CHARS)
+    if rules is not None:
+        run.rules = rules
+    flaws = list(run.feed(text)) + list(run.finish())
+    return flaws, run.report
+
+
+def pack_with_pattern(flaw_type, pattern):
+    with open(RULE_PACK, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["pattern_rules"].append({
+        "pattern": pattern, "flaw_type": flaw_type, "severity": "MEDIUM",
+        "description": "Terms left pending", "suggestion": "Settle the pending terms"
+    })
+    return RulePack(data, "<test>")
+
+
+def test_stream_matches_whole_document(stub_validator, sample_contract):
+    # Many chunks, with keywords, patterns and headings on both sides of every cut
+    text = "\n\n".join(sample_contract for _ in range(20))
+
+    for document_type in ("FOUNDER_AGREEMENT", "NDA", "GENERAL"):
+        whole = stub_validator.validate_document(text, document_type)
+        _, streamed = stream_report(stub_validator, text, document_type)
+
+        assert streamed["chunks"] > 1
+        assert flaw_keys(streamed["flaws"]) == flaw_keys(whole["flaws"])
+        for field in ("is_compliant", "total_flaws", "critical_flaws", "high_flaws", "medium_flaws", "low_flaws"):
+            assert streamed[field] == whole[field]
+
+
+def test_stream_yields_every_reported_flaw(stub_validator, sample_contract):
+    text = "\n\n".join(sample_contract for _ in range(5))
+    yielded, report = stream_report(stub_validator, text, "NDA")
+
+    assert {flaw["flaw_type"] for flaw in report["flaws"]} <= {flaw["flaw_type"] for flaw in yielded}
+
+
+def test_multiline_match_straddling_a_chunk_boundary_counts_once(stub_validator):
+    rules = pack_with_pattern("PENDING_TERMS", r"\bpending(?:\s+pending)*\b")
+
+    # One match spanning many lines, across the first window's cut point
+    line = "Plain text line without anything notable.\n"
+    text = line * 400 + "\n".join(["Pending"] * 400) + "\n" + line * 1000
+    cut = CHUNK_CHARS - OVERLAP_CHARS
+    assert text.index("Pending") < cut < text.rindex("Pending")
+    whole = stub_validator._detect_pattern_flaws(text, rules.scan(text))
+    assert [flaw.description for flaw in whole] == ["Terms left pending (1 instance(s))"]
+
+    flaws, report = stream_report(stub_validator, text, "GENERAL", rules)
+
+    assert report["chunks"] > 1
+    pending = [flaw for flaw in report["flaws"] if flaw["flaw_type"] == "PENDING_TERMS"]
+    assert [(flaw["description"], flaw["line"]) for flaw in pending] == [(whole[0].description, whole[0].line)]
+    assert sum(1 for flaw in flaws if flaw["flaw_type"] == "PENDING_TERMS") == 1
+
+
+def test_validate_stream_reads_binary_file(stub_validator, sample_contract):
+    events = list(validate_stream(stub_validator, io.BytesIO(sample_contract.encode("utf-8")), "NDA",
+                                  chunk_chars=CHUNK_CHARS, overlap_chars=OVERLAP_CHARS))
+
+    assert events[-1]["event"] == "report"
+    assert events[-1]["report"]["characters"] == len(sample_contract)
+    assert any(event["event"] == "progress" for event in events)
+
+
+def sse_events(body):
+    events = []
+    for frame in body.decode("utf-8").strip().split("\n\n"):
+        event, data = frame.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_large_text_upload_is_validated_in_chunks(stub_validator, sample_contract, monkeypatch):
+    import app as flask_backend
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    monkeypatch.setitem(flask_backend.app.config, "STREAM_VALIDATION_BYTES", 1024)
+
+    data = sample_contract.encode("utf-8")
+    client = flask_backend.app.test_client()
+    response = client.post("/analyze/stream", data={
+        "file": (io.BytesIO(data), "contract.txt"), "document_type": "NDA"
+    }, content_type="multipart/form-data")
+    events = sse_events(response.data)
+
+    names = [event for event, _ in events]
+    assert names[0] == "start" and events[0][1]["bytes"] == len(data)
+    assert "progress" in names
+    assert names[-2:] == ["verdict", "summary"]
+
+    validation = events[-1][1]["validation"]
+    whole = stub_validator.validate_document(sample_contract, "NDA")
+    assert flaw_keys(validation["flaws"]) == flaw_keys(whole["flaws"])
+    assert validation["chunks"] == 1
+
+
+def text_pdf(pages):
+    """A minimal PDF with one Helvetica text line per page line"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        lines = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in page.split("\n")]
+        content = "BT /F1 9 Tf 11 TL 36 800 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+
+def test_large_pdf_upload_is_validated_page_by_page(stub_validator, sample_contract, monkeypatch):
+    pytest.importorskip("PyPDF2")
+    import app as flask_backend
+    from pdf_pipeline import extract_pdf_text
+    from validator_loader import ValidatorLoader
+
+    loader = ValidatorLoader(lambda: stub_validator)
+    loader.get()
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    monkeypatch.setitem(flask_backend.app.config, "STREAM_VALIDATION_BYTES", 1024)
+
+    lines = [line for line in sample_contract.split("\n") if line.strip()][:120]
+    data = text_pdf(["\n".join(lines[start:start + 40]) for start in range(0, len(lines), 40)])
+    text = extract_pdf_text(data)
+    assert "AGREEMENT" in text.upper()
+
+    response = flask_backend.app.test_client().post("/analyze/stream", data={
+        "file": (io.BytesIO(data), "contract.pdf"), "document_type": "NDA"
+    }, content_type="multipart/form-data")
+    events = sse_events(response.data)
+
+    assert events[0][0] == "start" and events[0][1]["bytes"] == len(data)
+    assert events[-1][0] == "summary"
+    validation = events[-1][1]["validation"]
+    assert validation["characters"] == len(text)
+    assert flaw_keys(validation["flaws"]) == flaw_keys(stub_validator.validate_document(text, "NDA")["flaws"])
@@ -0,0 +1,40 @@
+"""
+Text Index tests
+Bisected line, column and section lookups must agree with counting the text
+"""
+
+from text_index import LineIndex
+
+
+def counted(text, position):
+    before = text[:position]
+    return before.count("\n") + 1, position - (before.rfind("\n") + 1) + 1
+
+
+def test_lines_and_columns_match_counting(sample_contract):
+    index = LineIndex(sample_contract)
+
+    for position in range(0, len(sample_contract), 97):
+        line, column, _ = index.locate(position)
+        assert (line, column) == counted(sample_contract, position)
+        assert index.line_of(position) == line and index.column_of(position) == column
+    assert index.line_count == sample_contract.count("\n") + 1
+
+
+def test_sections_follow_numbered_headings():
+    text = "Preamble text\n1. EQUITY DISTRIBUTION\nShares.\nARTICLE 2 - TERM\nTwo years.\n"
+    index = LineIndex(text)
+
+    assert index.section_of(0) is None
+    assert index.section_of(text.index("Shares")) == "1. EQUITY DISTRIBUTION"
+    assert index.describe(text.index("Two years")) == "Line 5 (2. TERM)"
+    assert index.describe(3) == "Line 1"
+
+
+def test_offsets_at_line_boundaries():
+    index = LineIndex("ab\n\ncd")
+
+    assert index.locate(2) == (1, 3, None)   # the newline itself
+    assert index.locate(3) == (2, 1, None)   # empty line
+    assert index.locate(4) == (3, 1, None)
+    assert index.locate(6) == (3, 3, None)   # end of text
@@ -0,0 +1,74 @@
+"""
+Validator Loader tests
+The app imports without the model and answers health and readiness while it loads
+"""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from validator_loader import ValidatorLoader, ValidatorNotReady
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_import_does_not_load_ml_libraries():
+    code = "import sys, app; print(sorted({'torch', 'transformers'} & set(sys.modules)))"
+    env = dict(os.environ, VALIDATOR_LOAD="lazy", PDF_POOL_AT_IMPORT="0")
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+
+    assert output.strip().splitlines()[-1] == "[]"
+
+
+def test_get_waits_and_reports_not_ready():
+    release = threading.Event()
+    loader = ValidatorLoader(lambda: release.wait(5) and "validator")
+
+    with pytest.raises(ValidatorNotReady):
+        loader.get(timeout=0.05)
+    assert loader.status()["state"] == "loading" and loader.current() is None
+
+    release.set()
+    assert loader.get(timeout=5) == "validator"
+    assert loader.current() == "validator" and loader.is_settled
+
+
+def test_failed_load_settles_with_none():
+    def fail():
+        raise RuntimeError("no weights")
+
+    loader = ValidatorLoader(fail)
+
+    assert loader.get(timeout=5) is None
+    assert loader.status()["state"] == "failed" and loader.status()["error"] == "no weights"
+
+
+def test_health_and_ready_while_loading(monkeypatch):
+    import app as flask_backend
+
+    release = threading.Event()
+    loader = ValidatorLoader(lambda: release.wait(5) and None)
+    monkeypatch.setattr(flask_backend, "validator_loader", loader)
+    monkeypatch.setitem(flask_backend.app.config, "VALIDATOR_WAIT_SECONDS", 0.05)
+    client = flask_backend.app.test_client()
+
+    health = client.get("/health")
+    assert health.status_code == 200 and health.get_json()["validator"] is False
+
+    ready = client.get("/ready")
+    assert ready.status_code == 503 and ready.headers["Retry-After"]
+
+    analyze = client.post("/analyze", data={"file": (io.BytesIO(b"Agreement text"), "a.txt")},
+                          content_type="multipart/form-data")
+    assert analyze.status_code == 503
+
+    release.set()
+    loader.get(timeout=5)
+    assert client.get("/ready").get_json() == {
+        "ready": True, "mode": "fallback", "validator": loader.status()
+    }
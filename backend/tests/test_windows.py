@@ -0,0 +1,54 @@
+"""
+Sliding Window tests
+Long documents are classified over overlapping windows covering all of the text
+"""
+
+import pytest
+
+from legal_validator import TOP_WINDOWS
+
+
+@pytest.fixture
+def long_text(sample_contract):
+    return "\n\n".join(sample_contract for _ in range(4))
+
+
+def test_windows_overlap_and_cover_the_document(stub_validator, long_text):
+    _, spans, doc_windows = stub_validator._window_logits([long_text])
+
+    assert len(doc_windows[0]) > 1
+    spans = [spans[window] for window in doc_windows[0]]
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(long_text.rstrip())
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert start < end
+
+
+def test_report_lists_top_windows_by_invalid_probability(stub_validator, long_text):
+    classification = stub_validator._classify_texts([long_text])[0]
+
+    assert classification["windows_analyzed"] > 1
+    top = classification["top_windows"]
+    assert len(top) == min(TOP_WINDOWS, classification["windows_analyzed"])
+    probabilities = [window["invalid_probability"] for window in top]
+    assert probabilities == sorted(probabilities, reverse=True)
+    for window in top:
+        assert long_text[window["char_start"]:].strip().startswith(window["preview"][:20])
+
+
+def test_batching_documents_does_not_change_their_scores(stub_validator, long_text, sample_contract):
+    texts = [long_text, sample_contract[:800], sample_contract]
+
+    together = stub_validator._classify_texts(texts)
+    alone = [stub_validator._classify_texts([text])[0] for text in texts]
+
+    for batched, single in zip(together, alone):
+        assert batched["windows_analyzed"] == single["windows_analyzed"]
+        assert batched["is_valid"] == single["is_valid"]
+        assert batched["confidence"] == pytest.approx(single["confidence"], abs=1e-5)
+
+
+def test_truncated_mode_reads_one_window(stub_validator, long_text, monkeypatch):
+    monkeypatch.setattr(stub_validator, "chunked", False)
+
+    assert stub_validator._classify_texts([long_text])[0]["windows_analyzed"] == 1
@@ -0,0 +1,64 @@
+"""
+Text Position Index
+Maps character offsets to line, column and section in O(log n)
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+
+# Numbered headings such as "1. EQUITY DISTRIBUTION" or "ARTICLE 3 - TERM"
+SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:(?:ARTICLE|SECTION|CLAUSE)[ \t]+)?(\d+(?:\.\d+)*)\.?[ \t]*[-:.]?[ \t]+"
+    r"([A-Z][A-Z0-9 ,&'()/\-]{2,})[ \t]*$",
+    re.MULTILINE
+)
+
+_NEWLINE = re.compile("\n")
+
+
+class LineIndex:
+    """
+    Newline and section-heading offsets for one document, built once.
+    Every lookup is a bisect, so locating many flaws stays cheap.
+    """
+
+    def __init__(self, text: str):
+        self.length = len(text)
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(match.end() for match in _NEWLINE.finditer(text))
+
+        self.section_starts: List[int] = []
+        self.section_titles: List[str] = []
+        for match in SECTION_HEADING.finditer(text):
+            self.section_starts.append(match.start())
+            self.section_titles.append(f"{match.group(1)}. {match.group(2).strip()}")
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_of(self, position: int) -> int:
+        """1-based line number of a character offset"""
+        return bisect_right(self.line_starts, position)
+
+    def column_of(self, position: int) -> int:
+        """1-based column of a character offset"""
+        return position - self.line_starts[self.line_of(position) - 1] + 1
+
+    def section_of(self, position: int) -> Optional[str]:
+        """Title of the numbered section containing an offset, if any"""
+        index = bisect_right(self.section_starts, position) - 1
+        return self.section_titles[index] if index >= 0 else None
+
+    def locate(self, position: int) -> Tuple[int, int, Optional[str]]:
+        """(line, column, section) of a character offset"""
+        line = self.line_of(position)
+        column = position - self.line_starts[line - 1] + 1
+        return line, column, self.section_of(position)
+
+    def describe(self, position: int) -> str:
+        """Human-readable location, e.g. 'Line 27 (2. VESTING SCHEDULE)'"""
+        line, _, section = self.locate(position)
+        return f"Line {line} ({section})" if section else f"Line {line}"
@@ -0,0 +1,42 @@
+"""
+Train the Legal Document Validator and publish a model artifact
+Run once (or whenever training data changes); the API loads the result at startup
+"""
+
+import argparse
+
+from doc_type_classifier import COMPONENT as DOC_TYPE_COMPONENT, train_default_classifier
+from legal_validator import LegalDocumentValidator
+from model_store import DEFAULT_STORE_DIR, ModelArtifactStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fine-tune the legal validator and save a versioned artifact")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Artifact store directory")
+    parser.add_argument("--gpu", action="store_true", help="Train on GPU if available")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Save the version without pointing LATEST at it")
+    args = parser.parse_args()
+
+    store = ModelArtifactStore(args.store)
+
+    print("\n🔧 Training Legal Document Validator...")
+    validator = LegalDocumentValidator(use_gpu=args.gpu, store=store, train=True)
+
+    print("\n🔧 Training document-type classifier...")
+    type_classifier = train_default_classifier()
+    print(f"✓ Document-type classifier: {type_classifier.metadata}")
+
+    version = validator.save_artifact(
+        metadata={"doc_type_classifier": type_classifier.metadata},
+        components={DOC_TYPE_COMPONENT: type_classifier},
+        promote=not args.no_promote
+    )
+
+    print(f"\n✓ Saved model artifact {version} to {store.root}")
+    if store.latest_version() != version:
+        print(f"   LATEST still points at {store.latest_version()}")
+
+
+if __name__ == "__main__":
+    main()
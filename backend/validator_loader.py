@@ -0,0 +1,97 @@
+"""
+Validator Loader
+Builds the ML validator off the request path and tracks its readiness
+"""
+
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+
+LOAD_MODES = ("background", "lazy", "eager")
+
+
+class ValidatorNotReady(Exception):
+    """Raised when the validator is still loading after the caller's wait"""
+
+
+class ValidatorLoader:
+    """
+    Runs `factory()` once, in a background thread, and hands out its result.
+
+    States: `idle` (not started), `loading`, `ready`, or `failed` (the
+    factory raised; callers get None and use the rules-only fallback).
+    `start()` is idempotent; `get()` starts loading on first use and waits.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.state = "idle"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+        self._value = None
+        self._started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self):
+        """Begin loading in the background if not already started"""
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "loading"
+            self._started_at = time.perf_counter()
+
+        threading.Thread(target=self._load, name="validator-loader", daemon=True).start()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        The loaded validator, or None if loading failed. Waits up to
+        `timeout` seconds (forever if None) and raises ValidatorNotReady
+        if loading is still in progress after that.
+        """
+        self.start()
+        if not self._done.wait(timeout):
+            raise ValidatorNotReady(f"Model is still loading ({self.elapsed():.0f}s so far)")
+        return self._value
+
+    def current(self) -> Optional[Any]:
+        """The validator if loaded, else None, without waiting"""
+        return self._value if self.state == "ready" else None
+
+    @property
+    def is_settled(self) -> bool:
+        """True once loading finished, successfully or not"""
+        return self._done.is_set()
+
+    def elapsed(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        if self.load_seconds is not None:
+            return self.load_seconds
+        return time.perf_counter() - self._started_at
+
+    def status(self) -> Dict:
+        return {
+            "state": self.state,
+            "seconds": round(self.elapsed(), 3),
+            "error": self.error
+        }
+
+    def _load(self):
+        try:
+            value = self.factory()
+        except Exception as e:
+            print(f"⚠️  Warning: Could not initialize validator: {e}")
+            print(traceback.format_exc())
+            print("   Using fallback mode...")
+            self.error = str(e)
+            self.state = "failed"
+        else:
+            self._value = value
+            self.state = "ready"
+        finally:
+            self.load_seconds = time.perf_counter() - self._started_at
+            self._done.set()
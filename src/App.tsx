@@ -50,6 +50,11 @@ function App() {
     setIsAnalyzing(false);
   };
 
+  // Partial results from a streaming analysis; still analyzing until complete
+  const handleAnalysisProgress = (partial: AnalysisResult) => {
+    setAnalysisResult(partial);
+  };
+
   const handleAnalysisStart = () => {
     setIsAnalyzing(true);
     setAnalysisResult(null);
@@ -74,6 +79,7 @@ function App() {
 
         <UploadSection
           onAnalysisComplete={handleAnalysisComplete}
+          onAnalysisProgress={handleAnalysisProgress}
           onAnalysisStart={handleAnalysisStart}
           isAnalyzing={isAnalyzing}
         />
@@ -81,6 +87,7 @@ function App() {
         {analysisResult && (
           <AnalysisResults
             result={analysisResult}
+            inProgress={isAnalyzing}
             onReset={handleReset}
           />
         )}
@@ -7,10 +7,11 @@ import EntitiesPanel from './EntitiesPanel';
 
 interface AnalysisResultsProps {
   result: AnalysisResult;
+  inProgress?: boolean;
   onReset: () => void;
 }
 
-export default function AnalysisResults({ result, onReset }: AnalysisResultsProps) {
+export default function AnalysisResults({ result, inProgress = false, onReset }: AnalysisResultsProps) {
   const getRiskColor = (risk: string) => {
     switch (risk.toLowerCase()) {
       case 'high':
@@ -43,7 +44,7 @@ export default function AnalysisResults({ result, onReset }: AnalysisResultsProp
         <div className="bg-gradient-to-r from-blue-600 to-cyan-600 p-8 text-white">
           <div className="flex items-center justify-between mb-6">
             <div>
-              <h2 className="text-3xl font-bold mb-2">Analysis Complete</h2>
+              <h2 className="text-3xl font-bold mb-2">{inProgress ? 'Analyzing...' : 'Analysis Complete'}</h2>
               <p className="text-blue-100 flex items-center space-x-2">
                 <FileText className="w-4 h-4" />
                 <span>{result.filename}</span>
@@ -2,15 +2,18 @@ import { useState, useRef, useEffect } from 'react';
 import { Upload, FileText, Loader2, AlertCircle, Wifi, WifiOff } from 'lucide-react';
 import type { AnalysisResult } from '../App';
 import { analyzeMockDocument, checkBackendHealth } from '../services/mockApi';
+import { streamAnalysis } from '../services/streamApi';
 
 interface UploadSectionProps {
   onAnalysisComplete: (result: AnalysisResult) => void;
+  onAnalysisProgress: (partial: AnalysisResult) => void;
   onAnalysisStart: () => void;
   isAnalyzing: boolean;
 }
 
 export default function UploadSection({
   onAnalysisComplete,
+  onAnalysisProgress,
   onAnalysisStart,
   isAnalyzing,
 }: UploadSectionProps) {
@@ -152,6 +155,23 @@ export default function UploadSection({
     };
   };
 
+  // Flask-shaped result from the flaws and verdict streamed so far
+  const partialFlaskResult = (flaws: any[], verdict: any) => {
+    const count = (severity: string) => flaws.filter((f: any) => f.severity === severity).length;
+    return {
+      validation: {
+        flaws,
+        confidence: verdict ? verdict.confidence : 0,
+        critical_flaws: count('CRITICAL'),
+        high_flaws: count('HIGH'),
+        medium_flaws: count('MEDIUM'),
+        is_compliant: false
+      },
+      summary: verdict ? 'Model verdict received, checking clauses...' : 'Rule checks complete, running model...',
+      processing_time: 0
+    };
+  };
+
   const handleAnalyze = async () => {
     if (!file) return;
 
@@ -164,6 +184,40 @@ export default function UploadSection({
     let useFlask = false;
     let useFastAPI = false;
 
+    try {
+      console.log('Attempting Flask streaming endpoint at localhost:5000...');
+      const flaws: any[] = [];
+      let verdict: any = null;
+      let summary: any = null;
+
+      await streamAnalysis('http://localhost:5000/analyze/stream', formData, ({ event, data }) => {
+        if (event === 'summary') {
+          summary = data;
+          return;
+        }
+        if (event === 'error') {
+          console.log('Flask stream failed:', data.details);
+          return;
+        }
+        if (event === 'flaw') {
+          flaws.push(data.flaw);
+        } else if (event === 'verdict') {
+          verdict = data;
+        } else {
+          return;
+        }
+        onAnalysisProgress(convertFlaskToAnalysisResult(partialFlaskResult(flaws, verdict), file.name));
+      });
+
+      if (summary) {
+        console.log('✓ Flask stream complete');
+        onAnalysisComplete(convertFlaskToAnalysisResult(summary, file.name));
+        return;
+      }
+    } catch (streamErr) {
+      console.log('Flask streaming endpoint unavailable:', streamErr);
+    }
+
     try {
       console.log('Attempting Flask backend at localhost:5000...');
       const flaskResponse = await fetch('http://localhost:5000/analyze', {
@@ -0,0 +1,66 @@
+export interface StreamEvent {
+  event: string;
+  data: any;
+}
+
+/**
+ * POST a form to a server-sent events endpoint and call `onEvent` for each
+ * event as it arrives. EventSource only supports GET, so the body is read
+ * with fetch and the `event:`/`data:` lines are parsed here.
+ * Resolves with false if the endpoint is unavailable (nothing was streamed).
+ */
+export async function streamAnalysis(
+  url: string,
+  formData: FormData,
+  onEvent: (event: StreamEvent) => void
+): Promise<boolean> {
+  const response = await fetch(url, {
+    method: 'POST',
+    body: formData,
+    headers: { Accept: 'text/event-stream' },
+  });
+
+  if (!response.ok || !response.body) {
+    console.log('Stream endpoint returned error:', response.status);
+    return false;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const dispatch = (frame: string) => {
+    let event = 'message';
+    const dataLines: string[] = [];
+    for (const line of frame.split('\n')) {
+      if (line.startsWith('event:')) {
+        event = line.slice(6).trim();
+      } else if (line.startsWith('data:')) {
+        dataLines.push(line.slice(5).trimStart());
+      }
+    }
+    if (dataLines.length > 0) {
+      onEvent({ event, data: JSON.parse(dataLines.join('\n')) });
+    }
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n');
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary >= 0) {
+      dispatch(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+
+  if (buffer.trim()) {
+    dispatch(buffer);
+  }
+
+  return true;
+}
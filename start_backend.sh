@@ -19,11 +19,12 @@ echo "Starting Flask server..."
 echo "=========================================="
 echo ""
 echo "The backend will:"
-echo "  1. Load Legal-BERT models (5-10 seconds)"
-echo "  2. Train on legal data (5 seconds)"
-echo "  3. Start server on port 5000"
+echo "  1. Start server on port 5000"
+echo "  2. Load the fine-tuned Legal-BERT artifact in the background (a few seconds)"
 echo ""
-echo "When you see 'Running on http://127.0.0.1:5000'"
+echo "If no artifact exists yet, run: python train_validator.py"
+echo ""
+echo "When http://127.0.0.1:5000/ready returns 200"
 echo "the backend is ready!"
 echo ""
 echo "Press Ctrl+C to stop"